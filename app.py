@@ -1,10 +1,20 @@
+import io
+import os
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 import numpy as np
 from black_scholes_calculator import BlackScholesCalculator
+from background_jobs import submit_job
+from hedge_store import HedgeStore
+from hedge_optimizer import solve_coverage_percentile
+from volatility_estimation import estimate_volatility, load_price_history
+from single_flight import DeduplicatedCalculator, SingleFlight
+from result_export import EXPORT_FILE_TYPES, export_hedge, export_scenarios
+from worker_pool import TaskTimeout, WorkerPoolFull, get_worker_pool
 
 # Configuration de la page
 st.set_page_config(
@@ -36,8 +46,371 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+
+@st.cache_resource
+def get_single_flight():
+    """Déduplication des calculs identiques en cours, partagée entre sessions"""
+    return SingleFlight()
+
+
+@st.cache_resource
+def get_calculator():
+    """Calculateur partagé : les calculs identiques simultanés ne sont faits qu'une fois"""
+    return DeduplicatedCalculator(BlackScholesCalculator(), get_single_flight())
+
+
 # Initialisation du calculateur
-calculator = BlackScholesCalculator()
+calculator = get_calculator()
+
+
+@st.cache_resource
+def get_hedge_store():
+    """Stockage SQLite des couvertures calculées, partagé entre sessions"""
+    return HedgeStore(os.environ.get('DELTAP_STORE_PATH', 'hedges.db'))
+
+
+# Nombre minimal de cotations d'un historique : une fenêtre de 21 rendements
+# (volatilité réalisée, initialisation EWMA et GARCH)
+MIN_HISTORY_PRICES = 22
+
+
+@st.cache_data(max_entries=16)
+def estimate_history_volatility(history, method):
+    """
+    Volatilité annualisée estimée sur un historique CSV (première colonne numérique)
+
+    Raises:
+        ValueError: Fichier illisible, sans colonne numérique, trop court, ou
+                    prix négatifs ou nuls
+    """
+    prices = load_price_history(io.BytesIO(history))
+    if prices.ndim == 2:
+        if prices.shape[1] == 0:
+            raise ValueError("aucune colonne numérique")
+        prices = prices[:, 0]
+    prices = prices[np.isfinite(prices)]
+    if len(prices) < MIN_HISTORY_PRICES:
+        raise ValueError(f"{len(prices)} cotation(s), au moins {MIN_HISTORY_PRICES} nécessaires")
+    if np.any(prices <= 0):
+        raise ValueError("prix négatifs ou nuls")
+    volatility = estimate_volatility(prices, method=method)['volatility']
+    if not np.isfinite(volatility) or volatility <= 0:
+        raise ValueError("volatilité non définie")
+    return volatility
+
+
+@st.cache_resource
+def get_background_executor():
+    """Exécuteur partagé pour les calculs de scénarios en tâche de fond"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="scenarios")
+
+
+@st.cache_resource
+def get_process_pool():
+    """Pool de processus préchauffés partagé, démarré en arrière-plan au chargement"""
+    if (os.cpu_count() or 1) < 2:
+        return None  # un seul CPU : aucun gain, le préchauffage ralentirait les sessions
+    pool = get_worker_pool()
+    pool.start(wait=False)
+    return pool
+
+
+def compute_scenario_report(context, current_price, start_date, end_date, volatility,
+                            risk_free_rate, target_precision, strike_price, time_to_delivery,
+                            store=None):
+    """Simulation des scénarios, statistiques et graphiques (exécuté en tâche de fond)"""
+    context.report_progress(0.0, "Génération des scénarios...")
+    
+    # Trajectoires simulées dans un processus préchauffé pendant les scénarios
+    fan_arguments = dict(current_price=current_price, start_date=start_date, end_date=end_date,
+                         volatility=volatility, risk_free_rate=risk_free_rate,
+                         num_paths=5000, num_steps=100)
+    pool = get_process_pool()
+    fan_future = None
+    if pool is not None and pool.ready():
+        try:
+            fan_future = pool.submit_calculation('simulate_price_fan', block=False, **fan_arguments)
+        except WorkerPoolFull:
+            pass
+    
+    def simulate_fan():
+        if fan_future is not None:
+            try:
+                return pool.result(fan_future, timeout=60)
+            except (TaskTimeout, BrokenProcessPool):
+                pass
+        # Pool en cours de démarrage, file pleine, processus lent ou arrêté :
+        # calcul dans le thread de la tâche
+        return calculator.simulate_price_fan(**fan_arguments)
+    
+    try:
+        return build_scenario_report(context, simulate_fan, current_price, start_date, end_date,
+                                     volatility, risk_free_rate, target_precision, strike_price,
+                                     time_to_delivery, store)
+    finally:
+        # Tâche annulée ou en erreur : les trajectoires en attente libèrent leur place
+        if fan_future is not None:
+            fan_future.cancel()
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def export_report_scenarios(current_price, start_date, end_date, volatility, risk_free_rate,
+                            target_precision, num_draws):
+    """
+    Export Parquet des vecteurs de scénarios d'un rapport, produit au téléchargement
+    
+    La simulation adaptative est rejouée (même graine, mêmes lots, sans budget
+    de temps) jusqu'au nombre de tirages du rapport : mêmes vecteurs, sans
+    garder les octets de l'export en session.
+    """
+    scenarios = calculator.simulate_price_scenarios_adaptive(
+        current_price=current_price,
+        start_date=start_date,
+        end_date=end_date,
+        volatility=volatility,
+        risk_free_rate=risk_free_rate,
+        percentiles=(95, 99),
+        tolerance=target_precision,
+        time_budget=float('inf'),
+        max_scenarios=num_draws + 1
+    )
+    return export_scenarios(
+        scenarios,
+        metadata={'current_price': current_price, 'start_date': start_date, 'end_date': end_date,
+                  'volatility': volatility, 'risk_free_rate': risk_free_rate}
+    )
+
+
+def build_scenario_report(context, simulate_fan, current_price, start_date, end_date, volatility,
+                          risk_free_rate, target_precision, strike_price, time_to_delivery,
+                          store=None):
+    """Scénarios, statistiques et graphiques ; simulate_fan() fournit les trajectoires"""
+    
+    def report_convergence(num_draws, achieved_tolerance):
+        # Progression estimée d'après la décroissance en 1/sqrt(n) de l'intervalle
+        progress = min((target_precision / achieved_tolerance) ** 2, 1.0) * 0.5
+        context.report_progress(progress, f"{num_draws:,} scénarios, précision ±{achieved_tolerance*100:.2f}%")
+    
+    scenarios = calculator.simulate_price_scenarios_adaptive(
+        current_price=current_price,
+        start_date=start_date,
+        end_date=end_date,
+        volatility=volatility,
+        risk_free_rate=risk_free_rate,
+        percentiles=(95, 99),
+        tolerance=target_precision,
+        callback=report_convergence
+    )
+    
+    if scenarios is None:
+        return None
+    
+    context.report_progress(0.5, "Calcul des statistiques...")
+    if store is not None:
+        store.record_scenario_summary(current_price, start_date, end_date, volatility,
+                                      risk_free_rate, scenarios['num_draws'], scenarios['future_price'])
+    
+    df_scenarios = pd.DataFrame({key: scenarios[key] for key in ('future_price', 'price_delta', 'shock')})
+    future_prices = df_scenarios['future_price']
+    
+    # Calcul des percentiles pour le graphique
+    percentile_95 = future_prices.quantile(0.95)
+    percentile_99 = future_prices.quantile(0.99)
+    
+    # Limitation de l'affichage aux centiles 2% et 98%
+    percentile_02 = future_prices.quantile(0.02)
+    percentile_98 = future_prices.quantile(0.98)
+    
+    statistics = {
+        'num_draws': scenarios['num_draws'],
+        'achieved_tolerance': scenarios['achieved_tolerance'],
+        'converged': scenarios['converged'],
+        'min': future_prices.min(),
+        'max': future_prices.max(),
+        'median': future_prices.median(),
+        'mean': future_prices.mean(),
+        'std': future_prices.std(),
+        'percentile_02': percentile_02,
+        'percentile_10': future_prices.quantile(0.10),
+        'percentile_25': future_prices.quantile(0.25),
+        'percentile_75': future_prices.quantile(0.75),
+        'percentile_90': future_prices.quantile(0.90),
+        'percentile_95': percentile_95,
+        'percentile_98': percentile_98,
+        'percentile_99': percentile_99
+    }
+    
+    context.report_progress(0.7, "Construction des graphiques...")
+    
+    # Filtrage des données pour l'affichage
+    df_filtered = df_scenarios[
+        (future_prices >= percentile_02) & 
+        (future_prices <= percentile_98)
+    ]
+    
+    # Histogramme des prix futurs (limité aux centiles 2-98%)
+    # Histogramme pré-agrégé : le nombre de scénarios peut atteindre plusieurs millions
+    counts, bin_edges = np.histogram(df_filtered['future_price'], bins=50)
+    fig_hist = go.Figure(go.Bar(
+        x=(bin_edges[:-1] + bin_edges[1:]) / 2,
+        y=counts,
+        width=np.diff(bin_edges),
+        name='Fréquence'
+    ))
+    fig_hist.update_layout(
+        title="Distribution des prix futurs (centiles 2%-98%)",
+        xaxis_title='Prix futur (€)',
+        yaxis_title='Fréquence',
+        bargap=0
+    )
+    # Ajout des lignes verticales (seulement si elles sont dans la plage visible)
+    if percentile_02 <= current_price <= percentile_98:
+        fig_hist.add_vline(x=current_price, line_dash="dash", line_color="red", 
+                          annotation_text="Prix actuel")
+    
+    if percentile_02 <= strike_price <= percentile_98:
+        fig_hist.add_vline(x=strike_price, line_dash="dash", line_color="green", 
+                          annotation_text="Prix de livraison")
+    
+    if percentile_02 <= percentile_95 <= percentile_98:
+        fig_hist.add_vline(x=percentile_95, line_dash="dash", line_color="orange", 
+                          annotation_text="95ème centile")
+    
+    if percentile_02 <= percentile_99 <= percentile_98:
+        fig_hist.add_vline(x=percentile_99, line_dash="dash", line_color="purple", 
+                          annotation_text="99ème centile")
+    
+    context.check_cancelled()
+    
+    # Bandes de centiles des trajectoires simulées (même modèle que l'histogramme)
+    context.report_progress(0.8, "Simulation des trajectoires...")
+    fan = simulate_fan()
+    days = fan['times'] * 365
+    bands = fan['quantiles']
+    
+    fig_time = go.Figure()
+    for low, high, color, label in [(5, 95, 'rgba(173, 216, 230, 0.4)', 'Centiles 5%-95%'),
+                                    (25, 75, 'rgba(100, 149, 237, 0.5)', 'Centiles 25%-75%')]:
+        fig_time.add_trace(go.Scatter(
+            x=days,
+            y=bands[high],
+            mode='lines',
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+        fig_time.add_trace(go.Scatter(
+            x=days,
+            y=bands[low],
+            mode='lines',
+            name=label,
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor=color
+        ))
+    
+    fig_time.add_trace(go.Scatter(
+        x=days,
+        y=bands[50],
+        mode='lines',
+        name='Médiane',
+        line=dict(color='blue', width=2)
+    ))
+    
+    fig_time.add_hline(y=strike_price, line_dash="dash", line_color="green",
+                      annotation_text="Prix de livraison")
+    
+    fig_time.update_layout(
+        title="Évolution du prix dans le temps",
+        xaxis_title="Jours jusqu'à la livraison",
+        yaxis_title="Prix (€)",
+        hovermode='x unified'
+    )
+    
+    context.report_progress(1.0, "Scénarios prêts")
+    return {
+        'statistics': statistics,
+        'fig_hist': fig_hist,
+        'fig_time': fig_time,
+        # Export Parquet produit au téléchargement seulement (voir export_report_scenarios)
+        'export_arguments': {
+            'current_price': current_price, 'start_date': start_date, 'end_date': end_date,
+            'volatility': volatility, 'risk_free_rate': risk_free_rate,
+            'target_precision': target_precision, 'num_draws': scenarios['num_draws']
+        }
+    }
+
+
+def render_scenario_report(report):
+    """Affichage de l'analyse des scénarios calculée en tâche de fond"""
+    statistics = report['statistics']
+    
+    convergence = "précision cible atteinte" if statistics['converged'] else "budget de calcul atteint"
+    st.caption(f"{statistics['num_draws']:,} scénarios simulés — centiles 95/99 à "
+               f"±{statistics['achieved_tolerance']*100:.2f}% ({convergence})")
+    
+    st.plotly_chart(report['fig_hist'], use_container_width=True)
+    
+    st.download_button(
+        "💾 Exporter les scénarios (Parquet)",
+        data=lambda: export_report_scenarios(**report['export_arguments']),
+        file_name="scenarios.parquet",
+        mime=EXPORT_FILE_TYPES['parquet'][1],
+        on_click='ignore',
+        help="Vecteurs complets des prix futurs, deltas prix et chocs simulés"
+    )
+    
+    # Statistiques détaillées de dispersion
+    st.subheader("📊 Analyse de dispersion")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("**Statistiques descriptives :**")
+        st.write(f"- **Prix minimum :** €{statistics['min']:.2f}")
+        st.write(f"- **Prix maximum :** €{statistics['max']:.2f}")
+        st.write(f"- **Médiane :** €{statistics['median']:.2f}")
+        st.write(f"- **Coefficient de variation :** {(statistics['std']/statistics['mean']*100):.1f}%")
+        st.write(f"- **Plage affichée :** €{statistics['percentile_02']:.2f} - €{statistics['percentile_98']:.2f}")
+    
+    with col2:
+        st.markdown("**Centiles :**")
+        st.write(f"- **10ème centile :** €{statistics['percentile_10']:.2f}")
+        st.write(f"- **25ème centile :** €{statistics['percentile_25']:.2f}")
+        st.write(f"- **75ème centile :** €{statistics['percentile_75']:.2f}")
+        st.write(f"- **90ème centile :** €{statistics['percentile_90']:.2f}")
+    
+    # Statistiques des scénarios
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            "Prix moyen futur",
+            f"€{statistics['mean']:.2f}"
+        )
+    
+    with col2:
+        st.metric(
+            "Écart-type des prix",
+            f"€{statistics['std']:.2f}"
+        )
+    
+    with col3:
+        st.metric(
+            "95ème centile",
+            f"€{statistics['percentile_95']:.2f}"
+        )
+    
+    with col4:
+        st.metric(
+            "99ème centile",
+            f"€{statistics['percentile_99']:.2f}"
+        )
+    
+    # Graphique de l'évolution temporelle
+    st.subheader("⏰ Évolution temporelle du prix")
+    st.plotly_chart(report['fig_time'], use_container_width=True)
+
 
 # Sidebar pour les paramètres
 st.sidebar.header("⚙️ Paramètres d'entrée")
@@ -74,26 +447,39 @@ end_date = st.sidebar.date_input(
     help="Date de fin du contrat (incluse)"
 )
 
-# Volatilité
+# Volatilité : valeur par défaut estimée sur un historique de prix, si fourni
+default_volatility = 25.0
+with st.sidebar.expander("📈 Estimer la volatilité sur un historique"):
+    history_file = st.file_uploader(
+        "Historique de prix (CSV)",
+        type=['csv'],
+        help="Une ligne par cotation quotidienne ; seule la première colonne numérique est utilisée"
+    )
+    estimation_method = st.selectbox(
+        "Méthode d'estimation",
+        options=['ewma', 'realized', 'garch'],
+        format_func={'ewma': "EWMA (RiskMetrics, λ = 0,94)",
+                     'realized': "Volatilité réalisée (21 jours)",
+                     'garch': "GARCH(1,1)"}.get
+    )
+    if history_file is not None:
+        try:
+            estimated_volatility = estimate_history_volatility(history_file.getvalue(),
+                                                               estimation_method)
+            default_volatility = float(np.clip(round(estimated_volatility * 100), 1.0, 100.0))
+            st.info(f"Volatilité estimée : {estimated_volatility*100:.1f}%")
+        except ValueError as error:
+            st.warning(f"Historique inutilisable : {error}")
+
 volatility = st.sidebar.slider(
     "Volatilité annuelle (%)",
     min_value=1.0,
     max_value=100.0,
-    value=25.0,
+    value=default_volatility,
     step=1.0,
     help="Volatilité annuelle de l'actif sous-jacent"
 ) / 100.0
 
-# Centile de couverture
-coverage_percentile = st.sidebar.slider(
-    "Centile de couverture (%)",
-    min_value=1.0,
-    max_value=99.0,
-    value=75.0,
-    step=1.0,
-    help="Niveau de confiance pour la couverture de prix"
-)
-
 # Taux d'intérêt sans risque
 risk_free_rate = st.sidebar.slider(
     "Taux d'intérêt sans risque (%)",
@@ -104,20 +490,77 @@ risk_free_rate = st.sidebar.slider(
     help="Taux d'intérêt sans risque annuel"
 ) / 100.0
 
-# Nombre de simulations
-num_simulations = st.sidebar.selectbox(
-    "Nombre de simulations",
-    options=[1000, 5000, 10000, 20000, 50000],
-    index=2,  # 10000 par défaut
-    help="Nombre de scénarios à simuler"
+# Centile de couverture : saisi directement ou déduit d'un objectif
+percentile_mode = st.sidebar.radio(
+    "Détermination du centile",
+    options=["Centile", "Budget de prime (call)", "Delta prix cible"],
+    help="Le centile peut être saisi ou calculé pour atteindre une prime ou un delta prix"
 )
 
+if percentile_mode == "Centile":
+    coverage_percentile = st.sidebar.slider(
+        "Centile de couverture (%)",
+        min_value=1.0,
+        max_value=99.0,
+        value=75.0,
+        step=1.0,
+        help="Niveau de confiance pour la couverture de prix"
+    )
+else:
+    if percentile_mode == "Budget de prime (call)":
+        metric = 'call_price'
+        target = st.sidebar.number_input(
+            "Budget de prime du call (€)",
+            min_value=0.0,
+            value=round(current_price * 0.05, 2),
+            step=0.01,
+            help="Prime du call visée ; le centile de couverture est calculé pour l'atteindre"
+        )
+    else:
+        metric = 'price_delta'
+        target = st.sidebar.number_input(
+            "Delta prix cible (€)",
+            value=round(current_price * 0.10, 2),
+            step=0.01,
+            help="Écart visé entre prix de livraison et prix actuel"
+        )
+    
+    solution = solve_coverage_percentile(
+        calculator, current_price, start_date, end_date, volatility,
+        target, metric=metric, risk_free_rate=risk_free_rate,
+        percentile_bounds=(1.0, 99.0)
+    )
+    if solution['feasible'] and solution['valid']:
+        coverage_percentile = float(solution['coverage_percentile'])
+        st.sidebar.info(f"Centile de couverture retenu : {coverage_percentile:.2f}%")
+    else:
+        coverage_percentile = 75.0
+        st.sidebar.warning("Objectif hors d'atteinte pour un centile entre 1% et 99% ; "
+                           "centile par défaut (75%) utilisé")
 
+# Précision cible des centiles (le nombre de simulations s'adapte)
+target_precision = st.sidebar.select_slider(
+    "Précision cible des centiles (%)",
+    options=[2.0, 1.0, 0.5, 0.25],
+    value=1.0,
+    format_func=lambda value: f"±{value}%",
+    help="Demi-largeur de l'intervalle de confiance à 95% des centiles 95 et 99 ; "
+         "les scénarios sont tirés jusqu'à l'atteindre"
+) / 100.0
+
+# Annulation de la simulation en cours si les paramètres ont changé
+scenario_key = (current_price, start_date, end_date, volatility, coverage_percentile,
+                risk_free_rate, target_precision)
+previous_job = st.session_state.get('scenario_job')
+if previous_job is not None and previous_job.key != scenario_key:
+    previous_job.cancel()
+    del st.session_state['scenario_job']
 
 # Bouton de calcul
 if st.sidebar.button("🚀 Calculer la couverture", type="primary"):
-    # Calcul de la couverture
-    results = calculator.calculate_price_hedge(
+    # Calcul de la couverture (servie depuis le stockage si déjà calculée aujourd'hui)
+    results = get_hedge_store().get_or_compute_hedge(
+        calculator,
         current_price=current_price,
         start_date=start_date,
         end_date=end_date,
@@ -129,6 +572,28 @@ if st.sidebar.button("🚀 Calculer la couverture", type="primary"):
     if 'error' in results:
         st.error(results['error'])
     else:
+        # Lancement immédiat des scénarios en tâche de fond (ou réutilisation du
+        # calcul déjà effectué pour les mêmes paramètres, ou en cours dans une
+        # autre session)
+        job = st.session_state.get('scenario_job')
+        if job is None or job.key != scenario_key or job.cancelled():
+            job = submit_job(
+                get_background_executor(),
+                scenario_key,
+                compute_scenario_report,
+                current_price=current_price,
+                start_date=start_date,
+                end_date=end_date,
+                volatility=volatility,
+                risk_free_rate=risk_free_rate,
+                target_precision=target_precision,
+                strike_price=results['strike_price'],
+                time_to_delivery=results['time_to_delivery'],
+                store=get_hedge_store(),
+                flight=get_single_flight()
+            )
+            st.session_state['scenario_job'] = job
+        
         # Mise en avant du Delta prix
         st.markdown("---")
         st.markdown("## 🎯 **RÉSULTAT PRINCIPAL**")
@@ -223,157 +688,48 @@ if st.sidebar.button("🚀 Calculer la couverture", type="primary"):
             st.metric("Prix de l'option", f"€{results['put_price']:.4f}")
             st.metric("Delta", f"{results['put_delta']:.4f}")
         
-        # Graphique de l'évolution du prix
-        st.subheader("📊 Analyse des scénarios de prix")
-        
-        # Calcul des scénarios
-        scenarios = calculator.calculate_price_scenarios(
+        # Carte de sensibilité volatilité × centile de couverture (un seul calcul vectorisé)
+        st.subheader("🗺️ Sensibilité volatilité × centile de couverture")
+        sweep = calculator.sweep_price_hedge(
             current_price=current_price,
             start_date=start_date,
             end_date=end_date,
-            volatility=volatility,
-            risk_free_rate=risk_free_rate,
-            num_scenarios=num_simulations
+            volatility=np.arange(1, 101) / 100.0,
+            coverage_percentile=np.arange(1, 100),
+            risk_free_rate=risk_free_rate
         )
         
-        if scenarios:
-            df_scenarios = pd.DataFrame(scenarios)
-            
-            # Calcul des percentiles pour le graphique
-            percentile_95 = df_scenarios['future_price'].quantile(0.95)
-            percentile_99 = df_scenarios['future_price'].quantile(0.99)
-            
-            # Limitation de l'affichage aux centiles 2% et 98%
-            percentile_02 = df_scenarios['future_price'].quantile(0.02)
-            percentile_98 = df_scenarios['future_price'].quantile(0.98)
-            
-            # Filtrage des données pour l'affichage
-            df_filtered = df_scenarios[
-                (df_scenarios['future_price'] >= percentile_02) & 
-                (df_scenarios['future_price'] <= percentile_98)
-            ]
-            
-            # Histogramme des prix futurs (limité aux centiles 2-98%)
-            fig_hist = px.histogram(
-                df_filtered, 
-                x='future_price',
-                nbins=50,
-                title="Distribution des prix futurs (centiles 2%-98%)",
-                labels={'future_price': 'Prix futur (€)', 'count': 'Fréquence'}
-            )
-            # Ajout des lignes verticales (seulement si elles sont dans la plage visible)
-            if percentile_02 <= current_price <= percentile_98:
-                fig_hist.add_vline(x=current_price, line_dash="dash", line_color="red", 
-                                  annotation_text="Prix actuel")
-            
-            if percentile_02 <= results['strike_price'] <= percentile_98:
-                fig_hist.add_vline(x=results['strike_price'], line_dash="dash", line_color="green", 
-                                  annotation_text="Prix de livraison")
-            
-            if percentile_02 <= percentile_95 <= percentile_98:
-                fig_hist.add_vline(x=percentile_95, line_dash="dash", line_color="orange", 
-                                  annotation_text="95ème centile")
-            
-            if percentile_02 <= percentile_99 <= percentile_98:
-                fig_hist.add_vline(x=percentile_99, line_dash="dash", line_color="purple", 
-                                  annotation_text="99ème centile")
-            st.plotly_chart(fig_hist, use_container_width=True)
-            
-            # Statistiques détaillées de dispersion
-            st.subheader("📊 Analyse de dispersion")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("**Statistiques descriptives :**")
-                st.write(f"- **Prix minimum :** €{df_scenarios['future_price'].min():.2f}")
-                st.write(f"- **Prix maximum :** €{df_scenarios['future_price'].max():.2f}")
-                st.write(f"- **Médiane :** €{df_scenarios['future_price'].median():.2f}")
-                st.write(f"- **Coefficient de variation :** {(df_scenarios['future_price'].std()/df_scenarios['future_price'].mean()*100):.1f}%")
-                st.write(f"- **Plage affichée :** €{percentile_02:.2f} - €{percentile_98:.2f}")
-            
-            with col2:
-                st.markdown("**Centiles :**")
-                st.write(f"- **10ème centile :** €{df_scenarios['future_price'].quantile(0.10):.2f}")
-                st.write(f"- **25ème centile :** €{df_scenarios['future_price'].quantile(0.25):.2f}")
-                st.write(f"- **75ème centile :** €{df_scenarios['future_price'].quantile(0.75):.2f}")
-                st.write(f"- **90ème centile :** €{df_scenarios['future_price'].quantile(0.90):.2f}")
-            
-            # Statistiques des scénarios
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric(
-                    "Prix moyen futur",
-                    f"€{df_scenarios['future_price'].mean():.2f}"
-                )
-            
-            with col2:
-                st.metric(
-                    "Écart-type des prix",
-                    f"€{df_scenarios['future_price'].std():.2f}"
-                )
-            
-            with col3:
-                st.metric(
-                    "95ème centile",
-                    f"€{percentile_95:.2f}"
-                )
-            
-            with col4:
-                st.metric(
-                    "99ème centile",
-                    f"€{percentile_99:.2f}"
+        sweep_tabs = st.tabs(["Delta prix", "Prix de livraison (strike)", "Prix de l'option call"])
+        for tab, key, label in zip(sweep_tabs,
+                                   ['price_delta', 'strike_price', 'call_price'],
+                                   ['Delta prix (€)', 'Strike (€)', 'Prix du call (€)']):
+            with tab:
+                fig_sweep = go.Figure(go.Heatmap(
+                    x=sweep['axes']['coverage_percentile'],
+                    y=sweep['axes']['volatility'] * 100,
+                    z=sweep[key],
+                    colorscale='Viridis',
+                    colorbar=dict(title=label),
+                    hovertemplate="Centile : %{x:.0f}%<br>Volatilité : %{y:.0f}%<br>"
+                                  + label + " : %{z:.2f}<extra></extra>"
+                ))
+                fig_sweep.add_trace(go.Scatter(
+                    x=[coverage_percentile],
+                    y=[volatility * 100],
+                    mode='markers',
+                    marker=dict(color='red', size=10, symbol='x'),
+                    name='Paramètres actuels'
+                ))
+                fig_sweep.update_layout(
+                    xaxis_title="Centile de couverture (%)",
+                    yaxis_title="Volatilité annuelle (%)"
                 )
-            
-            # Graphique de l'évolution temporelle
-            st.subheader("⏰ Évolution temporelle du prix")
-            
-            # Simulation de l'évolution du prix dans le temps
-            time_steps = np.linspace(0, results['time_to_delivery'], 100)
-            expected_prices = current_price * np.exp((risk_free_rate - 0.5 * volatility**2) * time_steps)
-            
-            fig_time = go.Figure()
-            fig_time.add_trace(go.Scatter(
-                x=time_steps * 365,
-                y=expected_prices,
-                mode='lines',
-                name='Prix attendu',
-                line=dict(color='blue', width=2)
-            ))
-            
-            # Bandes de confiance
-            upper_bound = expected_prices * np.exp(1.96 * volatility * np.sqrt(time_steps))
-            lower_bound = expected_prices * np.exp(-1.96 * volatility * np.sqrt(time_steps))
-            
-            fig_time.add_trace(go.Scatter(
-                x=time_steps * 365,
-                y=upper_bound,
-                mode='lines',
-                name='Bande supérieure (95%)',
-                line=dict(color='lightblue', width=1, dash='dash')
-            ))
-            
-            fig_time.add_trace(go.Scatter(
-                x=time_steps * 365,
-                y=lower_bound,
-                mode='lines',
-                name='Bande inférieure (95%)',
-                line=dict(color='lightblue', width=1, dash='dash'),
-                fill='tonexty'
-            ))
-            
-            fig_time.add_hline(y=results['strike_price'], line_dash="dash", line_color="green",
-                              annotation_text="Prix de livraison")
-            
-            fig_time.update_layout(
-                title="Évolution du prix dans le temps",
-                xaxis_title="Jours jusqu'à la livraison",
-                yaxis_title="Prix (€)",
-                hovermode='x unified'
-            )
-            
-            st.plotly_chart(fig_time, use_container_width=True)
+                st.plotly_chart(fig_sweep, use_container_width=True)
+        
+        # Analyse des scénarios : calculée en tâche de fond, affichée dès qu'elle est prête
+        st.subheader("📊 Analyse des scénarios de prix")
+        scenario_placeholder = st.empty()
+        
         
 
         
@@ -415,6 +771,28 @@ if st.sidebar.button("🚀 Calculer la couverture", type="primary"):
             - **Temps jusqu'à fin :** {results['time_to_delivery']*365:.0f} jours
             """)
 
+        # Export du résultat de couverture pour les outils de risque
+        st.download_button(
+            "💾 Exporter la couverture (Parquet)",
+            data=export_hedge(results),
+            file_name=f"couverture_{start_date:%Y%m%d}_{end_date:%Y%m%d}.parquet",
+            mime=EXPORT_FILE_TYPES['parquet'][1],
+            on_click='ignore'
+        )
+
+        # Remplissage de la section scénarios à la fin de la tâche de fond
+        with scenario_placeholder.container():
+            if not job.done():
+                progress_bar = st.progress(0.0, text="Simulation des scénarios en cours...")
+                while not job.done():
+                    wait([job.future], timeout=0.1)
+                    progress_bar.progress(job.progress, text=job.message or "Simulation des scénarios en cours...")
+                progress_bar.empty()
+            
+            report = job.result()
+            if report is not None:
+                render_scenario_report(report)
+
 # Footer
 st.markdown("---")
 st.markdown("""
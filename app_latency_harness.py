@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Banc de mesure headless de la latence de l'application (streamlit.testing.v1.AppTest)
+
+Pilote la sidebar et le bouton "Calculer la couverture" sur une matrice de
+paramètres, mesure la durée de chaque rerun, le pic mémoire et le nombre
+d'éléments affichés, puis simule des sessions concurrentes pour trouver le
+point de saturation.
+
+Usage:
+    python app_latency_harness.py [--repeats 3] [--sessions 1 2 4 8]
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit import config
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# Matrice par défaut : précision cible des centiles (qui fixe le nombre de
+# simulations) × volatilité × centile de couverture
+DEFAULT_MATRIX = {
+    'target_precision': [2.0, 1.0, 0.5],
+    'volatility': [10.0, 25.0, 60.0],
+    'coverage_percentile': [75.0, 95.0]
+}
+
+# Widget de la sidebar associé à chaque paramètre : (type AppTest, libellé)
+SIDEBAR_WIDGETS = {
+    'current_price': ('number_input', "Prix actuel du sous-jacent (€)"),
+    'start_date': ('date_input', "Date de début du contrat"),
+    'end_date': ('date_input', "Date de fin du contrat"),
+    'volatility': ('slider', "Volatilité annuelle (%)"),
+    'risk_free_rate': ('slider', "Taux d'intérêt sans risque (%)"),
+    'coverage_percentile': ('slider', "Centile de couverture (%)"),
+    'target_precision': ('select_slider', "Précision cible des centiles (%)")
+}
+
+BUTTON_LABEL = "🚀 Calculer la couverture"
+
+
+def _sidebar_widget(app, kind, label):
+    for widget in getattr(app.sidebar, kind):
+        if widget.label == label:
+            return widget
+    raise KeyError(f"Widget introuvable dans la sidebar : {kind} '{label}'")
+
+
+def count_elements(node):
+    """
+    Nombre d'éléments affichés par type (feuilles d'un bloc AppTest, par ex.
+    app.main ou app.sidebar)
+    """
+    children = getattr(node, 'children', None)
+    if not children:
+        return Counter([getattr(node, 'type', type(node).__name__)])
+    counts = Counter()
+    for child in children.values():
+        counts += count_elements(child)
+    return counts
+
+
+def run_session(parameters, timeout=120):
+    """
+    Une session complète : premier affichage, saisie des paramètres, calcul
+
+    Args:
+        parameters: dict paramètre -> valeur saisie (voir SIDEBAR_WIDGETS ;
+                    pourcentages en %, comme dans l'interface)
+        timeout: Durée maximale d'un rerun (secondes)
+
+    Returns:
+        dict: 'initial_run' et 'calculation' (secondes), 'elements' (total),
+              'element_types' et 'exceptions'
+    """
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    start = time.perf_counter()
+    app.run()
+    initial_run = time.perf_counter() - start
+
+    for name, value in parameters.items():
+        kind, label = SIDEBAR_WIDGETS[name]
+        _sidebar_widget(app, kind, label).set_value(value)
+
+    start = time.perf_counter()
+    _sidebar_widget(app, 'button', BUTTON_LABEL).click().run()
+    calculation = time.perf_counter() - start
+
+    element_types = count_elements(app.main) + count_elements(app.sidebar)
+    return {
+        'initial_run': initial_run,
+        'calculation': calculation,
+        'elements': sum(element_types.values()),
+        'element_types': dict(element_types),
+        'exceptions': [exception.message for exception in app.exception]
+    }
+
+
+def _parameter_grid(matrix):
+    names = list(matrix)
+    for values in itertools.product(*(matrix[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def measure_latency(matrix=None, repeats=3, timeout=120):
+    """
+    Latence de bout en bout et pic mémoire sur une matrice de paramètres
+
+    Chaque combinaison est jouée `repeats` fois : la première mesure inclut
+    le calcul à froid, les suivantes profitent des caches de l'application
+    (stockage des couvertures, ressources partagées), comme un utilisateur
+    qui relance le calcul. Le pic mémoire est remis à zéro avant chaque
+    exécution : il est mesuré par exécution, puis résumé par sa médiane et
+    son maximum.
+
+    Returns:
+        list: Un dict par combinaison ('parameters', 'cold', 'warm_median',
+              'peak_memory_mb' (maximum), 'peak_memory_median_mb', 'elements',
+              'exceptions')
+    """
+    results = []
+    for parameters in _parameter_grid(matrix or DEFAULT_MATRIX):
+        timings, peaks, exceptions = [], [], []
+        tracemalloc.start()
+        try:
+            for _ in range(repeats):
+                tracemalloc.reset_peak()
+                session = run_session(parameters, timeout)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                timings.append(session['calculation'])
+                exceptions.extend(session['exceptions'])
+        finally:
+            tracemalloc.stop()
+
+        results.append({
+            'parameters': parameters,
+            'cold': timings[0],
+            'warm_median': statistics.median(timings[1:]) if repeats > 1 else None,
+            'peak_memory_mb': max(peaks) / 1e6,
+            'peak_memory_median_mb': statistics.median(peaks) / 1e6,
+            'elements': session['elements'],
+            'exceptions': exceptions
+        })
+    return results
+
+
+def measure_concurrency(session_counts=(1, 2, 4, 8), parameters=None, timeout=300,
+                        saturation_gain=1.1):
+    """
+    Sessions concurrentes dans le même processus, comme sur le serveur Streamlit
+
+    Pour chaque niveau de concurrence N, N sessions sont lancées en parallèle
+    (une par thread). Le point de saturation est le premier niveau à partir
+    duquel le débit (sessions par seconde) progresse de moins de
+    `saturation_gain` par rapport au niveau précédent.
+
+    Returns:
+        dict: 'levels' (un dict par niveau : 'sessions', 'throughput',
+              'median_latency', 'max_latency', 'exceptions') et 'saturation'
+              (nombre de sessions, None si non atteint)
+    """
+    parameters = parameters or {}
+    levels, saturation = [], None
+
+    # AppTest active l'option global.appTest le temps de chaque rerun puis la
+    # restaure : activée pour toute la mesure, les sessions concurrentes ne se
+    # la désactivent pas mutuellement
+    app_test_option = config.get_option('global.appTest')
+    config.set_option('global.appTest', True)
+    try:
+        # Session de chauffe : compilation JIT et ressources partagées hors mesure
+        run_session(parameters, timeout)
+
+        for sessions in session_counts:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=sessions) as executor:
+                runs = list(executor.map(lambda _: run_session(parameters, timeout),
+                                         range(sessions)))
+            elapsed = time.perf_counter() - start
+
+            latencies = [run['initial_run'] + run['calculation'] for run in runs]
+            level = {
+                'sessions': sessions,
+                'throughput': sessions / elapsed,
+                'median_latency': statistics.median(latencies),
+                'max_latency': max(latencies),
+                'exceptions': [message for run in runs for message in run['exceptions']]
+            }
+            if (saturation is None and levels
+                    and level['throughput'] < levels[-1]['throughput'] * saturation_gain):
+                saturation = levels[-1]['sessions']
+            levels.append(level)
+    finally:
+        config.set_option('global.appTest', app_test_option)
+
+    return {'levels': levels, 'saturation': saturation}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure headless de la latence de l'application")
+    parser.add_argument('--repeats', type=int, default=3, help="Exécutions par combinaison")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="Niveaux de concurrence simulés")
+    parser.add_argument('--timeout', type=float, default=120, help="Durée maximale d'un rerun (s)")
+    args = parser.parse_args(argv)
+
+    # Stockage en mémoire : pas d'écriture dans la base de l'application
+    os.environ.setdefault('DELTAP_STORE_PATH', ':memory:')
+
+    print("⏱️  Latence par combinaison de paramètres")
+    print("=" * 60)
+    for result in measure_latency(repeats=args.repeats, timeout=args.timeout):
+        warm = result['warm_median']
+        print(f"{result['parameters']}")
+        print(f"   - Froid : {result['cold']:.2f} s"
+              + (f" | à chaud (médiane) : {warm:.2f} s" if warm is not None else "")
+              + f" | pic mémoire : {result['peak_memory_median_mb']:.1f} Mo"
+              + f" (max {result['peak_memory_mb']:.1f} Mo)"
+              + f" | éléments : {result['elements']}")
+        for message in result['exceptions']:
+            print(f"   ❌ {message}")
+
+    print()
+    print("👥 Sessions concurrentes")
+    print("=" * 60)
+    concurrency = measure_concurrency(args.sessions, timeout=args.timeout * 4)
+    for level in concurrency['levels']:
+        print(f"   - {level['sessions']} session(s) : {level['throughput']:.2f} sessions/s, "
+              f"latence médiane {level['median_latency']:.2f} s, max {level['max_latency']:.2f} s")
+    if concurrency['saturation'] is None:
+        print("   Saturation non atteinte")
+    else:
+        print(f"   Saturation à {concurrency['saturation']} session(s) simultanée(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import threading
+
+
+class JobCancelled(Exception):
+    """
+    Levée dans une tâche de fond lorsque son annulation a été demandée
+    """
+
+
+class JobContext:
+    """
+    Contexte transmis à une tâche de fond : annulation coopérative et progression
+    """
+
+    def __init__(self):
+        self._cancel_event = threading.Event()
+        self.progress = 0.0
+        self.message = ""
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """
+        Point d'annulation : à appeler entre deux étapes de calcul
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def report_progress(self, progress, message=""):
+        self.check_cancelled()
+        self.progress = progress
+        self.message = message
+
+
+class BackgroundJob:
+    """
+    Calcul soumis à un exécuteur, identifié par la clé de ses paramètres
+    """
+
+    def __init__(self, key, future, context, release=None):
+        self.key = key
+        self.future = future
+        self.context = context
+        self._release = release
+        self._released = False
+
+    @property
+    def progress(self):
+        return self.context.progress
+
+    @property
+    def message(self):
+        return self.context.message
+
+    def done(self):
+        return self.future.done()
+
+    def cancelled(self):
+        return self._released or self.context.is_cancelled()
+
+    def cancel(self):
+        """
+        Annule la tâche : retirée de la file si elle n'a pas démarré,
+        interrompue au prochain point d'annulation sinon
+
+        Une tâche partagée (voir submit_job) n'est annulée que lorsque tous
+        ses demandeurs l'ont annulée.
+        """
+        if self._release is not None:
+            if self._released:
+                return
+            self._released = True
+            if not self._release():
+                return
+        self.context.cancel()
+        self.future.cancel()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout=timeout)
+
+
+def submit_job(executor, key, fn, *args, flight=None, **kwargs):
+    """
+    Soumet fn(context, *args, **kwargs) à l'exécuteur et retourne un BackgroundJob
+
+    Args:
+        flight: single_flight.SingleFlight partagé (par ex. entre sessions) :
+                les soumissions de la même clé pendant l'exécution d'une tâche
+                s'y rattachent (même résultat, même progression) au lieu de
+                relancer le calcul
+    """
+    def start():
+        context = JobContext()
+        return BackgroundJob(key, executor.submit(fn, context, *args, **kwargs), context)
+
+    if flight is None:
+        return start()
+    shared = flight.join(key, start)
+    return BackgroundJob(key, shared.future, shared.context,
+                         release=lambda: flight.release(key, shared))
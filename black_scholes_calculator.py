@@ -1,15 +1,70 @@
 import numpy as np
 import scipy.stats as stats
+from scipy import special
 from datetime import datetime, timedelta
 import math
+import time
+
+from hedging_simulator import simulate_delta_hedging
+from volume_risk import simulate_imbalance_cost
+from pricing_backends import get_backend
+from business_calendar import DAY_COUNT_CONVENTIONS
+from curves import ForwardCurve, VolTermStructure
+
+_SQRT2 = math.sqrt(2.0)
+_REAL_SCALARS = (float, int, np.floating, np.integer)
+
+# Histogramme des bandes de centiles (simulate_price_fan) : classes du rendement
+# normé par volatility·√t, sur ±FAN_RANGE (au-delà, cumulé dans la classe extrême)
+FAN_BINS = 4800
+FAN_RANGE = 12.0
+
+
+def _norm_cdf(x):
+    """
+    Fonction de répartition de la loi normale centrée réduite, pour un scalaire
+    
+    Même valeur que scipy.stats.norm.cdf (à 1e-14 près), sans le coût
+    d'appel de la machinerie générique des lois de scipy.stats.
+    """
+    return 0.5 * math.erfc(-x / _SQRT2)
+
+
+_MATH_FUNCTIONS = (math.log, math.exp, math.sqrt, _norm_cdf)
+_NUMPY_FUNCTIONS = (np.log, np.exp, np.sqrt, stats.norm.cdf)
+
+
+def _math_functions(S, K, *others):
+    """
+    Fonctions (log, exp, sqrt, cdf) adaptées aux arguments
+    
+    Chemin rapide du module math pour des scalaires réels à prix positifs,
+    numpy et scipy.stats sinon (tableaux, prix nuls ou négatifs).
+    """
+    for value in (S, K) + others:
+        if not isinstance(value, _REAL_SCALARS):
+            return _NUMPY_FUNCTIONS
+    if S > 0 and K > 0:
+        return _MATH_FUNCTIONS
+    return _NUMPY_FUNCTIONS
+
 
 class BlackScholesCalculator:
     """
     Calculateur de couverture de prix basé sur le modèle Black & Scholes
     """
     
-    def __init__(self):
-        pass
+    def __init__(self, backend=None, calendar=None):
+        """
+        Args:
+            backend: Backend des noyaux vectorisés ('numpy', 'numba', 'auto'),
+                     voir pricing_backends.get_backend
+            calendar: Calendrier et convention de décompte des fractions d'année
+                      (business_calendar.BusinessCalendar) ; par défaut, jours
+                      calendaires écoulés depuis l'instant présent / 365
+        """
+        self.backend = get_backend(backend)
+        self.calendar = calendar
     
     def black_scholes_call(self, S, K, T, r, sigma):
         """
@@ -25,14 +80,15 @@ class BlackScholesCalculator:
         if T <= 0:
             return max(S - K, 0)
         
+        log, exp, sqrt, cdf = _math_functions(S, K, T, r, sigma)
         if sigma <= 0:
             # Si volatilité nulle, le prix est simplement la valeur intrinsèque
-            return max(S - K * np.exp(-r * T), 0)
+            return max(S - K * exp(-r * T), 0)
         
-        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
+        d1 = (log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * sqrt(T))
+        d2 = d1 - sigma * sqrt(T)
         
-        call_price = S * stats.norm.cdf(d1) - K * np.exp(-r * T) * stats.norm.cdf(d2)
+        call_price = S * cdf(d1) - K * exp(-r * T) * cdf(d2)
         return call_price
     
     def black_scholes_put(self, S, K, T, r, sigma):
@@ -42,14 +98,15 @@ class BlackScholesCalculator:
         if T <= 0:
             return max(K - S, 0)
         
+        log, exp, sqrt, cdf = _math_functions(S, K, T, r, sigma)
         if sigma <= 0:
             # Si volatilité nulle, le prix est simplement la valeur intrinsèque
-            return max(K * np.exp(-r * T) - S, 0)
+            return max(K * exp(-r * T) - S, 0)
         
-        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
+        d1 = (log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * sqrt(T))
+        d2 = d1 - sigma * sqrt(T)
         
-        put_price = K * np.exp(-r * T) * stats.norm.cdf(-d2) - S * stats.norm.cdf(-d1)
+        put_price = K * exp(-r * T) * cdf(-d2) - S * cdf(-d1)
         return put_price
     
     def calculate_delta_call(self, S, K, T, r, sigma):
@@ -59,12 +116,13 @@ class BlackScholesCalculator:
         if T <= 0:
             return 1.0 if S > K else 0.0
         
+        log, exp, sqrt, cdf = _math_functions(S, K, T, r, sigma)
         if sigma <= 0:
             # Si volatilité nulle, le delta est binaire
-            return 1.0 if S > K * np.exp(-r * T) else 0.0
+            return 1.0 if S > K * exp(-r * T) else 0.0
         
-        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-        return stats.norm.cdf(d1)
+        d1 = (log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * sqrt(T))
+        return cdf(d1)
     
     def calculate_delta_put(self, S, K, T, r, sigma):
         """
@@ -73,12 +131,13 @@ class BlackScholesCalculator:
         if T <= 0:
             return -1.0 if S < K else 0.0
         
+        log, exp, sqrt, cdf = _math_functions(S, K, T, r, sigma)
         if sigma <= 0:
             # Si volatilité nulle, le delta est binaire
-            return -1.0 if S < K * np.exp(-r * T) else 0.0
+            return -1.0 if S < K * exp(-r * T) else 0.0
         
-        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-        return stats.norm.cdf(d1) - 1
+        d1 = (log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * sqrt(T))
+        return cdf(d1) - 1
     
     def calculate_price_hedge(self, current_price, start_date, end_date, volatility, 
                             coverage_percentile, risk_free_rate=0.0):
@@ -86,10 +145,12 @@ class BlackScholesCalculator:
         Calcul de la couverture de prix basée sur Black & Scholes
         
         Args:
-            current_price: Prix actuel du sous-jacent
+            current_price: Prix actuel du sous-jacent, ou courbe forward
+                           (curves.ForwardCurve : forward moyen de la période de livraison)
             start_date: Date de début du contrat (datetime)
             end_date: Date de fin du contrat (datetime)
-            volatility: Volatilité annuelle
+            volatility: Volatilité annuelle, ou structure par terme
+                        (curves.VolTermStructure : volatilité à la holding period)
             coverage_percentile: Centile de couverture (0-100)
             risk_free_rate: Taux d'intérêt sans risque (défaut: 0%)
         
@@ -110,13 +171,15 @@ class BlackScholesCalculator:
             end_datetime = datetime.combine(end_date, datetime.min.time())
         
         # Calcul du temps jusqu'à la fin du contrat
-        time_to_delivery = (end_datetime - today).days / 365.0
+        time_to_delivery = self.year_fraction(today, end_datetime)
         
         # Calcul du milieu de la période de livraison
         delivery_midpoint = start_datetime + (end_datetime - start_datetime) / 2
         
         # Calcul de la holding period (entre aujourd'hui et le milieu de la livraison)
-        holding_period = (delivery_midpoint - today).days / 365.0
+        holding_period = self.year_fraction(today, delivery_midpoint)
+        current_price, volatility = self._market_inputs(
+            current_price, volatility, start_datetime, end_datetime, holding_period)
         
         if time_to_delivery <= 0:
             return {
@@ -129,7 +192,7 @@ class BlackScholesCalculator:
         
         # Calcul du prix d'exercice basé sur le centile de couverture
         # CORRECTION : Utilisation d'une formule qui augmente avec la volatilité
-        z_score = stats.norm.ppf(coverage_percentile / 100.0)
+        z_score = special.ndtri(coverage_percentile / 100.0)
         
         # Option 1: Formule originale (delta baisse avec volatilité)
         # strike_price = current_price * np.exp(
@@ -139,9 +202,14 @@ class BlackScholesCalculator:
         
         # Formule originale (cohérente avec le code VBA)
         # Le terme -0.5*volatility^2 est la correction de convexité Black & Scholes
-        strike_price = current_price * np.exp(
+        # Module math pour un contrat scalaire, numpy sinon (holding period négative comprise)
+        _, exp, sqrt, _ = _math_functions(current_price, 1.0, volatility, z_score,
+                                          risk_free_rate, holding_period)
+        if holding_period < 0:
+            exp, sqrt = np.exp, np.sqrt
+        strike_price = current_price * exp(
             (risk_free_rate - 0.5 * volatility**2) * holding_period + 
-            z_score * volatility * np.sqrt(holding_period)
+            z_score * volatility * sqrt(holding_period)
         )
         
         # Calcul des prix d'options (utilisant la holding period)
@@ -176,11 +244,189 @@ class BlackScholesCalculator:
             'risk_free_rate': risk_free_rate
         }
     
+    def calculate_price_hedge_batch(self, current_price, start_date, end_date, volatility,
+                                    coverage_percentile, risk_free_rate=0.0):
+        """
+        Version vectorisée de calculate_price_hedge sur des tableaux de contrats
+        
+        Tous les paramètres peuvent être des scalaires ou des tableaux (diffusion
+        numpy) ; les dates acceptent date/datetime ou des tableaux datetime64.
+        current_price et volatility acceptent aussi une courbe forward et une
+        structure par terme de volatilité, lues pour tous les contrats en une
+        seule interpolation vectorisée. Les contrats échus ont 'valid' à False et des résultats NaN.
+        
+        Returns:
+            dict: Mêmes clés que calculate_price_hedge, valeurs en tableaux numpy
+        """
+        today = np.datetime64(datetime.now(), 'us')
+        start_datetime = self._to_datetime64(start_date)
+        end_datetime = self._to_datetime64(end_date)
+        
+        time_to_delivery = self.year_fraction(today, end_datetime)
+        delivery_midpoint = start_datetime + (end_datetime - start_datetime) / 2
+        holding_period = self.year_fraction(today, delivery_midpoint)
+        current_price, volatility = self._market_inputs(
+            current_price, volatility, start_datetime, end_datetime, holding_period)
+        
+        current_price, volatility, coverage_percentile, risk_free_rate = (
+            np.asarray(value, dtype=float)
+            for value in (current_price, volatility, coverage_percentile, risk_free_rate)
+        )
+        
+        z_score = special.ndtri(coverage_percentile / 100.0)
+        with np.errstate(invalid='ignore'):
+            strike_price = current_price * np.exp(
+                (risk_free_rate - 0.5 * volatility**2) * holding_period + 
+                z_score * volatility * np.sqrt(holding_period)
+            )
+        
+        valid = np.broadcast_to(time_to_delivery > 0, np.broadcast_shapes(
+            np.shape(strike_price), np.shape(time_to_delivery)))
+        strike_price = np.where(valid, strike_price, np.nan)
+        
+        backend = self.backend
+        return {
+            'current_price': current_price,
+            'start_date': start_datetime,
+            'end_date': end_datetime,
+            'time_to_delivery': np.where(valid, time_to_delivery, 0.0),
+            'holding_period': holding_period,
+            'volatility': volatility,
+            'coverage_percentile': coverage_percentile,
+            'strike_price': strike_price,
+            'price_delta': strike_price - current_price,
+            'call_price': backend.call_price(current_price, strike_price, holding_period,
+                                             risk_free_rate, volatility),
+            'put_price': backend.put_price(current_price, strike_price, holding_period,
+                                           risk_free_rate, volatility),
+            'call_delta': backend.call_delta(current_price, strike_price, holding_period,
+                                             risk_free_rate, volatility),
+            'put_delta': backend.put_delta(current_price, strike_price, holding_period,
+                                           risk_free_rate, volatility),
+            'risk_free_rate': risk_free_rate,
+            'valid': valid
+        }
+    
+    def sweep_price_hedge(self, current_price, start_date, end_date, volatility,
+                          coverage_percentile, risk_free_rate=0.0):
+        """
+        Balayage de sensibilité de calculate_price_hedge sur une grille de paramètres
+        
+        Chaque paramètre numérique passé sous forme de liste/tableau devient un
+        axe de la grille (produit cartésien, dans l'ordre des arguments) ; les
+        scalaires restent fixes. Le calcul est fait en un seul appel vectorisé.
+        
+        Exemple:
+            sweep_price_hedge(100, debut, fin, volatility=np.linspace(0.01, 1, 100),
+                              coverage_percentile=np.arange(1, 100))
+            -> résultats de forme (100, 99)
+        
+        Returns:
+            dict: Résultats de calculate_price_hedge_batch, plus 'axes'
+                  (nom du paramètre -> valeurs, dans l'ordre des dimensions)
+        """
+        parameters = {
+            'current_price': current_price,
+            'volatility': volatility,
+            'coverage_percentile': coverage_percentile,
+            'risk_free_rate': risk_free_rate
+        }
+        axes = {name: np.asarray(values, dtype=float)
+                for name, values in parameters.items() if np.ndim(values) > 0}
+        
+        grid = dict(parameters)
+        if axes:
+            grid.update(zip(axes, np.meshgrid(*axes.values(), indexing='ij', sparse=True)))
+        
+        results = self.calculate_price_hedge_batch(
+            grid['current_price'], start_date, end_date, grid['volatility'],
+            grid['coverage_percentile'], grid['risk_free_rate']
+        )
+        shape = tuple(len(values) for values in axes.values())
+        for key in ('strike_price', 'price_delta', 'call_price', 'put_price',
+                    'call_delta', 'put_delta', 'valid'):
+            results[key] = np.broadcast_to(results[key], shape)
+        results['axes'] = axes
+        return results
+    
+    def _market_inputs(self, current_price, volatility, start_date, end_date, holding_period):
+        """
+        Prix et volatilité des contrats, lus sur les courbes le cas échéant
+        
+        Une courbe forward donne le forward moyen de la période de livraison,
+        une structure par terme la volatilité à l'échéance holding_period ;
+        les valeurs numériques sont renvoyées telles quelles.
+        """
+        if isinstance(current_price, ForwardCurve):
+            current_price = current_price.forward(start_date, end_date)
+        if isinstance(volatility, VolTermStructure):
+            volatility = volatility.volatility(holding_period)
+        return current_price, volatility
+    
+    def _to_datetime64(self, values):
+        """
+        Conversion de dates (date, datetime ou tableaux) en datetime64[us]
+        """
+        if isinstance(values, datetime):
+            return np.datetime64(values, 'us')
+        if hasattr(values, 'year') and not isinstance(values, np.ndarray):
+            return np.datetime64(datetime.combine(values, datetime.min.time()), 'us')
+        return np.asarray(values, dtype='datetime64[us]')
+    
+    def year_fraction(self, start, end):
+        """
+        Fraction d'année entre deux dates (scalaires ou tableaux)
+        
+        Sans calendrier : jours entiers écoulés (arrondis vers le bas, comme
+        timedelta.days) / 365 ; sinon convention du calendrier, sur des dates
+        sans heure.
+        """
+        if self.calendar is not None:
+            return self.calendar.year_fraction(start, end)
+        if isinstance(start, datetime) and isinstance(end, datetime):
+            return (end - start).days / 365.0
+        return ((self._to_datetime64(end) - self._to_datetime64(start))
+                // np.timedelta64(1, 'D')) / 365.0
+    
+    def _days_per_year(self):
+        """
+        Nombre de jours de décompte par an (365 sans calendrier)
+        """
+        if self.calendar is None:
+            return 365
+        return int(DAY_COUNT_CONVENTIONS[self.calendar.convention])
+    
     def calculate_price_scenarios(self, current_price, start_date, end_date, volatility, 
                                 risk_free_rate=0.0, num_scenarios=10000):
         """
         Calcul de différents scénarios de prix pour analyse de sensibilité
         """
+        scenarios = self.simulate_price_scenarios(current_price, start_date, end_date,
+                                                  volatility, risk_free_rate, num_scenarios)
+        if scenarios is None:
+            return []
+        
+        return [
+            {'future_price': future_price, 'price_delta': price_delta, 'shock': shock}
+            for future_price, price_delta, shock in zip(scenarios['future_price'],
+                                                        scenarios['price_delta'],
+                                                        scenarios['shock'])
+        ]
+    
+    def simulate_price_scenarios(self, current_price, start_date, end_date, volatility, 
+                                 risk_free_rate=0.0, num_scenarios=10000, strike_price=None,
+                                 option_type='call'):
+        """
+        Version vectorisée de calculate_price_scenarios
+        
+        Si strike_price est fourni, les grecques Monte Carlo de l'option sur le
+        prix futur sont estimées sur les mêmes tirages (voir _scenario_greeks).
+        
+        Returns:
+            dict: Tableaux numpy 'future_price', 'price_delta' et 'shock'
+                  (et 'greeks' si strike_price est fourni), ou None si la
+                  date de fin du contrat est passée
+        """
         today = datetime.now()
         
         # Gestion des types de date
@@ -194,36 +440,401 @@ class BlackScholesCalculator:
         else:
             end_datetime = datetime.combine(end_date, datetime.min.time())
         
-        time_to_delivery = (end_datetime - today).days / 365.0
+        time_to_delivery = self.year_fraction(today, end_datetime)
         
         if time_to_delivery <= 0:
-            return []
+            return None
         
         # Génération de scénarios de prix avec plus de dispersion
         np.random.seed(42)  # Pour la reproductibilité
         
         # Utilisation de la holding period pour les scénarios
-        holding_period = (end_datetime - start_datetime).days / 365.0 / 2  # Milieu de la période
+        holding_period = self.year_fraction(start_datetime, end_datetime) / 2  # Milieu de la période
+        
+        random_shocks = self.generate_scenario_shocks(num_scenarios)
+        
+        future_prices = self.backend.scenario_prices(
+            current_price, random_shocks,
+            (risk_free_rate - 0.5 * volatility**2) * holding_period,
+            volatility * np.sqrt(holding_period)
+        )
+        
+        scenarios = {
+            'future_price': future_prices,
+            'price_delta': future_prices - current_price,
+            'shock': random_shocks
+        }
+        
+        if strike_price is not None:
+            scenarios['greeks'] = self._scenario_greeks(
+                current_price, strike_price, future_prices, random_shocks,
+                self._scenario_shock_scores(random_shocks, num_scenarios),
+                holding_period, risk_free_rate, volatility, option_type
+            )
+        
+        return scenarios
+    
+    def simulate_price_scenarios_adaptive(self, current_price, start_date, end_date, volatility,
+                                          risk_free_rate=0.0, percentiles=(95, 99),
+                                          tolerance=0.005, time_budget=2.0, batch_size=10000,
+                                          max_scenarios=2000000, confidence=0.95, seed=42,
+                                          callback=None):
+        """
+        Scénarios de prix tirés par lots jusqu'à convergence des centiles demandés
+        
+        Après chaque lot, un intervalle de confiance non paramétrique (par
+        statistiques d'ordre) est calculé pour chaque centile. La simulation
+        s'arrête dès que toutes les demi-largeurs relatives sont inférieures à
+        `tolerance`, ou lorsque le budget de temps ou `max_scenarios` est atteint.
+        
+        Args:
+            percentiles: Centiles suivis (0-100)
+            tolerance: Demi-largeur relative cible de l'intervalle (ex: 0.005 = ±0.5%)
+            time_budget: Durée maximale en secondes
+            batch_size: Taille minimale d'un lot de chocs Student (plus 10% de chocs
+                        extrêmes) ; les lots suivants visent le nombre de tirages estimé
+            max_scenarios: Nombre maximal de scénarios
+            confidence: Niveau de confiance des intervalles
+            seed: Graine du générateur (le premier lot reproduit simulate_price_scenarios)
+            callback: Fonction appelée après chaque lot avec (num_draws, achieved_tolerance)
+        
+        Returns:
+            dict: Tableaux de simulate_price_scenarios, plus 'percentiles'
+                  (centile -> estimation et bornes), 'achieved_tolerance',
+                  'num_draws', 'converged' et 'elapsed' ; None si la date de
+                  fin du contrat est passée
+        """
+        start_time = time.perf_counter()
         
+        if isinstance(start_date, datetime):
+            start_datetime = start_date
+        else:
+            start_datetime = datetime.combine(start_date, datetime.min.time())
+            
+        if isinstance(end_date, datetime):
+            end_datetime = end_date
+        else:
+            end_datetime = datetime.combine(end_date, datetime.min.time())
+        
+        if self.year_fraction(datetime.now(), end_datetime) <= 0:
+            return None
+        
+        holding_period = self.year_fraction(start_datetime, end_datetime) / 2  # Milieu de la période
+        drift = (risk_free_rate - 0.5 * volatility**2) * holding_period
+        vol_sqrt_t = volatility * np.sqrt(holding_period)
+        
+        random_state = np.random.RandomState(seed)
+        z = special.ndtri(0.5 + confidence / 2)
+        quantiles = np.asarray(percentiles, dtype=float) / 100.0
+        
+        random_shocks = np.empty(0)
+        next_batch = batch_size
+        while True:
+            random_shocks = np.concatenate([random_shocks,
+                                            self.generate_scenario_shocks(next_batch, random_state)])
+            num_draws = len(random_shocks)
+            
+            # Intervalles par statistiques d'ordre sur les chocs (transformation monotone)
+            spread = z * np.sqrt(num_draws * quantiles * (1 - quantiles))
+            lower_ranks = np.clip(np.floor(num_draws * quantiles - spread).astype(int), 0, num_draws - 1)
+            upper_ranks = np.clip(np.ceil(num_draws * quantiles + spread).astype(int), 0, num_draws - 1)
+            order_statistics = np.partition(random_shocks, np.unique(np.concatenate([lower_ranks, upper_ranks])))
+            
+            estimates = current_price * np.exp(drift + np.percentile(random_shocks, percentiles) * vol_sqrt_t)
+            lower = current_price * np.exp(drift + order_statistics[lower_ranks] * vol_sqrt_t)
+            upper = current_price * np.exp(drift + order_statistics[upper_ranks] * vol_sqrt_t)
+            achieved_tolerance = float(np.max((upper - lower) / (2 * np.abs(estimates))))
+            
+            if callback is not None:
+                callback(num_draws, achieved_tolerance)
+            
+            converged = achieved_tolerance <= tolerance
+            if (converged or time.perf_counter() - start_time >= time_budget
+                    or num_draws + batch_size * 1.1 > max_scenarios):
+                break
+            
+            # Taille du lot suivant : la demi-largeur décroît en 1/sqrt(n), on vise
+            # directement le nombre de tirages nécessaire (au plus un doublement)
+            target_draws = num_draws * (achieved_tolerance / tolerance) ** 2
+            next_batch = int(np.clip((target_draws - num_draws) / 1.1, batch_size, num_draws / 1.1))
+            next_batch = batch_size * int(np.ceil(next_batch / batch_size))
+            next_batch = min(next_batch, int((max_scenarios - num_draws) / 1.1))
+        
+        future_prices = self.backend.scenario_prices(current_price, random_shocks, drift, vol_sqrt_t)
+        
+        return {
+            'future_price': future_prices,
+            'price_delta': future_prices - current_price,
+            'shock': random_shocks,
+            'percentiles': {
+                p: {'estimate': float(estimate), 'lower': float(low), 'upper': float(high)}
+                for p, estimate, low, high in zip(percentiles, estimates, lower, upper)
+            },
+            'achieved_tolerance': achieved_tolerance,
+            'num_draws': num_draws,
+            'converged': converged,
+            'elapsed': time.perf_counter() - start_time
+        }
+    
+    def simulate_price_fan(self, current_price, start_date, end_date, volatility,
+                           risk_free_rate=0.0, num_paths=10000, num_steps=100,
+                           quantiles=(5, 25, 50, 75, 95), chunk_size=2000, seed=42):
+        """
+        Bandes de centiles (fan chart) du prix simulé sur une grille de temps
+        
+        Chaque trajectoire est un pont brownien aboutissant à un choc terminal
+        tiré selon le modèle de scénarios (Student + 10% de chocs extrêmes) : à
+        l'horizon, la distribution est celle des scénarios, avec des trajectoires
+        continues entre aujourd'hui et la fin du contrat.
+        
+        Les trajectoires sont simulées par blocs ; chaque bloc est ajouté à un
+        histogramme par pas (rendement normé par volatility·√t, FAN_BINS
+        classes sur ±FAN_RANGE écarts-types) qui se cumule exactement d'un
+        bloc à l'autre. Les centiles sont lus sur l'histogramme cumulé de
+        toutes les trajectoires (interpolation linéaire dans la classe, erreur
+        inférieure à une demi-classe) : la mémoire conservée est O(pas × classes)
+        et le résultat ne dépend pas du découpage en blocs.
+        
+        Args:
+            num_paths: Nombre de trajectoires simulées
+            num_steps: Nombre de pas de temps jusqu'à la fin du contrat
+            quantiles: Centiles des bandes (0-100)
+            chunk_size: Nombre de trajectoires par bloc
+            seed: Graine du générateur aléatoire
+        
+        Returns:
+            dict: 'times' (années), 'quantiles' (centile -> tableau par pas),
+                  ou None si la date de fin du contrat est passée
+        """
+        if isinstance(end_date, datetime):
+            end_datetime = end_date
+        else:
+            end_datetime = datetime.combine(end_date, datetime.min.time())
+        
+        time_to_delivery = self.year_fraction(datetime.now(), end_datetime)
+        if time_to_delivery <= 0:
+            return None
+        
+        rng = np.random.default_rng(seed)
+        times = np.linspace(0, time_to_delivery, num_steps + 1)
+        dt = time_to_delivery / num_steps
+        drift = (risk_free_rate - 0.5 * volatility**2) * times[1:]
+        bridge_weights = times[1:] / time_to_delivery
+        
+        # Histogramme par pas du rendement normé, cumulé sur les blocs
+        scale = volatility * np.sqrt(times[1:])
+        bin_width = 2 * FAN_RANGE / FAN_BINS
+        offsets = np.arange(num_steps) * FAN_BINS
+        counts = np.zeros(num_steps * FAN_BINS, dtype=np.int64)
+        for start in range(0, num_paths, chunk_size):
+            n = min(chunk_size, num_paths - start)
+            
+            # Choc terminal selon le modèle de scénarios (mélange Student / extrêmes)
+            extreme = rng.random(n) < 1.0 / 11.0
+            terminal_shocks = np.where(extreme, rng.normal(0, 2, n), rng.standard_t(3, n))
+            
+            # Pont brownien entre 0 et le choc terminal
+            brownian = np.cumsum(rng.standard_normal((n, num_steps)) * np.sqrt(dt), axis=1)
+            brownian -= bridge_weights * brownian[:, -1:]
+            log_returns = drift + volatility * (
+                bridge_weights * terminal_shocks[:, None] * np.sqrt(time_to_delivery) + brownian
+            )
+            
+            bins = np.floor(((log_returns - drift) / scale + FAN_RANGE) / bin_width)
+            bins = np.clip(bins, 0, FAN_BINS - 1).astype(np.int64)
+            counts += np.bincount((bins + offsets).ravel(), minlength=counts.size)
+        
+        # Centiles : classe atteinte par l'effectif cumulé, interpolée linéairement
+        counts = counts.reshape(num_steps, FAN_BINS)
+        cumulative = np.cumsum(counts, axis=1)
+        targets = np.asarray(quantiles, dtype=float)[:, None, None] / 100.0 * num_paths
+        bins = np.minimum((cumulative[None] < targets).sum(axis=2), FAN_BINS - 1)
+        steps = np.arange(num_steps)
+        below = cumulative[steps, bins] - counts[steps, bins]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.clip((targets[:, :, 0] - below) / counts[steps, bins], 0.0, 1.0)
+        normed = (bins + np.nan_to_num(fraction, nan=0.5)) * bin_width - FAN_RANGE
+        bands = current_price * np.exp(drift + scale * normed)
+        return {
+            'times': times,
+            'quantiles': {
+                q: np.concatenate([[current_price], band]) for q, band in zip(quantiles, bands)
+            },
+            'num_paths': num_paths
+        }
+    
+    def generate_scenario_shocks(self, num_scenarios, random_state=np.random):
+        """
+        Chocs du modèle de scénarios : Student à queues épaisses + 10% de scénarios extrêmes
+        
+        Args:
+            num_scenarios: Nombre de chocs Student (suivis de num_scenarios // 10 chocs extrêmes)
+            random_state: Générateur (np.random.RandomState pour un tirage reproductible)
+        
+        Returns:
+            np.ndarray: num_scenarios + num_scenarios // 10 chocs
+        """
         # Génération de chocs plus dispersés (distribution t de Student pour plus de queues épaisses)
         degrees_of_freedom = 3  # Pour des queues plus épaisses
-        random_shocks = np.random.standard_t(degrees_of_freedom, num_scenarios)
+        random_shocks = random_state.standard_t(degrees_of_freedom, num_scenarios)
         
         # Ajout de quelques scénarios extrêmes
-        extreme_shocks = np.random.normal(0, 2, num_scenarios // 10)  # 10% de scénarios extrêmes
-        random_shocks = np.concatenate([random_shocks, extreme_shocks])
+        extreme_shocks = random_state.normal(0, 2, num_scenarios // 10)  # 10% de scénarios extrêmes
+        return np.concatenate([random_shocks, extreme_shocks])
+    
+    def _scenario_shock_scores(self, shocks, num_scenarios):
+        """
+        Score -f'(x)/f(x) de la densité de chaque choc (estimateur du rapport de vraisemblance)
         
-        scenarios = []
-        for shock in random_shocks:
-            future_price = current_price * np.exp(
-                (risk_free_rate - 0.5 * volatility**2) * holding_period + 
-                shock * volatility * np.sqrt(holding_period)
-            )
-            price_delta = future_price - current_price
-            scenarios.append({
-                'future_price': future_price,
-                'price_delta': price_delta,
-                'shock': shock
-            })
-        
-        return scenarios 
\ No newline at end of file
+        Les num_scenarios premiers chocs suivent une Student à 3 degrés de
+        liberté, les suivants une loi normale d'écart-type 2.
+        """
+        degrees_of_freedom = 3
+        scores = np.empty_like(shocks)
+        student = shocks[:num_scenarios]
+        scores[:num_scenarios] = (degrees_of_freedom + 1) * student / (degrees_of_freedom + student**2)
+        scores[num_scenarios:] = shocks[num_scenarios:] / 2**2
+        return scores
+    
+    def _scenario_shock_normal_scores(self, shocks, num_scenarios):
+        """
+        Scores normaux Φ⁻¹(F(x)) des chocs, F étant la loi du mélange des scénarios
+        
+        Le mélange compte num_scenarios chocs Student (3 degrés de liberté)
+        pour num_scenarios // 10 chocs normaux d'écart-type 2.
+        """
+        extreme_weight = (num_scenarios // 10) / (num_scenarios + num_scenarios // 10)
+        cdf = ((1 - extreme_weight) * stats.t.cdf(shocks, 3)
+               + extreme_weight * special.ndtr(shocks / 2))
+        return special.ndtri(cdf)
+    
+    def _scenario_greeks(self, current_price, strike_price, future_prices, shocks, scores,
+                         holding_period, risk_free_rate, volatility, option_type='call'):
+        """
+        Prix, delta, gamma et vega Monte Carlo de l'option sur le prix futur
+        
+        Estimateurs calculés en une passe sur les tirages des scénarios :
+        - delta et vega trajectoriels (pathwise) : dérivée du payoff le long
+          de chaque scénario ;
+        - gamma mixte rapport de vraisemblance / trajectoriel : delta
+          trajectoriel pondéré par le score de la densité des chocs, ce qui
+          reste valable pour les chocs à queues épaisses.
+        
+        Attention : avec des chocs de Student, l'espérance du prix futur (et
+        donc du payoff d'un call) n'est pas finie ; les estimations du call ne
+        convergent pas. Le put, borné, est bien défini.
+        
+        Returns:
+            dict: Estimations et erreurs standard ('<grecque>_std_error')
+        """
+        if option_type == 'call':
+            sign = 1.0
+        elif option_type == 'put':
+            sign = -1.0
+        else:
+            raise ValueError("option_type doit valoir 'call' ou 'put'")
+        
+        discount = np.exp(-risk_free_rate * holding_period)
+        vol_sqrt_t = volatility * np.sqrt(holding_period)
+        
+        in_the_money = sign * (future_prices - strike_price) > 0
+        payoff = np.where(in_the_money, sign * (future_prices - strike_price), 0.0)
+        # Dérivée du payoff par rapport au prix futur, actualisée
+        payoff_slope = np.where(in_the_money, sign * discount, 0.0)
+        
+        samples = {
+            'price': discount * payoff,
+            'delta': payoff_slope * future_prices / current_price,
+            'vega': payoff_slope * future_prices * (shocks * np.sqrt(holding_period)
+                                                   - volatility * holding_period)
+        }
+        with np.errstate(divide='ignore', invalid='ignore'):
+            samples['gamma'] = samples['delta'] * (scores / vol_sqrt_t - 1.0) / current_price
+        
+        num_samples = len(future_prices)
+        greeks = {}
+        for name, values in samples.items():
+            greeks[name] = float(np.mean(values))
+            greeks[f'{name}_std_error'] = float(np.std(values, ddof=1) / np.sqrt(num_samples))
+        return greeks
+    
+    def simulate_hedging_error(self, current_price, start_date, end_date, volatility,
+                               coverage_percentile, risk_free_rate=0.0, option_type='call',
+                               num_paths=10000, num_steps=None, transaction_cost=0.0, seed=42):
+        """
+        Distribution de l'erreur de couverture en delta jusqu'au milieu de livraison
+        
+        Le strike et l'échéance (holding period) sont ceux de calculate_price_hedge ;
+        par défaut le delta est rééquilibré quotidiennement.
+        
+        Returns:
+            dict: Résultats de simulate_delta_hedging, ou dict avec 'error'
+        """
+        hedge = self.calculate_price_hedge(current_price, start_date, end_date, volatility,
+                                           coverage_percentile, risk_free_rate)
+        if 'error' in hedge:
+            return hedge
+        
+        if hedge['holding_period'] <= 0:
+            return {'error': 'Le milieu de la période de livraison doit être dans le futur'}
+        
+        if num_steps is None:
+            num_steps = max(int(round(hedge['holding_period'] * self._days_per_year())), 1)
+        
+        return simulate_delta_hedging(
+            current_price, hedge['strike_price'], hedge['holding_period'], volatility,
+            risk_free_rate=risk_free_rate, option_type=option_type, num_paths=num_paths,
+            num_steps=num_steps, transaction_cost=transaction_cost, seed=seed,
+            backend=self.backend
+        )
+    
+    def simulate_volume_risk(self, current_price, start_date, end_date, volatility,
+                             forecast_volumes, contract_price=None, volume_volatility=0.1,
+                             correlation=0.3, risk_free_rate=0.0, num_scenarios=100000,
+                             percentiles=(50, 95, 99), max_chunk_elements=2**22, seed=42):
+        """
+        Coût d'écart volume (sur/sous-consommation, rachat de production) par scénario
+        
+        Les prix futurs suivent le modèle de simulate_price_scenarios (mêmes
+        tirages pour seed=42) ; les écarts de volume des sites leur sont
+        corrélés, voir volume_risk.simulate_imbalance_cost.
+        
+        Args:
+            forecast_volumes: Volume prévu par site (négatif pour une production)
+            contract_price: Prix du contrat par site (défaut: prix actuel)
+            volume_volatility: Écart-type relatif du volume par site
+            correlation: Corrélation entre choc de prix et écart de volume
+        
+        Returns:
+            dict: Résultats de simulate_imbalance_cost, plus 'future_price',
+                  ou None si la date de fin du contrat est passée
+        """
+        if isinstance(start_date, datetime):
+            start_datetime = start_date
+        else:
+            start_datetime = datetime.combine(start_date, datetime.min.time())
+            
+        if isinstance(end_date, datetime):
+            end_datetime = end_date
+        else:
+            end_datetime = datetime.combine(end_date, datetime.min.time())
+        
+        if self.year_fraction(datetime.now(), end_datetime) <= 0:
+            return None
+        
+        holding_period = self.year_fraction(start_datetime, end_datetime) / 2  # Milieu de la période
+        random_shocks = self.generate_scenario_shocks(num_scenarios, np.random.RandomState(seed))
+        future_prices = self.backend.scenario_prices(
+            current_price, random_shocks,
+            (risk_free_rate - 0.5 * volatility**2) * holding_period,
+            volatility * np.sqrt(holding_period)
+        )
+        
+        results = simulate_imbalance_cost(
+            future_prices, self._scenario_shock_normal_scores(random_shocks, num_scenarios),
+            forecast_volumes, current_price if contract_price is None else contract_price,
+            volume_volatility=volume_volatility, correlation=correlation,
+            percentiles=percentiles, max_chunk_elements=max_chunk_elements, seed=seed
+        )
+        results['future_price'] = future_prices
+        return results
@@ -0,0 +1,121 @@
+import time
+from datetime import date
+
+import numpy as np
+
+from hedge_store import (HEDGE_PARAMETERS, HEDGE_RESULTS, _iso_date, calculator_context,
+                         parameters_hash)
+
+
+# Termes propres au contrat et données de marché (valeurs par défaut du marché,
+# surchargeables contrat par contrat)
+CONTRACT_TERMS = ('start_date', 'end_date', 'coverage_percentile')
+MARKET_INPUTS = ('current_price', 'volatility', 'risk_free_rate')
+
+
+def contract_inputs(contract, market):
+    """
+    Paramètres de calcul d'un contrat : ses termes complétés par les données de marché
+
+    Args:
+        contract: dict avec 'contract_id', 'start_date', 'end_date',
+                  'coverage_percentile' et éventuellement des données de marché
+        market: dict des données de marché par défaut ('current_price',
+                'volatility', 'risk_free_rate')
+    """
+    inputs = {name: contract[name] for name in CONTRACT_TERMS}
+    for name in MARKET_INPUTS:
+        value = contract.get(name, market.get(name, 0.0 if name == 'risk_free_rate' else None))
+        if value is None:
+            raise ValueError(f"Donnée de marché manquante pour le contrat "
+                             f"{contract['contract_id']} : {name}")
+        inputs[name] = value
+    return inputs
+
+
+def contract_fingerprint(inputs, calculator=None):
+    """
+    Empreinte des paramètres de calcul d'un contrat (termes, données de marché
+    et calendrier / backend du calculateur, voir calculator_context)
+    """
+    return parameters_hash('contract', **inputs, **calculator_context(calculator))
+
+
+def reprice_book(calculator, store, contracts, market=None, as_of_date=None, force=False):
+    """
+    Recalcul incrémental des couvertures d'un portefeuille de contrats
+
+    Seuls sont recalculés les contrats dont l'empreinte (termes du contrat,
+    données de marché utilisées, calendrier et backend du calculateur) a changé depuis le dernier passage, ou dont
+    le dernier calcul date d'un jour antérieur (la holding period dépend de
+    la date du jour). Les contrats à recalculer sont valorisés en un appel à
+    calculate_price_hedge_batch et seules leurs lignes sont écrites dans le
+    stockage, avec leur nouvelle empreinte.
+
+    Les calculs sont faits à la date du jour ; as_of_date ne sert qu'à
+    dater les résultats enregistrés.
+
+    Args:
+        calculator: Instance de BlackScholesCalculator
+        store: Instance de HedgeStore
+        contracts: Itérable de dicts (voir contract_inputs), par exemple
+                   DataFrame.to_dict('records')
+        market: Données de marché par défaut
+        as_of_date: Date de calcul (défaut: aujourd'hui)
+        force: Recalcul de tous les contrats
+
+    Returns:
+        dict: 'recomputed' et 'expired' (identifiants), 'unchanged' (nombre),
+              'num_contracts', 'as_of_date' et 'elapsed' (secondes)
+    """
+    start_time = time.perf_counter()
+    market = market or {}
+    as_of_date = _iso_date(as_of_date or date.today())
+    previous = {} if force else store.get_fingerprints()
+
+    contract_ids, changed, fingerprints = [], [], {}
+    for contract in contracts:
+        contract_id = str(contract['contract_id'])
+        if contract_id in fingerprints:
+            raise ValueError(f"Identifiant de contrat en double : {contract_id}")
+        inputs = contract_inputs(contract, market)
+        fingerprint = contract_fingerprint(inputs, calculator)
+        fingerprints[contract_id] = fingerprint
+        contract_ids.append(contract_id)
+        if previous.get(contract_id) != (fingerprint, as_of_date):
+            changed.append((contract_id, inputs))
+
+    recomputed, expired = [], []
+    if changed:
+        ids = [contract_id for contract_id, _ in changed]
+        columns = {name: [inputs[name] for _, inputs in changed]
+                   for name in CONTRACT_TERMS + MARKET_INPUTS}
+        batch = calculator.calculate_price_hedge_batch(
+            np.asarray(columns['current_price'], dtype=float),
+            np.array([_iso_date(value) for value in columns['start_date']], dtype='datetime64[D]'),
+            np.array([_iso_date(value) for value in columns['end_date']], dtype='datetime64[D]'),
+            np.asarray(columns['volatility'], dtype=float),
+            np.asarray(columns['coverage_percentile'], dtype=float),
+            np.asarray(columns['risk_free_rate'], dtype=float)
+        )
+
+        results = []
+        for index, contract_id in enumerate(ids):
+            if not batch['valid'][index]:
+                expired.append(contract_id)
+                continue
+            results.append({name: batch[name][index] for name in HEDGE_PARAMETERS + HEDGE_RESULTS})
+            recomputed.append(contract_id)
+
+        store.record_hedges(results, as_of_date, recomputed, calculator)
+        store.record_fingerprints({contract_id: fingerprints[contract_id] for contract_id in ids},
+                                  as_of_date)
+
+    return {
+        'recomputed': recomputed,
+        'expired': expired,
+        'unchanged': len(contract_ids) - len(changed),
+        'num_contracts': len(contract_ids),
+        'as_of_date': as_of_date,
+        'elapsed': time.perf_counter() - start_time
+    }
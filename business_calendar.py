@@ -0,0 +1,157 @@
+import numpy as np
+
+
+# Conventions de décompte : nombre de jours (calendaires ou ouvrés) par an
+DAY_COUNT_CONVENTIONS = {
+    'ACT/365': 365.0,
+    'ACT/360': 360.0,
+    'BUS/252': 252.0,
+}
+
+
+def _to_days(values):
+    """
+    Conversion de dates (date, datetime, chaînes, datetime64 ou tableaux) en datetime64[D]
+
+    L'heure éventuelle est tronquée.
+    """
+    if hasattr(values, 'year') and not isinstance(values, np.ndarray):
+        return np.datetime64(values, 'D')
+    return np.asarray(values).astype('datetime64[D]')
+
+
+def easter_sunday(year):
+    """
+    Date de Pâques (calendrier grégorien, algorithme de Meeus/Jones/Butcher)
+    """
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return np.datetime64(f'{year:04d}-{month:02d}-{day:02d}', 'D')
+
+
+def french_holidays(first_year, last_year):
+    """
+    Jours fériés français de first_year à last_year inclus
+
+    Returns:
+        numpy.ndarray: Dates datetime64[D] triées
+    """
+    holidays = []
+    for year in range(first_year, last_year + 1):
+        holidays += [np.datetime64(f'{year:04d}-{month_day}', 'D') for month_day in
+                     ('01-01', '05-01', '05-08', '07-14', '08-15', '11-01', '11-11', '12-25')]
+        easter = easter_sunday(year)
+        # Lundi de Pâques, Ascension, lundi de Pentecôte
+        holidays += [easter + 1, easter + 39, easter + 50]
+    return np.sort(np.array(holidays, dtype='datetime64[D]'))
+
+
+class BusinessCalendar:
+    """
+    Calendrier de jours ouvrés et convention de décompte des fractions d'année
+
+    Le nombre cumulé de jours ouvrés est précalculé sur [first_date, last_date] :
+    le nombre de jours ouvrés entre deux dates est une différence de deux
+    lectures de tableau, quel que soit le nombre de triplets traités. Hors de
+    cette plage, le calcul se rabat sur numpy.busday_count.
+    """
+
+    def __init__(self, convention='ACT/365', holidays=(), weekmask='1111100',
+                 first_date='1970-01-01', last_date='2100-12-31'):
+        """
+        Args:
+            convention: Convention de décompte ('ACT/365', 'ACT/360' ou 'BUS/252')
+            holidays: Jours fériés (dates ou datetime64), voir french_holidays
+            weekmask: Jours ouvrés de la semaine, du lundi au dimanche
+            first_date, last_date: Plage de l'index précalculé
+        """
+        if convention not in DAY_COUNT_CONVENTIONS:
+            raise ValueError(f"Convention inconnue : {convention} "
+                             f"(disponibles : {', '.join(DAY_COUNT_CONVENTIONS)})")
+        self.convention = convention
+        self.weekmask = weekmask
+        self.holidays = np.unique(np.asarray(list(holidays), dtype='datetime64[D]'))
+
+        self.first_date = np.datetime64(first_date, 'D')
+        self.last_date = np.datetime64(last_date, 'D')
+        days = np.arange(self.first_date, self.last_date + 1)
+        self._business = np.is_busday(days, weekmask=weekmask, holidays=self.holidays)
+        # _cumulative[i] : jours ouvrés dans [first_date, first_date + i)
+        self._cumulative = np.zeros(days.size + 1, dtype=np.int64)
+        np.cumsum(self._business, out=self._cumulative[1:])
+
+    def _offsets(self, dates):
+        return (dates - self.first_date).astype(np.int64)
+
+    def _in_range(self, offsets):
+        return (offsets >= 0) & (offsets <= self._business.size)
+
+    def is_business_day(self, dates):
+        """
+        Jour ouvré ou non, pour une date ou un tableau de dates
+        """
+        dates = _to_days(dates)
+        offsets = self._offsets(dates)
+        inside = self._in_range(offsets) & (offsets < self._business.size)
+        if np.all(inside):
+            return self._business[offsets]
+        return np.is_busday(dates, weekmask=self.weekmask, holidays=self.holidays)
+
+    def business_days(self, start, end):
+        """
+        Nombre de jours ouvrés dans [start, end), de signe opposé si end < start
+
+        Contrairement à numpy.busday_count, qui compte ]end, start] lorsque
+        end < start, le décompte est antisymétrique.
+        """
+        start, end = _to_days(start), _to_days(end)
+        start_offsets, end_offsets = self._offsets(start), self._offsets(end)
+        inside = self._in_range(start_offsets) & self._in_range(end_offsets)
+
+        if np.all(inside):
+            return self._cumulative[end_offsets] - self._cumulative[start_offsets]
+
+        # Dates hors de l'index précalculé
+        start, end, inside, start_offsets, end_offsets = np.broadcast_arrays(
+            start, end, inside, start_offsets, end_offsets)
+        counts = np.empty(inside.shape, dtype=np.int64)
+        counts[inside] = (self._cumulative[end_offsets[inside]]
+                          - self._cumulative[start_offsets[inside]])
+        outside_start, outside_end = start[~inside], end[~inside]
+        counts[~inside] = np.sign(outside_end - outside_start).astype(np.int64) * np.busday_count(
+            np.minimum(outside_start, outside_end), np.maximum(outside_start, outside_end),
+            weekmask=self.weekmask, holidays=self.holidays)
+        return counts
+
+    def year_fraction(self, start, end, convention=None):
+        """
+        Fraction d'année entre deux dates (négative si end < start)
+
+        Args:
+            start, end: Dates (scalaires ou tableaux, diffusion numpy) ;
+                        l'heure éventuelle est tronquée
+            convention: Convention de décompte (défaut: celle du calendrier)
+
+        Returns:
+            float ou numpy.ndarray: Fractions d'année
+        """
+        convention = convention or self.convention
+        if convention not in DAY_COUNT_CONVENTIONS:
+            raise ValueError(f"Convention inconnue : {convention} "
+                             f"(disponibles : {', '.join(DAY_COUNT_CONVENTIONS)})")
+
+        if convention == 'BUS/252':
+            days = self.business_days(start, end)
+        else:
+            days = (_to_days(end) - _to_days(start)).astype(np.int64)
+
+        fraction = days / DAY_COUNT_CONVENTIONS[convention]
+        return fraction if np.ndim(fraction) else float(fraction)
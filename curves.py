@@ -0,0 +1,176 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from business_calendar import _to_days
+
+
+def _frozen(values, dtype):
+    array = np.array(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+def _unwrap(values):
+    return values if np.ndim(values) else float(values)
+
+
+class _ImmutableCurve(ABC):
+    """
+    Base des courbes : attributs figés, égalité et empreinte sur les données
+
+    Deux courbes construites avec les mêmes points sont égales et ont la
+    même empreinte (hash) : elles peuvent servir de clé de cache.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def _key(self):
+        """
+        Données de la courbe (tuple d'octets) servant à l'égalité et à l'empreinte
+        """
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash((type(self).__name__, self._key()))
+
+
+class ForwardCurve(_ImmutableCurve):
+    """
+    Courbe de prix forward par mois de livraison
+
+    Le prix d'un mois s'applique jusqu'au mois suivant de la courbe (prix
+    constant par morceaux, prolongé à plat avant le premier et après le
+    dernier mois). L'intégrale cumulée des prix aux bornes des mois est
+    précalculée : le forward moyen d'une période de livraison quelconque est
+    obtenu par deux recherches dichotomiques vectorisées.
+    """
+
+    __slots__ = ('months', 'prices', '_edges', '_cumulative')
+
+    def __init__(self, months, prices):
+        """
+        Args:
+            months: Mois de livraison croissants ('2027-01', date, datetime64...)
+            prices: Prix forward de chaque mois
+        """
+        months = _frozen(np.asarray(months).astype('datetime64[M]'), 'datetime64[M]')
+        prices = _frozen(prices, float)
+        if months.ndim != 1 or months.shape != prices.shape or months.size == 0:
+            raise ValueError("Les mois et les prix doivent être deux listes non vides de même taille")
+        if np.any(np.diff(months).astype(np.int64) <= 0):
+            raise ValueError("Les mois de livraison doivent être strictement croissants")
+
+        edges = months.astype('datetime64[D]')
+        cumulative = np.zeros(prices.size)
+        cumulative[1:] = np.cumsum(prices[:-1] * np.diff(edges).astype(np.int64))
+
+        object.__setattr__(self, 'months', months)
+        object.__setattr__(self, 'prices', prices)
+        object.__setattr__(self, '_edges', edges)
+        object.__setattr__(self, '_cumulative', _frozen(cumulative, float))
+
+    def _key(self):
+        return (self.months.tobytes(), self.prices.tobytes())
+
+    def __repr__(self):
+        return f"ForwardCurve({self.months[0]} → {self.months[-1]}, {self.prices.size} mois)"
+
+    def _segments(self, days):
+        return np.clip(np.searchsorted(self._edges, days, side='right') - 1, 0, self.prices.size - 1)
+
+    def _integral(self, days):
+        # Intégrale du prix entre le premier mois et `days` (en prix × jours)
+        segments = self._segments(days)
+        elapsed = (days - self._edges[segments]).astype(np.int64)
+        return self._cumulative[segments] + self.prices[segments] * elapsed
+
+    def forward_at(self, dates):
+        """
+        Prix forward du mois de livraison de chaque date (fixing)
+        """
+        return _unwrap(self.prices[self._segments(_to_days(dates))])
+
+    def forward(self, start_date, end_date):
+        """
+        Prix forward moyen d'une période de livraison [start_date, end_date] (bornes incluses)
+
+        Moyenne des prix mensuels pondérée par le nombre de jours livrés
+        dans chaque mois ; NaN si la période est vide.
+        """
+        start, end = _to_days(start_date), _to_days(end_date) + 1
+        days = (end - start).astype(np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            average = (self._integral(end) - self._integral(start)) / days
+        return _unwrap(np.where(days > 0, average, np.nan))
+
+
+class VolTermStructure(_ImmutableCurve):
+    """
+    Structure par terme de la volatilité implicite
+
+    Interpolation linéaire de la variance totale σ²T entre les échéances
+    (pentes précalculées), volatilité prolongée à plat avant la première et
+    après la dernière échéance.
+    """
+
+    __slots__ = ('tenors', 'volatilities', '_variances', '_slopes')
+
+    def __init__(self, tenors, volatilities):
+        """
+        Args:
+            tenors: Échéances croissantes (en années, strictement positives)
+            volatilities: Volatilité implicite annuelle de chaque échéance
+        """
+        tenors = _frozen(tenors, float)
+        volatilities = _frozen(volatilities, float)
+        if tenors.ndim != 1 or tenors.shape != volatilities.shape or tenors.size == 0:
+            raise ValueError("Les échéances et les volatilités doivent être deux listes "
+                             "non vides de même taille")
+        if tenors[0] <= 0 or np.any(np.diff(tenors) <= 0):
+            raise ValueError("Les échéances doivent être strictement positives et croissantes")
+
+        variances = volatilities**2 * tenors
+        if np.any(np.diff(variances) < 0):
+            raise ValueError("La variance totale doit être croissante avec l'échéance "
+                             "(arbitrage calendaire)")
+        slopes = np.diff(variances) / np.diff(tenors)
+
+        object.__setattr__(self, 'tenors', tenors)
+        object.__setattr__(self, 'volatilities', volatilities)
+        object.__setattr__(self, '_variances', _frozen(variances, float))
+        object.__setattr__(self, '_slopes', _frozen(slopes, float))
+
+    def _key(self):
+        return (self.tenors.tobytes(), self.volatilities.tobytes())
+
+    def __repr__(self):
+        return f"VolTermStructure({self.tenors.size} échéances, {self.tenors[0]:g} → {self.tenors[-1]:g} ans)"
+
+    def volatility(self, tenor):
+        """
+        Volatilité implicite pour une ou plusieurs échéances (en années)
+        """
+        tenor = np.asarray(tenor, dtype=float)
+        segments = np.clip(np.searchsorted(self.tenors, tenor, side='right') - 1,
+                           0, max(self.tenors.size - 2, 0))
+
+        if self.tenors.size == 1:
+            return _unwrap(np.broadcast_to(self.volatilities[0], tenor.shape).copy())
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = self._variances[segments] + self._slopes[segments] * (tenor - self.tenors[segments])
+            interpolated = np.sqrt(variance / tenor)
+        volatility = np.where(tenor <= self.tenors[0], self.volatilities[0],
+                              np.where(tenor >= self.tenors[-1], self.volatilities[-1],
+                                       interpolated))
+        return _unwrap(volatility)
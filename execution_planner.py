@@ -0,0 +1,433 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import numpy as np
+
+from curves import ForwardCurve, VolTermStructure
+
+
+# Budget mémoire par défaut (Mo), remplacé par DELTAP_MEMORY_BUDGET_MB
+# (1 Go : marge confortable dans un conteneur de 4 Go)
+DEFAULT_MEMORY_BUDGET_MB = 1024
+
+# Empreintes mesurées avec tracemalloc (octets), arrondies par excès
+HEDGE_BYTES_PER_CONTRACT = 160          # intermédiaires et résultat d'un bloc de contrats
+HEDGE_RESULT_BYTES_PER_CONTRACT = 176   # paramètres aplatis et colonnes du résultat assemblé
+SCENARIO_BYTES_PER_ELEMENT = 16         # bloc contrats × scénarios (calculé en place)
+SCENARIO_BYTES_PER_CONTRACT = 160       # paramètres, sommes et statistiques par contrat
+SCENARIO_BYTES_PER_DRAW = 40            # chocs, P&L du portefeuille et tri des centiles
+
+# Taille maximale d'un bloc (éléments) : au-delà, aucun gain et moins de parallélisme
+MAX_CHUNK_ELEMENTS = 2**22
+# Travail minimal par thread de calcul (éléments)
+MIN_ELEMENTS_PER_WORKER = 2**16
+
+PLAN_KINDS = ('hedge_batch', 'book_scenarios')
+
+
+def _unit_footprint(kind, num_contracts, num_scenarios):
+    """
+    (octets fixes, octets par élément d'un bloc, nombre d'éléments) d'un calcul
+    """
+    if kind == 'hedge_batch':
+        return num_contracts * HEDGE_RESULT_BYTES_PER_CONTRACT, HEDGE_BYTES_PER_CONTRACT, num_contracts
+    if kind == 'book_scenarios':
+        fixed = num_contracts * SCENARIO_BYTES_PER_CONTRACT + num_scenarios * SCENARIO_BYTES_PER_DRAW
+        return fixed, SCENARIO_BYTES_PER_ELEMENT, num_contracts * num_scenarios
+    raise ValueError(f"Type de calcul inconnu : {kind} (disponibles : {', '.join(PLAN_KINDS)})")
+
+
+def estimate_footprint(kind, num_contracts, num_scenarios=1):
+    """
+    Mémoire estimée (octets) d'un calcul fait en un seul bloc
+
+    Args:
+        kind: 'hedge_batch' (calculate_price_hedge_batch) ou 'book_scenarios'
+              (run_book_scenarios : contrats × scénarios)
+        num_contracts: Nombre de contrats
+        num_scenarios: Nombre de tirages par contrat (scénarios extrêmes compris)
+    """
+    fixed, per_element, num_elements = _unit_footprint(kind, num_contracts, num_scenarios)
+    return fixed + per_element * num_elements
+
+
+def default_memory_budget():
+    """
+    Budget mémoire par défaut (octets) : DELTAP_MEMORY_BUDGET_MB, lu à chaque appel
+    """
+    return int(os.environ.get('DELTAP_MEMORY_BUDGET_MB', DEFAULT_MEMORY_BUDGET_MB)) * 2**20
+
+
+def plan_execution(kind, num_contracts, num_scenarios=1, memory_budget=None, max_workers=None):
+    """
+    Découpage en blocs et nombre de threads de calcul respectant un budget mémoire
+
+    Les blocs en cours (un par thread) et les résultats réduits doivent tenir
+    dans le budget. Un bloc garde si possible des lignes de scénarios
+    complètes ; il est plafonné à MAX_CHUNK_ELEMENTS éléments.
+
+    Args:
+        kind: Type de calcul (voir estimate_footprint)
+        num_contracts: Nombre de contrats
+        num_scenarios: Nombre de tirages par contrat
+        memory_budget: Budget mémoire (octets), default_memory_budget() par défaut
+        max_workers: Nombre maximal de threads (défaut: nombre de CPU)
+
+    Returns:
+        dict: 'kind', 'num_contracts', 'num_scenarios', 'memory_budget',
+              'estimated_bytes' (calcul en un bloc), 'fixed_bytes',
+              'chunk_contracts', 'chunk_scenarios', 'num_chunks',
+              'num_workers' et 'planned_peak_bytes'
+
+    Raises:
+        ValueError: Budget insuffisant même pour des blocs d'un élément
+    """
+    if memory_budget is None:
+        memory_budget = default_memory_budget()
+    fixed, per_element, num_elements = _unit_footprint(kind, num_contracts, num_scenarios)
+    num_elements = max(num_elements, 1)
+
+    num_workers = max_workers or os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, num_elements // MIN_ELEMENTS_PER_WORKER))
+    chunk_elements = (memory_budget - fixed) // (num_workers * per_element)
+    if chunk_elements < 1:
+        raise ValueError(f"Budget mémoire insuffisant : {memory_budget / 2**20:.1f} Mo pour "
+                         f"au moins {(fixed + per_element) / 2**20:.1f} Mo")
+    chunk_elements = min(chunk_elements, MAX_CHUNK_ELEMENTS, -(-num_elements // num_workers))
+
+    chunk_scenarios = max(1, min(num_scenarios, chunk_elements))
+    chunk_contracts = max(1, min(num_contracts, chunk_elements // chunk_scenarios))
+    num_chunks = -(-num_contracts // chunk_contracts) * -(-num_scenarios // chunk_scenarios)
+    num_workers = min(num_workers, num_chunks)
+
+    return {
+        'kind': kind,
+        'num_contracts': num_contracts,
+        'num_scenarios': num_scenarios,
+        'memory_budget': memory_budget,
+        'estimated_bytes': fixed + per_element * num_elements,
+        'fixed_bytes': fixed,
+        'chunk_contracts': chunk_contracts,
+        'chunk_scenarios': chunk_scenarios,
+        'num_chunks': num_chunks,
+        'num_workers': num_workers,
+        'planned_peak_bytes': fixed + num_workers * per_element * chunk_contracts * chunk_scenarios
+    }
+
+
+def _chunks(plan):
+    for contract_start in range(0, plan['num_contracts'], plan['chunk_contracts']):
+        contracts = slice(contract_start, contract_start + plan['chunk_contracts'])
+        for scenario_start in range(0, plan['num_scenarios'], plan['chunk_scenarios']):
+            yield contracts, slice(scenario_start, scenario_start + plan['chunk_scenarios'])
+
+
+def execute_plan(plan, compute, reduce):
+    """
+    Exécution d'un plan : blocs calculés en parallèle puis réduits dans l'ordre
+
+    Au plus num_workers blocs sont en cours à la fois ; le résultat d'un bloc
+    est réduit (et libéré) avant le lancement du bloc suivant.
+
+    Args:
+        plan: Résultat de plan_execution
+        compute: Fonction (contracts, scenarios) -> résultat du bloc, appelée
+                 avec deux slices
+        reduce: Fonction (contracts, scenarios, résultat du bloc) -> None,
+                appelée dans le thread courant
+    """
+    with ThreadPoolExecutor(max_workers=plan['num_workers'],
+                            thread_name_prefix="planner") as executor:
+        running = deque()
+        for contracts, scenarios in _chunks(plan):
+            if len(running) == plan['num_workers']:
+                contracts_done, scenarios_done, future = running.popleft()
+                reduce(contracts_done, scenarios_done, future.result())
+            running.append((contracts, scenarios, executor.submit(compute, contracts, scenarios)))
+        while running:
+            contracts_done, scenarios_done, future = running.popleft()
+            reduce(contracts_done, scenarios_done, future.result())
+
+
+@contextmanager
+def measure_peak_memory():
+    """
+    Pic mémoire (octets) des allocations faites dans le bloc with, via tracemalloc
+
+    Toutes les allocations Python et numpy du processus sont comptées,
+    compilation numba d'un premier appel comprise. Si tracemalloc est déjà
+    actif (mesure englobante), son pic n'est pas remis à zéro : le pic
+    retourné est alors un majorant, qui peut inclure des allocations
+    antérieures au bloc.
+
+    Yields:
+        dict: 'peak_bytes' renseigné à la sortie du bloc
+    """
+    measurement = {'peak_bytes': None}
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        yield measurement
+        measurement['peak_bytes'] = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+def _execution_report(plan, measurement, started_at):
+    peak_bytes = measurement['peak_bytes'] if measurement else None
+    return {
+        'plan': plan,
+        'peak_bytes': peak_bytes,
+        'within_budget': peak_bytes is None or peak_bytes <= plan['memory_budget'],
+        'elapsed': time.perf_counter() - started_at
+    }
+
+
+def _contract_array(values, dtype):
+    """
+    Paramètre par contrat : courbe inchangée, sinon tableau numpy
+    """
+    if isinstance(values, (ForwardCurve, VolTermStructure)):
+        return values
+    return np.asarray(values, dtype=dtype)
+
+
+def _flatten(values, shape):
+    # Les scalaires restent des scalaires : seuls les vrais tableaux sont aplatis
+    if isinstance(values, (ForwardCurve, VolTermStructure)):
+        return values
+    if values.size == 1:
+        return values.reshape(())
+    return np.broadcast_to(values, shape).reshape(-1)
+
+
+def _chunk_of(values, contracts):
+    if isinstance(values, np.ndarray) and values.ndim == 1:
+        return values[contracts]
+    return values
+
+
+def run_hedge_batch(calculator, current_price, start_date, end_date, volatility,
+                    coverage_percentile, risk_free_rate=0.0, memory_budget=None,
+                    max_workers=None, measure_peak=True):
+    """
+    calculate_price_hedge_batch par blocs de contrats dans un budget mémoire
+
+    Les paramètres sont diffusés à leur forme commune ; chaque bloc est
+    calculé par un thread et recopié dans les colonnes du résultat. Les
+    courbes forward et de volatilité sont transmises telles quelles.
+
+    Args:
+        calculator: BlackScholesCalculator
+        memory_budget: Budget mémoire (octets), default_memory_budget() par défaut
+        max_workers: Nombre maximal de threads (défaut: nombre de CPU)
+        measure_peak: Mesure du pic mémoire réel avec tracemalloc
+
+    Returns:
+        dict: Résultats de calculate_price_hedge_batch (forme commune des
+              paramètres), plus 'execution' : 'plan' (voir plan_execution),
+              'peak_bytes', 'within_budget' et 'elapsed'
+    """
+    started_at = time.perf_counter()
+    parameters = {
+        'current_price': _contract_array(current_price, float),
+        'start_date': np.asarray(start_date, dtype='datetime64[us]'),
+        'end_date': np.asarray(end_date, dtype='datetime64[us]'),
+        'volatility': _contract_array(volatility, float),
+        'coverage_percentile': np.asarray(coverage_percentile, dtype=float),
+        'risk_free_rate': np.asarray(risk_free_rate, dtype=float)
+    }
+    shape = np.broadcast_shapes(*(values.shape for values in parameters.values()
+                                  if isinstance(values, np.ndarray)))
+    num_contracts = int(np.prod(shape))
+    plan = plan_execution('hedge_batch', num_contracts, memory_budget=memory_budget,
+                          max_workers=max_workers)
+
+    with measure_peak_memory() if measure_peak else nullcontext() as measurement:
+        flat = {name: _flatten(values, shape) for name, values in parameters.items()}
+        results = {}
+
+        def compute(contracts, scenarios):
+            return calculator.calculate_price_hedge_batch(
+                **{name: _chunk_of(values, contracts) for name, values in flat.items()})
+
+        def reduce(contracts, scenarios, chunk):
+            for key, values in chunk.items():
+                if key not in results:
+                    results[key] = np.empty(num_contracts, dtype=np.asarray(values).dtype)
+                results[key][contracts] = values  # colonnes scalaires diffusées
+
+        execute_plan(plan, compute, reduce)
+        results = {key: values.reshape(shape) for key, values in results.items()}
+
+    results['execution'] = _execution_report(plan, measurement, started_at)
+    return results
+
+
+def run_book_scenarios(calculator, current_price, start_date, end_date, volatility,
+                       risk_free_rate=0.0, volumes=1.0, num_scenarios=10000,
+                       percentiles=(50, 95, 99), memory_budget=None, max_workers=None,
+                       seed=42, measure_peak=True):
+    """
+    Scénarios de prix d'un portefeuille de contrats dans un budget mémoire
+
+    Tous les contrats partagent les mêmes chocs (modèle de
+    simulate_price_scenarios : un seul contrat donne les mêmes scénarios).
+    La matrice contrats × scénarios n'est jamais construite : chaque bloc
+    est réduit en sommes par contrat et en P&L du portefeuille par scénario
+    (Σ volume × delta prix).
+
+    Args:
+        calculator: BlackScholesCalculator (décompte des jours et chocs)
+        current_price, start_date, end_date, volatility, risk_free_rate:
+            Paramètres par contrat (scalaires ou tableaux diffusés)
+        volumes: Volume par contrat (pondération du P&L du portefeuille)
+        num_scenarios: Nombre de scénarios (plus 10% de scénarios extrêmes)
+        percentiles: Centiles du P&L du portefeuille à reporter
+        memory_budget: Budget mémoire (octets), default_memory_budget() par défaut
+        max_workers: Nombre maximal de threads (défaut: nombre de CPU)
+        seed: Graine des chocs
+        measure_peak: Mesure du pic mémoire réel avec tracemalloc
+
+    Returns:
+        dict: 'mean_delta' et 'std_delta' par contrat (NaN si échu),
+              'portfolio_delta' par scénario, 'portfolio_mean',
+              'portfolio_std', 'portfolio_percentiles', 'valid',
+              'num_contracts', 'num_draws' et 'execution' (voir run_hedge_batch)
+    """
+    started_at = time.perf_counter()
+    parameters = [np.asarray(current_price, dtype=float),
+                  np.asarray(start_date, dtype='datetime64[us]'),
+                  np.asarray(end_date, dtype='datetime64[us]'),
+                  np.asarray(volatility, dtype=float),
+                  np.asarray(risk_free_rate, dtype=float),
+                  np.asarray(volumes, dtype=float)]
+    shape = np.broadcast_shapes(*(values.shape for values in parameters))
+    num_contracts = int(np.prod(shape))
+    num_draws = num_scenarios + num_scenarios // 10
+    plan = plan_execution('book_scenarios', num_contracts, num_draws,
+                          memory_budget=memory_budget, max_workers=max_workers)
+
+    with measure_peak_memory() if measure_peak else nullcontext() as measurement:
+        price, start, end, sigma, rate, volume = (
+            np.broadcast_to(values, shape).reshape(-1) for values in parameters)
+        today = np.datetime64(datetime.now(), 'us')
+        valid = calculator.year_fraction(today, end) > 0
+        # Contrat échu : horizon et prix nuls, donc deltas nuls et sans effet sur le portefeuille
+        holding_period = np.where(valid, calculator.year_fraction(start, end) / 2, 0.0)
+        drift = (rate - 0.5 * sigma**2) * holding_period
+        vol_sqrt_t = sigma * np.sqrt(holding_period)
+        price = np.where(valid, price, 0.0)
+
+        shocks = calculator.generate_scenario_shocks(num_scenarios, np.random.RandomState(seed))
+        delta_sum = np.zeros(num_contracts)
+        delta_squares = np.zeros(num_contracts)
+        portfolio_delta = np.zeros(num_draws)
+
+        def compute(contracts, scenarios):
+            # Deltas prix du bloc, calculés en place : S × (exp(drift + z × σ√h) - 1)
+            block = np.multiply.outer(vol_sqrt_t[contracts], shocks[scenarios])
+            block += drift[contracts, None]
+            np.expm1(block, out=block)
+            block *= price[contracts, None]
+            return (block.sum(axis=1), np.einsum('ij,ij->i', block, block),
+                    volume[contracts] @ block)
+
+        def reduce(contracts, scenarios, chunk):
+            delta_sum[contracts] += chunk[0]
+            delta_squares[contracts] += chunk[1]
+            portfolio_delta[scenarios] += chunk[2]
+
+        execute_plan(plan, compute, reduce)
+
+        mean_delta = delta_sum / num_draws
+        std_delta = np.sqrt(np.maximum(delta_squares / num_draws - mean_delta**2, 0.0))
+        results = {
+            'mean_delta': np.where(valid, mean_delta, np.nan).reshape(shape),
+            'std_delta': np.where(valid, std_delta, np.nan).reshape(shape),
+            'portfolio_delta': portfolio_delta,
+            'portfolio_mean': float(np.mean(portfolio_delta)),
+            'portfolio_std': float(np.std(portfolio_delta)),
+            'portfolio_percentiles': dict(zip(percentiles,
+                                              np.percentile(portfolio_delta, percentiles).tolist())),
+            'valid': valid.reshape(shape),
+            'num_contracts': num_contracts,
+            'num_draws': num_draws
+        }
+
+    results['execution'] = _execution_report(plan, measurement, started_at)
+    return results
+
+
+def _print_plan(plan):
+    print(f"   - Empreinte en un bloc : {plan['estimated_bytes'] / 2**20:.1f} Mo "
+          f"(budget {plan['memory_budget'] / 2**20:.0f} Mo)")
+    chunk = f"{plan['chunk_contracts']} contrat(s)"
+    if plan['kind'] == 'book_scenarios':
+        chunk += f" × {plan['chunk_scenarios']} scénario(s)"
+    print(f"   - Blocs : {plan['num_chunks']} de {chunk}, {plan['num_workers']} thread(s)")
+    print(f"   - Pic prévu : {plan['planned_peak_bytes'] / 2**20:.1f} Mo")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan d'exécution d'un calcul de portefeuille "
+                                                 "dans un budget mémoire")
+    parser.add_argument('--contracts', type=int, default=10000, help="Nombre de contrats")
+    parser.add_argument('--scenarios', type=int, default=50000,
+                        help="Scénarios par contrat (0 : couvertures seules)")
+    parser.add_argument('--budget-mb', type=int, default=default_memory_budget() // 2**20,
+                        help="Budget mémoire (Mo)")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre maximal de threads")
+    parser.add_argument('--run', action='store_true',
+                        help="Exécution sur un portefeuille synthétique et mesure du pic réel")
+    args = parser.parse_args(argv)
+
+    from black_scholes_calculator import BlackScholesCalculator
+
+    budget = args.budget_mb * 2**20
+    rng = np.random.default_rng(0)
+    start_date = np.datetime64('today', 'D') + rng.integers(30, 365, args.contracts)
+    parameters = dict(current_price=rng.uniform(50, 150, args.contracts), start_date=start_date,
+                      end_date=start_date + 90, volatility=rng.uniform(0.1, 0.5, args.contracts))
+
+    try:
+        if args.scenarios:
+            num_draws = args.scenarios + args.scenarios // 10
+            print(f"🧮 Scénarios : {args.contracts} contrat(s) × {num_draws} tirage(s)")
+            plan = plan_execution('book_scenarios', args.contracts, num_draws, budget,
+                                  args.workers)
+            run = lambda: run_book_scenarios(BlackScholesCalculator(), **parameters,
+                                             num_scenarios=args.scenarios, memory_budget=budget,
+                                             max_workers=args.workers)
+        else:
+            print(f"🧮 Couvertures : {args.contracts} contrat(s)")
+            plan = plan_execution('hedge_batch', args.contracts, memory_budget=budget,
+                                  max_workers=args.workers)
+            run = lambda: run_hedge_batch(BlackScholesCalculator(), **parameters,
+                                          coverage_percentile=90.0, memory_budget=budget,
+                                          max_workers=args.workers)
+    except ValueError as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    print("=" * 60)
+    _print_plan(plan)
+
+    if args.run:
+        execution = run()['execution']
+        print(f"   - Pic mesuré : {execution['peak_bytes'] / 2**20:.1f} Mo en "
+              f"{execution['elapsed']:.2f} s" + ("" if execution['within_budget'] else " ❌ hors budget"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
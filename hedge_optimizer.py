@@ -0,0 +1,231 @@
+import numpy as np
+from scipy import special
+
+
+# Grandeurs de calculate_price_hedge pouvant servir d'objectif (toutes monotones
+# en fonction du centile de couverture)
+TARGET_METRICS = ('call_price', 'put_price', 'price_delta', 'strike_price')
+
+
+def _bracketed_root(func, lower, upper, target, tolerance, xtol, max_iter):
+    """
+    Recherche de racine vectorisée par fausse position (méthode Illinois)
+
+    Chaque élément converge indépendamment : seuls les éléments encore actifs
+    sont réévalués à chaque itération.
+
+    Args:
+        func: func(x, index) -> valeurs de la fonction aux points x des éléments index
+        lower, upper: Bornes de l'intervalle (tableaux 1D)
+        target: Valeur recherchée pour chaque élément (tableau 1D)
+        tolerance: Écart absolu toléré sur la valeur de la fonction
+        xtol: Largeur minimale de l'intervalle
+        max_iter: Nombre maximal d'itérations
+
+    Returns:
+        tuple: (racines, convergé, atteignable, itérations), NaN si hors intervalle
+    """
+    size = target.size
+    everything = np.arange(size)
+    a, b = lower.astype(float), upper.astype(float)
+    fa = func(a, everything) - target
+    fb = func(b, everything) - target
+
+    root = np.full(size, np.nan)
+    converged = np.zeros(size, dtype=bool)
+    iterations = np.zeros(size, dtype=int)
+    feasible = np.isfinite(fa) & np.isfinite(fb) & (np.sign(fa) * np.sign(fb) <= 0)
+
+    # Bornes déjà solutions
+    for x, fx in ((a, fa), (b, fb)):
+        hit = feasible & ~converged & (np.abs(fx) <= tolerance)
+        root[hit] = x[hit]
+        converged |= hit
+
+    active = np.flatnonzero(feasible & ~converged)
+    a, b, fa, fb = a[active], b[active], fa[active], fb[active]
+
+    for iteration in range(1, max_iter + 1):
+        if active.size == 0:
+            break
+
+        # Fausse position, bissection si la sécante sort de l'intervalle
+        with np.errstate(divide='ignore', invalid='ignore'):
+            c = b - fb * (b - a) / (fb - fa)
+        outside = ~np.isfinite(c) | (c <= np.minimum(a, b)) | (c >= np.maximum(a, b))
+        c = np.where(outside, 0.5 * (a + b), c)
+        fc = func(c, active) - target[active]
+
+        # Illinois : la borne conservée deux fois de suite voit son poids divisé par 2
+        flip = np.sign(fc) * np.sign(fb) < 0
+        a, fa = np.where(flip, b, a), np.where(flip, fb, 0.5 * fa)
+        b, fb = c, fc
+
+        done = (np.abs(fc) <= tolerance) | (np.abs(b - a) <= xtol)
+        root[active[done]] = c[done]
+        converged[active[done]] = True
+        iterations[active] = iteration
+
+        keep = ~done
+        active, a, b, fa, fb = active[keep], a[keep], b[keep], fa[keep], fb[keep]
+
+    # Éléments non convergés : meilleure estimation disponible
+    root[active] = b
+    return root, converged, feasible, iterations
+
+
+def _contract_arrays(calculator, current_price, start_date, end_date, volatility,
+                     risk_free_rate, *extra):
+    """
+    Diffusion des paramètres des contrats en tableaux 1D de même taille
+
+    Returns:
+        tuple: (forme commune, liste des tableaux aplatis dans l'ordre des arguments)
+    """
+    values = [np.asarray(current_price, dtype=float),
+              calculator._to_datetime64(start_date),
+              calculator._to_datetime64(end_date),
+              np.asarray(volatility, dtype=float),
+              np.asarray(risk_free_rate, dtype=float)]
+    values += [np.asarray(value, dtype=float) for value in extra]
+    shape = np.broadcast_shapes(*(np.shape(value) for value in values))
+    return shape, [np.broadcast_to(value, shape).reshape(-1) for value in values]
+
+
+def _percentile_bounds(bounds):
+    lower, upper = bounds
+    if not 0 < lower < upper < 100:
+        raise ValueError("Les bornes du centile doivent vérifier 0 < min < max < 100")
+    # Recherche dans l'espace des scores z, où les grandeurs varient régulièrement
+    return special.ndtri(lower / 100.0), special.ndtri(upper / 100.0)
+
+
+def solve_coverage_percentile(calculator, current_price, start_date, end_date, volatility,
+                              target, metric='call_price', risk_free_rate=0.0,
+                              percentile_bounds=(0.01, 99.99), tolerance=1e-8,
+                              max_iter=100):
+    """
+    Centile de couverture atteignant un objectif pour chaque contrat
+
+    Problème inverse de calculate_price_hedge : pour chaque contrat, recherche
+    du centile (et donc du prix de livraison) dont la prime du call, la prime
+    du put, le delta prix ou le prix de livraison vaut `target`. Tous les
+    contrats sont résolus ensemble par calculate_price_hedge_batch ; chacun
+    converge indépendamment.
+
+    Args:
+        calculator: Instance de BlackScholesCalculator
+        current_price, start_date, end_date, volatility, risk_free_rate:
+            Paramètres des contrats (scalaires ou tableaux, diffusion numpy)
+        target: Valeur visée de la grandeur `metric` (scalaire ou tableau)
+        metric: 'call_price' (budget de prime), 'put_price', 'price_delta'
+                ou 'strike_price'
+        percentile_bounds: Intervalle de recherche du centile (en %)
+        tolerance: Écart absolu toléré sur la grandeur visée
+        max_iter: Nombre maximal d'itérations
+
+    Returns:
+        dict: Résultats de calculate_price_hedge_batch au centile trouvé, plus
+              'target', 'metric', 'converged', 'feasible' (objectif atteignable
+              dans l'intervalle) et 'iterations'. Centile NaN si l'objectif
+              n'est pas atteignable ou si le contrat est échu.
+    """
+    if metric not in TARGET_METRICS:
+        raise ValueError(f"Grandeur inconnue : {metric} (disponibles : {', '.join(TARGET_METRICS)})")
+
+    shape, contracts = _contract_arrays(calculator, current_price, start_date, end_date,
+                                        volatility, risk_free_rate, target)
+    current_price, start_datetime, end_datetime, volatility, risk_free_rate, target = contracts
+
+    def evaluate(z, index):
+        results = calculator.calculate_price_hedge_batch(
+            current_price[index], start_datetime[index], end_datetime[index],
+            volatility[index], special.ndtr(z) * 100.0, risk_free_rate[index]
+        )
+        return np.where(results['valid'], results[metric], np.nan)
+
+    z_lower, z_upper = _percentile_bounds(percentile_bounds)
+    z, converged, feasible, iterations = _bracketed_root(
+        evaluate, np.full(target.size, z_lower), np.full(target.size, z_upper), target,
+        tolerance, 1e-12, max_iter
+    )
+
+    results = calculator.calculate_price_hedge_batch(
+        current_price, start_datetime, end_datetime, volatility,
+        special.ndtr(z) * 100.0, risk_free_rate
+    )
+    results = {key: value.reshape(shape) for key, value in results.items()}
+    results.update({
+        'target': target.reshape(shape),
+        'metric': metric,
+        'converged': converged.reshape(shape),
+        'feasible': feasible.reshape(shape),
+        'iterations': iterations.reshape(shape)
+    })
+    return results
+
+
+def solve_book_coverage_percentile(calculator, current_price, start_date, end_date, volatility,
+                                   budget, metric='call_price', quantities=1.0,
+                                   risk_free_rate=0.0, percentile_bounds=(0.01, 99.99),
+                                   tolerance=1e-6, max_iter=100):
+    """
+    Centile de couverture commun à tout un portefeuille de contrats
+
+    Recherche du centile unique pour lequel la somme pondérée de la grandeur
+    `metric` sur les contrats non échus (par défaut la prime totale des calls)
+    vaut `budget`. Chaque évaluation valorise tout le portefeuille en un
+    appel à calculate_price_hedge_batch.
+
+    Args:
+        calculator: Instance de BlackScholesCalculator
+        current_price, start_date, end_date, volatility, risk_free_rate:
+            Paramètres des contrats (scalaires ou tableaux, diffusion numpy)
+        budget: Valeur visée de la somme pondérée (ex: budget de prime total)
+        metric: Grandeur agrégée (voir TARGET_METRICS)
+        quantities: Quantités par contrat (poids de la somme)
+        percentile_bounds: Intervalle de recherche du centile (en %)
+        tolerance: Écart absolu toléré sur la somme
+        max_iter: Nombre maximal d'itérations
+
+    Returns:
+        dict: 'coverage_percentile', 'total' (somme atteinte), 'budget',
+              'converged', 'feasible', 'iterations' et 'contracts' (résultats
+              de calculate_price_hedge_batch au centile trouvé)
+    """
+    if metric not in TARGET_METRICS:
+        raise ValueError(f"Grandeur inconnue : {metric} (disponibles : {', '.join(TARGET_METRICS)})")
+
+    shape, contracts = _contract_arrays(calculator, current_price, start_date, end_date,
+                                        volatility, risk_free_rate, quantities)
+    current_price, start_datetime, end_datetime, volatility, risk_free_rate, quantities = contracts
+
+    def book_total(percentile):
+        results = calculator.calculate_price_hedge_batch(
+            current_price, start_datetime, end_datetime, volatility, percentile, risk_free_rate
+        )
+        values = np.where(results['valid'], quantities * results[metric], 0.0)
+        return float(np.sum(values)), results
+
+    def evaluate(z, index):
+        return np.array([book_total(special.ndtr(z[0]) * 100.0)[0]])
+
+    z_lower, z_upper = _percentile_bounds(percentile_bounds)
+    z, converged, feasible, iterations = _bracketed_root(
+        evaluate, np.array([z_lower]), np.array([z_upper]), np.array([float(budget)]),
+        tolerance, 1e-12, max_iter
+    )
+
+    coverage_percentile = float(special.ndtr(z[0]) * 100.0)
+    total_size = quantities.size
+    total, results = book_total(coverage_percentile)
+    return {
+        'coverage_percentile': coverage_percentile,
+        'total': total if feasible[0] else np.nan,
+        'budget': float(budget),
+        'converged': bool(converged[0]),
+        'feasible': bool(feasible[0]),
+        'iterations': int(iterations[0]),
+        'contracts': {key: np.broadcast_to(value, (total_size,)).reshape(shape)
+                      for key, value in results.items()}
+    }
@@ -0,0 +1,460 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from curves import _ImmutableCurve
+
+
+# Paramètres d'entrée et résultats de calculate_price_hedge stockés en colonnes
+HEDGE_PARAMETERS = ['current_price', 'start_date', 'end_date', 'volatility',
+                    'coverage_percentile', 'risk_free_rate']
+HEDGE_RESULTS = ['time_to_delivery', 'holding_period', 'strike_price', 'price_delta',
+                 'call_price', 'put_price', 'call_delta', 'put_delta']
+SCENARIO_PERCENTILES = [1, 5, 25, 50, 75, 95, 99]
+# Paramètres du calculateur inclus dans l'empreinte (voir calculator_context)
+CONTEXT_PARAMETERS = ('calendar', 'backend')
+
+# Version du schéma (PRAGMA user_version). v1 : couvertures uniques par
+# (param_hash, as_of_date) ; v2 : par (contract_id, param_hash, as_of_date)
+SCHEMA_VERSION = 2
+
+HEDGE_INDEXES = ('idx_hedges_hash', 'idx_hedges_contract', 'idx_hedges_parameters',
+                 'idx_hedges_as_of')
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS hedges (
+    id INTEGER PRIMARY KEY,
+    param_hash TEXT NOT NULL,
+    contract_id TEXT NOT NULL,
+    as_of_date TEXT NOT NULL,
+    current_price REAL NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    volatility REAL NOT NULL,
+    coverage_percentile REAL NOT NULL,
+    risk_free_rate REAL NOT NULL,
+    {', '.join(f'{column} REAL' for column in HEDGE_RESULTS)},
+    created_at TEXT NOT NULL,
+    UNIQUE (contract_id, param_hash, as_of_date)
+);
+CREATE INDEX IF NOT EXISTS idx_hedges_hash ON hedges (param_hash, as_of_date);
+CREATE INDEX IF NOT EXISTS idx_hedges_contract ON hedges (contract_id, as_of_date);
+CREATE INDEX IF NOT EXISTS idx_hedges_parameters
+    ON hedges (start_date, end_date, coverage_percentile, as_of_date);
+CREATE INDEX IF NOT EXISTS idx_hedges_as_of ON hedges (as_of_date);
+
+CREATE TABLE IF NOT EXISTS scenario_summaries (
+    id INTEGER PRIMARY KEY,
+    param_hash TEXT NOT NULL,
+    as_of_date TEXT NOT NULL,
+    current_price REAL NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    volatility REAL NOT NULL,
+    risk_free_rate REAL NOT NULL,
+    num_scenarios INTEGER NOT NULL,
+    mean REAL,
+    std REAL,
+    min REAL,
+    max REAL,
+    {', '.join(f'p{p:02d} REAL' for p in SCENARIO_PERCENTILES)},
+    created_at TEXT NOT NULL,
+    UNIQUE (param_hash, as_of_date)
+);
+CREATE INDEX IF NOT EXISTS idx_scenarios_as_of ON scenario_summaries (as_of_date);
+
+CREATE TABLE IF NOT EXISTS contract_fingerprints (
+    contract_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    as_of_date TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def _iso_date(value):
+    """
+    Normalisation d'une date (date, datetime, datetime64 ou chaîne) en 'AAAA-MM-JJ'
+    """
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(np.datetime64(value, 'D'))
+
+
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _normalize(name, value):
+    if name in ('start_date', 'end_date'):
+        return _iso_date(value)
+    if name == 'num_scenarios':
+        return int(value)
+    if name in CONTEXT_PARAMETERS:
+        return value
+    if isinstance(value, _ImmutableCurve):
+        # Courbe : empreinte de ses points (deux courbes égales ont la même clé)
+        return f"{type(value).__name__}:{_digest(*value._key())}"
+    try:
+        # Arrondi pour que 0.1 + 0.2 et 0.3 donnent la même clé
+        return round(float(value), 10)
+    except (TypeError, ValueError):
+        raise TypeError(f"Paramètre {name} non normalisable pour l'empreinte du cache "
+                        f"({type(value).__name__}) : nombre, date ou courbe attendu") from None
+
+
+def calculator_context(calculator):
+    """
+    Paramètres du calculateur qui modifient ses résultats : calendrier et backend
+
+    Inclus dans l'empreinte des couvertures : un calcul enregistré avec un
+    autre calendrier (convention, jours fériés) ou un autre backend n'est
+    pas resservi.
+
+    Returns:
+        dict: 'calendar' et 'backend' (vide si calculator est None)
+    """
+    if calculator is None:
+        return {}
+    calendar = calculator.calendar
+    return {
+        'calendar': None if calendar is None else _digest(
+            calendar.convention, calendar.weekmask, calendar.holidays.tobytes()),
+        'backend': calculator.backend.name
+    }
+
+
+def parameters_hash(kind, **parameters):
+    """
+    Empreinte stable (SHA-256) de paramètres normalisés
+
+    Args:
+        kind: Type de calcul ('hedge', 'scenarios') inclus dans l'empreinte
+        **parameters: Paramètres du calcul
+    """
+    normalized = {name: _normalize(name, value) for name, value in parameters.items()}
+    payload = json.dumps([kind, normalized], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def default_contract_id(start_date, end_date):
+    """
+    Identifiant de contrat par défaut : période de livraison
+    """
+    return f"{_iso_date(start_date)}/{_iso_date(end_date)}"
+
+
+class HedgeStore:
+    """
+    Stockage SQLite indexé des couvertures et résumés de scénarios calculés
+
+    Chaque couverture est enregistrée avec l'empreinte de ses paramètres et
+    sa date de calcul (as_of_date) : un même calcul demandé le même jour est
+    servi depuis le disque, et l'historique d'un contrat est lu par index.
+    """
+
+    def __init__(self, path=':memory:'):
+        """
+        Args:
+            path: Chemin de la base SQLite (défaut: base en mémoire)
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._migrate()
+
+    def _migrate(self):
+        """
+        Création du schéma, ou mise à niveau d'une base d'une version antérieure
+
+        Raises:
+            ValueError: Base créée par une version plus récente du module
+        """
+        version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"Schéma de {self.path} en version {version}, plus récente que "
+                             f"la version supportée ({SCHEMA_VERSION})")
+        existing = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'hedges'").fetchone()
+
+        if version < 2 and existing:
+            # Contrainte d'unicité modifiée : la table est reconstruite, sinon
+            # INSERT OR REPLACE écraserait les contrats de mêmes paramètres
+            columns = ', '.join(row['name'] for row in
+                                self._connection.execute('PRAGMA table_info(hedges)'))
+            self._connection.executescript(f"""
+                BEGIN;
+                {''.join(f'DROP INDEX IF EXISTS {index};' for index in HEDGE_INDEXES)}
+                ALTER TABLE hedges RENAME TO hedges_v1;
+                {SCHEMA}
+                INSERT INTO hedges ({columns}) SELECT {columns} FROM hedges_v1;
+                DROP TABLE hedges_v1;
+                PRAGMA user_version = {SCHEMA_VERSION};
+                COMMIT;
+            """)
+        else:
+            self._connection.executescript(
+                f"BEGIN; {SCHEMA} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Couvertures
+
+    def _hedge_row(self, result, as_of_date, contract_id, param_hash):
+        parameters = {name: result[name] for name in HEDGE_PARAMETERS}
+        if contract_id is None:
+            contract_id = default_contract_id(result['start_date'], result['end_date'])
+        row = {
+            'param_hash': param_hash,
+            'contract_id': contract_id,
+            'as_of_date': _iso_date(as_of_date or date.today()),
+            'created_at': datetime.now().isoformat(timespec='seconds')
+        }
+        row.update({name: _normalize(name, value) for name, value in parameters.items()})
+        row.update({name: float(result[name]) for name in HEDGE_RESULTS})
+        return row
+
+    def _insert_hedges(self, rows):
+        if not rows:
+            return 0
+        columns = list(rows[0])
+        statement = (f"INSERT OR REPLACE INTO hedges ({', '.join(columns)}) "
+                     f"VALUES ({', '.join(':' + column for column in columns)})")
+        with self._lock, self._connection:
+            self._connection.executemany(statement, rows)
+        return len(rows)
+
+    def record_hedges(self, results, as_of_date=None, contract_ids=None, calculator=None):
+        """
+        Enregistrement groupé (executemany dans une seule transaction)
+
+        Les résultats en erreur sont ignorés ; un calcul déjà enregistré pour
+        le même contrat et la même date est remplacé.
+
+        Args:
+            results: Liste de dicts retournés par calculate_price_hedge
+            as_of_date: Date de calcul (défaut: aujourd'hui)
+            contract_ids: Identifiants de contrat (défaut: période de livraison)
+            calculator: Calculateur des résultats (calendrier et backend
+                        inclus dans l'empreinte, voir calculator_context)
+
+        Returns:
+            int: Nombre de lignes enregistrées
+        """
+        if contract_ids is None:
+            contract_ids = [None] * len(results)
+        context = calculator_context(calculator)
+        return self._insert_hedges([
+            self._hedge_row(result, as_of_date, contract_id, parameters_hash(
+                'hedge', **{name: result[name] for name in HEDGE_PARAMETERS}, **context))
+            for result, contract_id in zip(results, contract_ids)
+            if 'error' not in result
+        ])
+
+    def record_hedge(self, result, as_of_date=None, contract_id=None, calculator=None):
+        """
+        Enregistrement d'un résultat de calculate_price_hedge
+        """
+        return self.record_hedges([result], as_of_date, [contract_id], calculator)
+
+    def _hedge_from_row(self, row):
+        result = {name: row[name] for name in HEDGE_RESULTS}
+        result.update({name: row[name] for name in HEDGE_PARAMETERS})
+        result['start_date'] = datetime.fromisoformat(row['start_date'])
+        result['end_date'] = datetime.fromisoformat(row['end_date'])
+        result['contract_id'] = row['contract_id']
+        result['as_of_date'] = date.fromisoformat(row['as_of_date'])
+        return result
+
+    def _find_hedge(self, param_hash, as_of_date=None):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM hedges WHERE param_hash = ? AND as_of_date = ?",
+                (param_hash, _iso_date(as_of_date or date.today()))
+            ).fetchone()
+        return None if row is None else self._hedge_from_row(row)
+
+    def get_hedge(self, current_price, start_date, end_date, volatility,
+                  coverage_percentile, risk_free_rate=0.0, as_of_date=None, calculator=None):
+        """
+        Recherche d'une couverture déjà calculée (par empreinte des paramètres)
+
+        Args:
+            calculator: Calculateur attendu (calendrier et backend, voir calculator_context)
+
+        Returns:
+            dict: Résultat au format de calculate_price_hedge, ou None
+
+        Raises:
+            TypeError: Paramètre non normalisable (ni nombre, ni date, ni courbe)
+        """
+        param_hash = parameters_hash(
+            'hedge', current_price=current_price, start_date=start_date, end_date=end_date,
+            volatility=volatility, coverage_percentile=coverage_percentile,
+            risk_free_rate=risk_free_rate, **calculator_context(calculator)
+        )
+        return self._find_hedge(param_hash, as_of_date)
+
+    def get_or_compute_hedge(self, calculator, current_price, start_date, end_date,
+                             volatility, coverage_percentile, risk_free_rate=0.0,
+                             contract_id=None):
+        """
+        Couverture du jour servie depuis le disque, calculée et enregistrée sinon
+
+        L'empreinte porte sur les paramètres tels que passés (une courbe par
+        ses points, non par la valeur qui en est lue), le calendrier et le
+        backend du calculateur.
+
+        Raises:
+            TypeError: Paramètre non normalisable (ni nombre, ni date, ni courbe)
+        """
+        param_hash = parameters_hash(
+            'hedge', current_price=current_price, start_date=start_date, end_date=end_date,
+            volatility=volatility, coverage_percentile=coverage_percentile,
+            risk_free_rate=risk_free_rate, **calculator_context(calculator)
+        )
+        result = self._find_hedge(param_hash)
+        if result is not None:
+            return result
+
+        result = calculator.calculate_price_hedge(current_price, start_date, end_date,
+                                                  volatility, coverage_percentile,
+                                                  risk_free_rate)
+        if 'error' not in result:
+            self._insert_hedges([self._hedge_row(result, None, contract_id, param_hash)])
+        return result
+
+    def hedge_history(self, contract_id, days=90, as_of_date=None):
+        """
+        Historique des couvertures d'un contrat sur les `days` derniers jours
+
+        Returns:
+            list: Résultats triés par date de calcul croissante
+        """
+        end = date.fromisoformat(_iso_date(as_of_date or date.today()))
+        start = end - timedelta(days=days)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM hedges WHERE contract_id = ? AND as_of_date BETWEEN ? AND ? "
+                "ORDER BY as_of_date, id",
+                (contract_id, _iso_date(start), _iso_date(end))
+            ).fetchall()
+        return [self._hedge_from_row(row) for row in rows]
+
+    # Empreintes des contrats (recalcul incrémental)
+
+    def get_fingerprints(self):
+        """
+        Dernière empreinte enregistrée pour chaque contrat
+
+        Returns:
+            dict: contract_id -> (empreinte, date de calcul 'AAAA-MM-JJ')
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT contract_id, fingerprint, as_of_date FROM contract_fingerprints"
+            ).fetchall()
+        return {row['contract_id']: (row['fingerprint'], row['as_of_date']) for row in rows}
+
+    def record_fingerprints(self, fingerprints, as_of_date=None):
+        """
+        Enregistrement groupé des empreintes des contrats recalculés
+
+        Args:
+            fingerprints: dict contract_id -> empreinte
+            as_of_date: Date de calcul (défaut: aujourd'hui)
+        """
+        as_of_date = _iso_date(as_of_date or date.today())
+        updated_at = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO contract_fingerprints "
+                "(contract_id, fingerprint, as_of_date, updated_at) VALUES (?, ?, ?, ?)",
+                [(contract_id, fingerprint, as_of_date, updated_at)
+                 for contract_id, fingerprint in fingerprints.items()]
+            )
+
+    # Résumés de scénarios
+
+    def record_scenario_summary(self, current_price, start_date, end_date, volatility,
+                                risk_free_rate, num_scenarios, future_prices, as_of_date=None):
+        """
+        Enregistrement du résumé statistique d'un jeu de scénarios de prix
+        """
+        parameters = {
+            'current_price': current_price, 'start_date': start_date, 'end_date': end_date,
+            'volatility': volatility, 'risk_free_rate': risk_free_rate,
+            'num_scenarios': num_scenarios
+        }
+        future_prices = np.asarray(future_prices, dtype=float)
+        row = {
+            'param_hash': parameters_hash('scenarios', **parameters),
+            'as_of_date': _iso_date(as_of_date or date.today()),
+            'mean': float(np.mean(future_prices)),
+            'std': float(np.std(future_prices, ddof=1)),
+            'min': float(np.min(future_prices)),
+            'max': float(np.max(future_prices)),
+            'created_at': datetime.now().isoformat(timespec='seconds')
+        }
+        row.update({name: _normalize(name, value) for name, value in parameters.items()})
+        row.update({f'p{p:02d}': float(value) for p, value in
+                    zip(SCENARIO_PERCENTILES, np.percentile(future_prices, SCENARIO_PERCENTILES))})
+
+        columns = list(row)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO scenario_summaries ({', '.join(columns)}) "
+                f"VALUES ({', '.join(':' + column for column in columns)})",
+                row
+            )
+
+    def get_scenario_summary(self, current_price, start_date, end_date, volatility,
+                             risk_free_rate, num_scenarios, as_of_date=None):
+        """
+        Recherche du résumé d'un jeu de scénarios déjà simulé
+
+        Returns:
+            dict: Statistiques ('mean', 'std', 'min', 'max', 'percentiles'), ou None
+        """
+        param_hash = parameters_hash(
+            'scenarios', current_price=current_price, start_date=start_date,
+            end_date=end_date, volatility=volatility, risk_free_rate=risk_free_rate,
+            num_scenarios=num_scenarios
+        )
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM scenario_summaries WHERE param_hash = ? AND as_of_date = ?",
+                (param_hash, _iso_date(as_of_date or date.today()))
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'mean': row['mean'],
+            'std': row['std'],
+            'min': row['min'],
+            'max': row['max'],
+            'percentiles': {p: row[f'p{p:02d}'] for p in SCENARIO_PERCENTILES},
+            'num_scenarios': row['num_scenarios']
+        }
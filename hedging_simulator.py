@@ -0,0 +1,115 @@
+import numpy as np
+
+from pricing_backends import get_backend
+
+
+def simulate_delta_hedging(current_price, strike_price, maturity, volatility,
+                           risk_free_rate=0.0, option_type='call', num_paths=10000,
+                           num_steps=365, drift=None, transaction_cost=0.0,
+                           chunk_size=4096, seed=42, percentiles=(1, 5, 50, 95, 99),
+                           backend=None):
+    """
+    Backtest vectorisé d'une couverture en delta rééquilibrée à chaque pas de temps
+
+    Le vendeur de l'option encaisse la prime Black & Scholes, se couvre avec
+    le delta recalculé à chaque pas et paie des frais proportionnels au
+    montant échangé. L'erreur de couverture est la valeur finale du
+    portefeuille (couverture + cash) moins le payoff de l'option.
+
+    Les trajectoires sont générées par blocs de `chunk_size` trajectoires
+    (matrice trajectoires × pas) pour borner la mémoire. Les tirages sont
+    consommés dans le même ordre quel que soit `chunk_size`, les résultats
+    ne dépendent donc pas de la taille des blocs.
+
+    Args:
+        current_price: Prix actuel du sous-jacent
+        strike_price: Prix d'exercice de l'option couverte
+        maturity: Échéance de l'option (en années)
+        volatility: Volatilité annuelle (pricing et simulation)
+        risk_free_rate: Taux d'intérêt sans risque (défaut: 0%)
+        option_type: 'call' ou 'put'
+        num_paths: Nombre de trajectoires simulées
+        num_steps: Nombre de rééquilibrages jusqu'à l'échéance
+        drift: Tendance réelle du sous-jacent (défaut: taux sans risque)
+        transaction_cost: Frais proportionnels au nominal échangé (ex: 0.001)
+        chunk_size: Nombre de trajectoires simulées par bloc
+        seed: Graine du générateur aléatoire
+        percentiles: Centiles de l'erreur de couverture à reporter
+        backend: Backend des noyaux de pricing (voir pricing_backends.get_backend)
+
+    Returns:
+        dict: Distribution de l'erreur de couverture et statistiques
+    """
+    backend = get_backend(backend)
+    if option_type == 'call':
+        price_kernel, delta_kernel = backend.call_price, backend.call_delta
+    elif option_type == 'put':
+        price_kernel, delta_kernel = backend.put_price, backend.put_delta
+    else:
+        raise ValueError("option_type doit valoir 'call' ou 'put'")
+
+    if maturity <= 0:
+        raise ValueError("L'échéance doit être strictement positive")
+
+    if drift is None:
+        drift = risk_free_rate
+
+    rng = np.random.default_rng(seed)
+    dt = maturity / num_steps
+    times = np.arange(num_steps + 1) * dt
+    # Temps résiduel à chaque date de rééquilibrage (la dernière date est l'échéance)
+    time_to_maturity = maturity - times[:-1]
+    discount = np.exp(-risk_free_rate * times)
+
+    option_price = float(price_kernel(current_price, strike_price, maturity,
+                                      risk_free_rate, volatility))
+
+    hedging_error = np.empty(num_paths)
+    transaction_costs = np.empty(num_paths)
+
+    for start in range(0, num_paths, chunk_size):
+        stop = min(start + chunk_size, num_paths)
+        n = stop - start
+
+        # Trajectoires de prix (n × num_steps + 1)
+        shocks = rng.standard_normal((n, num_steps))
+        log_increments = (drift - 0.5 * volatility**2) * dt + volatility * np.sqrt(dt) * shocks
+        log_paths = np.zeros((n, num_steps + 1))
+        np.cumsum(log_increments, axis=1, out=log_paths[:, 1:])
+        paths = current_price * np.exp(log_paths)
+
+        # Deltas sur toute la matrice des trajectoires (dates de rééquilibrage)
+        deltas = delta_kernel(paths[:, :-1], strike_price, time_to_maturity,
+                              risk_free_rate, volatility)
+
+        # P&L actualisé de la position de couverture
+        discounted_paths = paths * discount
+        hedge_pnl = np.sum(deltas * np.diff(discounted_paths, axis=1), axis=1)
+
+        # Frais de transaction actualisés (y compris la mise en place initiale)
+        trades = np.diff(deltas, axis=1, prepend=0.0)
+        costs = transaction_cost * np.abs(trades) * discounted_paths[:, :-1]
+        total_costs = np.sum(costs, axis=1)
+
+        final_prices = paths[:, -1]
+        if option_type == 'call':
+            payoff = np.maximum(final_prices - strike_price, 0.0)
+        else:
+            payoff = np.maximum(strike_price - final_prices, 0.0)
+
+        growth = 1.0 / discount[-1]
+        hedging_error[start:stop] = (option_price + hedge_pnl - total_costs) * growth - payoff
+        transaction_costs[start:stop] = total_costs * growth
+
+    return {
+        'hedging_error': hedging_error,
+        'transaction_costs': transaction_costs,
+        'option_price': option_price,
+        'mean_error': float(np.mean(hedging_error)),
+        'tracking_error': float(np.std(hedging_error)),
+        'rms_error': float(np.sqrt(np.mean(hedging_error**2))),
+        'mean_transaction_cost': float(np.mean(transaction_costs)),
+        'percentiles': {p: float(np.percentile(hedging_error, p)) for p in percentiles},
+        'num_paths': num_paths,
+        'num_steps': num_steps
+    }
@@ -0,0 +1,339 @@
+import math
+import os
+import threading
+from contextlib import nullcontext
+
+import numpy as np
+
+import pricing_kernels
+
+try:
+    import numba
+except ImportError:  # numba est optionnel : repli sur numpy/scipy
+    numba = None
+
+
+class NumpyBackend:
+    """
+    Backend de référence : noyaux vectorisés numpy/scipy
+    """
+
+    name = 'numpy'
+
+    def call_price(self, S, K, T, r, sigma):
+        return pricing_kernels.call_price(S, K, T, r, sigma)
+
+    def put_price(self, S, K, T, r, sigma):
+        return pricing_kernels.put_price(S, K, T, r, sigma)
+
+    def call_delta(self, S, K, T, r, sigma):
+        return pricing_kernels.call_delta(S, K, T, r, sigma)
+
+    def put_delta(self, S, K, T, r, sigma):
+        return pricing_kernels.put_delta(S, K, T, r, sigma)
+
+    def scenario_prices(self, current_price, shocks, drift, vol_sqrt_t):
+        """
+        Prix futurs des scénarios : S0 * exp(drift + choc * sigma * sqrt(t))
+        """
+        return current_price * np.exp(drift + np.asarray(shocks, dtype=float) * vol_sqrt_t)
+
+
+# Couches de threads numba acceptant des appels parallèles concurrents ;
+# OpenMP d'abord : TBB bloque la fin de l'interpréteur lorsqu'il est
+# initialisé depuis un thread secondaire (cas de l'application)
+THREADSAFE_LAYERS = ('omp', 'tbb')
+
+_numba_setup = {'threading_layer': None}
+_numba_setup_lock = threading.Lock()
+
+
+def _layer_available(layer):
+    try:
+        __import__(f'numba.np.ufunc.{layer}pool')
+    except ImportError:
+        return False
+    return True
+
+
+def configure_numba(threading_layer=None):
+    """
+    Choix de la couche de threads de numba, avant le premier calcul parallèle
+
+    Appelée par NumbaBackend ; sans effet après le premier appel, qui compile
+    aussi les boucles (voir _compile_loops). Une couche
+    imposée par NUMBA_THREADING_LAYER est respectée. Sinon, la première
+    couche de THREADSAFE_LAYERS disponible est choisie, et workqueue (qui
+    impose de sérialiser les appels) à défaut.
+
+    Args:
+        threading_layer: Couche imposée ('omp', 'tbb', 'workqueue')
+
+    Returns:
+        str: Couche de threads retenue
+    """
+    if numba is None:
+        raise ImportError("Le backend 'numba' nécessite le paquet numba (pip install numba)")
+    with _numba_setup_lock:
+        if _numba_setup['threading_layer'] is None:
+            if threading_layer is None and 'NUMBA_THREADING_LAYER' in os.environ:
+                threading_layer = numba.config.THREADING_LAYER
+            if threading_layer is None:
+                threading_layer = next((layer for layer in THREADSAFE_LAYERS
+                                        if _layer_available(layer)), 'workqueue')
+            numba.config.THREADING_LAYER = threading_layer
+            _compile_loops()
+            _numba_setup['threading_layer'] = threading_layer
+        return _numba_setup['threading_layer']
+
+
+def _threadsafe(threading_layer):
+    # 'safe' et 'threadsafe' désignent des sélections de couches sûres
+    return threading_layer in THREADSAFE_LAYERS + ('safe', 'threadsafe')
+
+
+if numba is not None:
+    _SQRT1_2 = math.sqrt(0.5)
+
+    @numba.njit(cache=True)
+    def _ndtr(x):
+        return 0.5 * math.erfc(-x * _SQRT1_2)
+
+    @numba.njit(cache=True)
+    def _d1(s, k, t, r, v):
+        return (math.log(s / k) + (r + 0.5 * v * v) * t) / (v * math.sqrt(t))
+
+    @numba.njit(cache=True)
+    def _call_price(s, k, t, r, v):
+        if t <= 0:
+            return max(s - k, 0.0)
+        if v <= 0:
+            return max(s - k * math.exp(-r * t), 0.0)
+        d1 = _d1(s, k, t, r, v)
+        d2 = d1 - v * math.sqrt(t)
+        return s * _ndtr(d1) - k * math.exp(-r * t) * _ndtr(d2)
+
+    @numba.njit(cache=True)
+    def _put_price(s, k, t, r, v):
+        if t <= 0:
+            return max(k - s, 0.0)
+        if v <= 0:
+            return max(k * math.exp(-r * t) - s, 0.0)
+        d1 = _d1(s, k, t, r, v)
+        d2 = d1 - v * math.sqrt(t)
+        return k * math.exp(-r * t) * _ndtr(-d2) - s * _ndtr(-d1)
+
+    @numba.njit(cache=True)
+    def _call_delta(s, k, t, r, v):
+        if t <= 0:
+            return 1.0 if s > k else 0.0
+        if v <= 0:
+            return 1.0 if s > k * math.exp(-r * t) else 0.0
+        return _ndtr(_d1(s, k, t, r, v))
+
+    @numba.njit(cache=True)
+    def _put_delta(s, k, t, r, v):
+        if t <= 0:
+            return -1.0 if s < k else 0.0
+        if v <= 0:
+            return -1.0 if s < k * math.exp(-r * t) else 0.0
+        return _ndtr(_d1(s, k, t, r, v)) - 1.0
+
+    # Signature unique des boucles (voir _compile_loops) : entrées en lecture
+    # seule, qui acceptent aussi les tableaux modifiables, et sortie modifiable
+    _INPUT = numba.types.Array(numba.float64, 1, 'C', readonly=True)
+    _OUTPUT = numba.float64[::1]
+    _KERNEL_LOOP = numba.void(_INPUT, _INPUT, _INPUT, _INPUT, _INPUT, _OUTPUT)
+    _SCENARIO_LOOP = numba.void(numba.float64, _INPUT, numba.float64, numba.float64, _OUTPUT)
+
+    # Boucles fusionnées et parallèles ; un tableau de taille 1 est diffusé
+    @numba.njit(parallel=True, cache=True)
+    def _call_price_loop(S, K, T, r, sigma, out):
+        s_step, k_step, t_step = S.size > 1, K.size > 1, T.size > 1
+        r_step, v_step = r.size > 1, sigma.size > 1
+        for i in numba.prange(out.size):
+            out[i] = _call_price(S[i * s_step], K[i * k_step], T[i * t_step],
+                                 r[i * r_step], sigma[i * v_step])
+
+    @numba.njit(parallel=True, cache=True)
+    def _put_price_loop(S, K, T, r, sigma, out):
+        s_step, k_step, t_step = S.size > 1, K.size > 1, T.size > 1
+        r_step, v_step = r.size > 1, sigma.size > 1
+        for i in numba.prange(out.size):
+            out[i] = _put_price(S[i * s_step], K[i * k_step], T[i * t_step],
+                                r[i * r_step], sigma[i * v_step])
+
+    @numba.njit(parallel=True, cache=True)
+    def _call_delta_loop(S, K, T, r, sigma, out):
+        s_step, k_step, t_step = S.size > 1, K.size > 1, T.size > 1
+        r_step, v_step = r.size > 1, sigma.size > 1
+        for i in numba.prange(out.size):
+            out[i] = _call_delta(S[i * s_step], K[i * k_step], T[i * t_step],
+                                 r[i * r_step], sigma[i * v_step])
+
+    @numba.njit(parallel=True, cache=True)
+    def _put_delta_loop(S, K, T, r, sigma, out):
+        s_step, k_step, t_step = S.size > 1, K.size > 1, T.size > 1
+        r_step, v_step = r.size > 1, sigma.size > 1
+        for i in numba.prange(out.size):
+            out[i] = _put_delta(S[i * s_step], K[i * k_step], T[i * t_step],
+                                r[i * r_step], sigma[i * v_step])
+
+    @numba.njit(parallel=True, cache=True)
+    def _scenario_prices_loop(current_price, shocks, drift, vol_sqrt_t, out):
+        for i in numba.prange(out.size):
+            out[i] = current_price * math.exp(drift + shocks[i] * vol_sqrt_t)
+
+
+def _compile_loops():
+    """
+    Compilation (ou lecture du cache disque) des boucles pour leur seule signature
+
+    Appelée par configure_numba, une fois la couche de threads choisie : la
+    compilation d'une boucle parallèle démarre les threads de numba. Toute
+    autre spécialisation est ensuite refusée.
+    """
+    for loop, signature in ((_call_price_loop, _KERNEL_LOOP), (_put_price_loop, _KERNEL_LOOP),
+                            (_call_delta_loop, _KERNEL_LOOP), (_put_delta_loop, _KERNEL_LOOP),
+                            (_scenario_prices_loop, _SCENARIO_LOOP)):
+        loop.compile(signature)
+        loop.disable_compile()
+
+
+def _flatten_arguments(*values):
+    """
+    Mise à plat des arguments pour les boucles numba
+
+    Les scalaires deviennent des tableaux de taille 1 (diffusés dans la
+    boucle) ; seuls les arguments de formes différentes sont matérialisés.
+    Les tableaux en lecture seule (vues diffusées, courbes figées) sont
+    passés sans copie.
+    """
+    arrays = [np.asarray(value, dtype=float) for value in values]
+    shape = np.broadcast_shapes(*(array.shape for array in arrays))
+    flat = []
+    for array in arrays:
+        if array.size == 1:
+            flat.append(array.reshape(1))
+        elif array.shape == shape:
+            flat.append(np.ascontiguousarray(array).reshape(-1))
+        else:
+            flat.append(np.ascontiguousarray(np.broadcast_to(array, shape)).reshape(-1))
+    return shape, flat
+
+
+class NumbaBackend:
+    """
+    Backend compilé : boucles numba fusionnées (sans temporaires) et parallèles
+    """
+
+    name = 'numba'
+
+    # La couche workqueue n'accepte pas les appels parallèles concurrents :
+    # sous elle seulement, les appels sont sérialisés entre threads
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.threading_layer = configure_numba()
+        self._serialized = self._lock if not _threadsafe(self.threading_layer) else nullcontext()
+
+    def _run(self, loop, S, K, T, r, sigma):
+        shape, flat = _flatten_arguments(S, K, T, r, sigma)
+        out = np.empty(shape)
+        with self._serialized:
+            loop(*flat, out.reshape(-1))
+        return out[()] if out.ndim == 0 else out
+
+    def call_price(self, S, K, T, r, sigma):
+        return self._run(_call_price_loop, S, K, T, r, sigma)
+
+    def put_price(self, S, K, T, r, sigma):
+        return self._run(_put_price_loop, S, K, T, r, sigma)
+
+    def call_delta(self, S, K, T, r, sigma):
+        return self._run(_call_delta_loop, S, K, T, r, sigma)
+
+    def put_delta(self, S, K, T, r, sigma):
+        return self._run(_put_delta_loop, S, K, T, r, sigma)
+
+    def scenario_prices(self, current_price, shocks, drift, vol_sqrt_t):
+        shocks = np.ascontiguousarray(shocks, dtype=float)
+        out = np.empty(shocks.shape)
+        with self._serialized:
+            _scenario_prices_loop(float(current_price), shocks.reshape(-1), float(drift),
+                                  float(vol_sqrt_t), out.reshape(-1))
+        return out
+
+
+BACKENDS = {
+    'numpy': NumpyBackend,
+    'numba': NumbaBackend,
+}
+
+
+def available_backends():
+    """
+    Liste des backends utilisables dans l'environnement courant
+    """
+    return ['numpy'] + (['numba'] if numba is not None else [])
+
+
+def get_backend(backend=None):
+    """
+    Sélection du backend de calcul à l'exécution
+
+    Args:
+        backend: Instance de backend, nom ('numpy', 'numba', 'auto') ou None.
+                 None lit la variable d'environnement DELTAP_BACKEND (défaut:
+                 'auto', qui choisit numba s'il est installé avec une couche
+                 de threads acceptant les appels concurrents, numpy sinon).
+    """
+    if backend is not None and not isinstance(backend, str):
+        return backend
+
+    name = backend or os.environ.get('DELTAP_BACKEND', 'auto')
+    if name == 'auto':
+        # Sous workqueue, numba sérialiserait les calculs des threads concurrents
+        name = 'numba' if numba is not None and _threadsafe(configure_numba()) else 'numpy'
+
+    if name not in BACKENDS:
+        raise ValueError(f"Backend inconnu : {name} (disponibles : {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
+
+
+def compare_backends(reference='numpy', candidate='numba', num_samples=100000, seed=0):
+    """
+    Contrôle différentiel : écart maximal entre deux backends sur des entrées aléatoires
+
+    L'écart est mesuré en relatif pour les valeurs supérieures à 1, en
+    absolu sinon. Les cas limites (échéance nulle, volatilité nulle) sont
+    inclus dans l'échantillon.
+
+    Returns:
+        dict: Écart maximal par noyau
+    """
+    reference, candidate = get_backend(reference), get_backend(candidate)
+    rng = np.random.default_rng(seed)
+
+    S = rng.uniform(1.0, 500.0, num_samples)
+    K = S * np.exp(rng.normal(0.0, 0.5, num_samples))
+    T = rng.uniform(0.0, 5.0, num_samples)
+    r = rng.uniform(-0.01, 0.1, num_samples)
+    sigma = rng.uniform(0.0, 1.5, num_samples)
+    T[::97] = 0.0
+    sigma[::89] = 0.0
+
+    def max_difference(expected, actual):
+        return float(np.max(np.abs(actual - expected) / np.maximum(np.abs(expected), 1.0)))
+
+    differences = {}
+    for kernel in ('call_price', 'put_price', 'call_delta', 'put_delta'):
+        differences[kernel] = max_difference(getattr(reference, kernel)(S, K, T, r, sigma),
+                                             getattr(candidate, kernel)(S, K, T, r, sigma))
+
+    shocks = rng.standard_t(3, num_samples)
+    differences['scenario_prices'] = max_difference(
+        reference.scenario_prices(100.0, shocks, -0.01, 0.2),
+        candidate.scenario_prices(100.0, shocks, -0.01, 0.2)
+    )
+    return differences
@@ -0,0 +1,83 @@
+import numpy as np
+from scipy import special
+
+
+def _as_float_arrays(*values):
+    """
+    Conversion des entrées en tableaux numpy flottants (diffusion numpy)
+    """
+    return [np.asarray(value, dtype=float) for value in values]
+
+
+def _d1_d2(S, K, T, r, sigma):
+    """
+    Calcul vectorisé de d1 et d2 (valeurs non définies si T <= 0 ou sigma <= 0)
+    """
+    vol_sqrt_T = sigma * np.sqrt(np.maximum(T, 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / vol_sqrt_T
+    return d1, d1 - vol_sqrt_T
+
+
+def _unwrap(values):
+    """
+    Retourne un scalaire pour les entrées scalaires, un tableau sinon
+    """
+    return values[()] if np.ndim(values) == 0 else values
+
+
+def call_price(S, K, T, r, sigma):
+    """
+    Prix Black & Scholes d'un call, vectorisé sur des tableaux de paramètres
+
+    Mêmes conventions que BlackScholesCalculator.black_scholes_call pour
+    les cas limites (échéance atteinte, volatilité nulle).
+    """
+    S, K, T, r, sigma = _as_float_arrays(S, K, T, r, sigma)
+    d1, d2 = _d1_d2(S, K, T, r, sigma)
+    discount = np.exp(-r * T)
+
+    price = S * special.ndtr(d1) - K * discount * special.ndtr(d2)
+    price = np.where(sigma <= 0, np.maximum(S - K * discount, 0.0), price)
+    price = np.where(T <= 0, np.maximum(S - K, 0.0), price)
+    return _unwrap(price)
+
+
+def put_price(S, K, T, r, sigma):
+    """
+    Prix Black & Scholes d'un put, vectorisé sur des tableaux de paramètres
+    """
+    S, K, T, r, sigma = _as_float_arrays(S, K, T, r, sigma)
+    d1, d2 = _d1_d2(S, K, T, r, sigma)
+    discount = np.exp(-r * T)
+
+    price = K * discount * special.ndtr(-d2) - S * special.ndtr(-d1)
+    price = np.where(sigma <= 0, np.maximum(K * discount - S, 0.0), price)
+    price = np.where(T <= 0, np.maximum(K - S, 0.0), price)
+    return _unwrap(price)
+
+
+def call_delta(S, K, T, r, sigma):
+    """
+    Delta d'un call, vectorisé sur des tableaux de paramètres
+    """
+    S, K, T, r, sigma = _as_float_arrays(S, K, T, r, sigma)
+    d1, _ = _d1_d2(S, K, T, r, sigma)
+
+    delta = special.ndtr(d1)
+    delta = np.where(sigma <= 0, np.where(S > K * np.exp(-r * T), 1.0, 0.0), delta)
+    delta = np.where(T <= 0, np.where(S > K, 1.0, 0.0), delta)
+    return _unwrap(delta)
+
+
+def put_delta(S, K, T, r, sigma):
+    """
+    Delta d'un put, vectorisé sur des tableaux de paramètres
+    """
+    S, K, T, r, sigma = _as_float_arrays(S, K, T, r, sigma)
+    d1, _ = _d1_d2(S, K, T, r, sigma)
+
+    delta = special.ndtr(d1) - 1.0
+    delta = np.where(sigma <= 0, np.where(S < K * np.exp(-r * T), -1.0, 0.0), delta)
+    delta = np.where(T <= 0, np.where(S < K, -1.0, 0.0), delta)
+    return _unwrap(delta)
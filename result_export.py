@@ -0,0 +1,213 @@
+import json
+from datetime import date, datetime
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow est optionnel : export indisponible sans lui
+    pa = None
+    pq = None
+
+
+EXPORT_FORMATS = ('parquet', 'arrow')
+
+# Extensions et types MIME des fichiers exportés
+EXPORT_FILE_TYPES = {
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('.arrow', 'application/vnd.apache.arrow.file'),
+}
+
+# Colonnes numériques exportées
+HEDGE_COLUMNS = ('current_price', 'volatility', 'coverage_percentile', 'risk_free_rate',
+                 'time_to_delivery', 'holding_period', 'strike_price', 'price_delta',
+                 'call_price', 'put_price', 'call_delta', 'put_delta')
+SCENARIO_COLUMNS = ('future_price', 'price_delta', 'shock')
+
+DEFAULT_ROW_GROUP_SIZE = 1_000_000
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow est nécessaire pour l'export Arrow/Parquet (pip install pyarrow)")
+
+
+def _check_format(format):
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Format inconnu : {format} (disponibles : {', '.join(EXPORT_FORMATS)})")
+
+
+def _column(values, float32):
+    """
+    Colonne Arrow d'un tableau numpy 1-D, sans copie pour un float64 contigu
+    """
+    values = np.ascontiguousarray(values)
+    if values.dtype.kind == 'M':
+        return pa.array(values.astype('datetime64[us]'))
+    if values.dtype.kind == 'b':
+        return pa.array(values)
+    return pa.array(values.astype(np.float32 if float32 else np.float64, copy=False))
+
+
+def _metadata_value(value):
+    if isinstance(value, (date, datetime, np.datetime64)):
+        return str(value)
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    return value
+
+
+def _schema_metadata(metadata):
+    """
+    Métadonnées du schéma : paramètres du calcul sérialisés en JSON
+    """
+    if not metadata:
+        return None
+    return {'deltap': json.dumps({key: _metadata_value(value) for key, value in metadata.items()})}
+
+
+def read_metadata(schema):
+    """
+    Paramètres du calcul enregistrés dans le schéma d'un fichier exporté
+    """
+    metadata = schema.metadata or {}
+    return json.loads(metadata.get(b'deltap', b'{}'))
+
+
+def hedge_table(results, float32=False):
+    """
+    Table Arrow des résultats de calculate_price_hedge ou calculate_price_hedge_batch
+
+    Un résultat scalaire donne une ligne ; un résultat vectorisé, une ligne
+    par contrat (tableaux diffusés à la forme commune puis aplatis). Les
+    colonnes float64 contiguës sont reprises sans copie.
+
+    Args:
+        results: Dict de résultats (valeurs scalaires ou tableaux numpy)
+        float32: Colonnes numériques en float32 (taille divisée par deux)
+
+    Returns:
+        pyarrow.Table
+    """
+    _require_pyarrow()
+    if 'error' in results:
+        raise ValueError(f"Résultat en erreur, rien à exporter : {results['error']}")
+
+    columns = {name: np.asarray(results[name]) for name in HEDGE_COLUMNS if name in results}
+    columns['start_date'] = np.asarray(results['start_date'], dtype='datetime64[us]')
+    columns['end_date'] = np.asarray(results['end_date'], dtype='datetime64[us]')
+    if 'valid' in results:
+        columns['valid'] = np.asarray(results['valid'])
+
+    shape = np.broadcast_shapes(*(values.shape for values in columns.values()))
+    arrays = {name: _column(np.broadcast_to(values, shape).reshape(-1), float32)
+              for name, values in columns.items()}
+    return pa.table(arrays)
+
+
+def scenario_batches(scenarios, row_group_size=DEFAULT_ROW_GROUP_SIZE, float32=False):
+    """
+    Lots Arrow (RecordBatch) successifs des tableaux de scénarios
+
+    Chaque lot est une vue sur une tranche des tableaux numpy : la mémoire
+    supplémentaire est bornée par un lot (conversion float32 éventuelle).
+
+    Args:
+        scenarios: Résultat de simulate_price_scenarios ou
+                   simulate_price_scenarios_adaptive (tableaux numpy)
+        row_group_size: Nombre de scénarios par lot (groupe de lignes Parquet)
+
+    Yields:
+        pyarrow.RecordBatch
+    """
+    _require_pyarrow()
+    if not isinstance(scenarios, dict):
+        raise TypeError("Les scénarios doivent être des tableaux numpy "
+                        "(voir simulate_price_scenarios)")
+    names = [name for name in SCENARIO_COLUMNS if name in scenarios]
+    size = len(scenarios[names[0]])
+    for start in range(0, max(size, 1), row_group_size):
+        stop = min(start + row_group_size, size)
+        yield pa.record_batch([_column(scenarios[name][start:stop], float32) for name in names],
+                              names=names)
+
+
+def _write_batches(batches, sink, format, compression, metadata, row_group_size):
+    """
+    Écriture en flux de lots Arrow, un groupe de lignes Parquet ou un lot IPC à la fois
+    """
+    batches = iter(batches)
+    first = next(batches)
+    schema = first.schema.with_metadata(_schema_metadata(metadata))
+
+    if format == 'parquet':
+        writer = pq.ParquetWriter(sink, schema, compression=compression or 'none')
+        write = lambda batch: writer.write_batch(batch, row_group_size=row_group_size)
+    else:
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        writer = pa.ipc.new_file(sink, schema, options=options)
+        write = writer.write_batch
+
+    with writer:
+        write(first)
+        num_rows = first.num_rows
+        for batch in batches:
+            write(batch)
+            num_rows += batch.num_rows
+    return num_rows
+
+
+def export_hedge(results, sink=None, format='parquet', float32=False, compression='zstd'):
+    """
+    Export Arrow IPC ou Parquet d'un résultat de couverture (scalaire ou vectorisé)
+
+    Args:
+        results: Résultat de calculate_price_hedge ou calculate_price_hedge_batch
+        sink: Chemin ou fichier binaire ; None pour retourner les octets
+        format: 'parquet' ou 'arrow' (fichier IPC)
+        float32: Colonnes numériques en float32
+        compression: 'zstd', 'lz4' ou None (Parquet accepte aussi 'snappy', 'gzip')
+
+    Returns:
+        bytes si sink est None, None sinon
+    """
+    _require_pyarrow()
+    _check_format(format)
+    table = hedge_table(results, float32)
+    metadata = {'kind': 'hedge', 'exported_at': datetime.now().isoformat(timespec='seconds')}
+    stream = pa.BufferOutputStream() if sink is None else sink
+    _write_batches(table.to_batches(), stream, format, compression, metadata,
+                   DEFAULT_ROW_GROUP_SIZE)
+    return stream.getvalue().to_pybytes() if sink is None else None
+
+
+def export_scenarios(scenarios, sink=None, format='parquet', float32=False, compression='zstd',
+                     row_group_size=DEFAULT_ROW_GROUP_SIZE, metadata=None):
+    """
+    Export Arrow IPC ou Parquet des vecteurs de scénarios, par groupes de lignes
+
+    Les tableaux numpy sont écrits tranche par tranche sans passer par des
+    dicts Python ni du texte : exporter 10 millions de scénarios ne demande
+    qu'un groupe de lignes de mémoire supplémentaire (hors octets retournés
+    lorsque sink est None).
+
+    Args:
+        scenarios: Résultat de simulate_price_scenarios ou simulate_price_scenarios_adaptive
+        sink: Chemin ou fichier binaire ; None pour retourner les octets
+        format: 'parquet' ou 'arrow' (fichier IPC)
+        float32: Colonnes en float32
+        compression: 'zstd', 'lz4' ou None (Parquet accepte aussi 'snappy', 'gzip')
+        row_group_size: Nombre de scénarios par groupe de lignes / lot
+        metadata: Paramètres du calcul enregistrés dans le schéma (voir read_metadata)
+
+    Returns:
+        bytes si sink est None, None sinon
+    """
+    _require_pyarrow()
+    _check_format(format)
+    metadata = dict(metadata or {}, kind='scenarios')
+    stream = pa.BufferOutputStream() if sink is None else sink
+    _write_batches(scenario_batches(scenarios, row_group_size, float32), stream, format,
+                   compression, metadata, row_group_size)
+    return stream.getvalue().to_pybytes() if sink is None else None
@@ -0,0 +1,299 @@
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from concurrent.futures import Future
+from datetime import date, datetime
+
+import numpy as np
+
+
+# Méthodes coûteuses du calculateur partagées entre appels identiques concurrents
+# (calculate_price_hedge, de l'ordre de la microseconde, coûte moins que sa clé)
+SHARED_METHODS = ('calculate_price_hedge_batch', 'sweep_price_hedge',
+                  'calculate_price_scenarios', 'simulate_price_scenarios',
+                  'simulate_price_scenarios_adaptive', 'simulate_price_fan',
+                  'simulate_hedging_error', 'simulate_volume_risk')
+# Fonction de rappel de progression : hors de la clé, diffusée à tous les demandeurs
+PROGRESS_ARGUMENT = 'callback'
+
+
+def _normalize(value):
+    """
+    Forme JSON stable d'un argument ; TypeError si l'argument n'est pas normalisable
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # Arrondi pour que 0.1 + 0.2 et 0.3 donnent la même clé
+        return round(float(value), 10)
+    if isinstance(value, (date, datetime, np.datetime64)):
+        return ['date', str(value)]
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return ['array', value.dtype.str, list(value.shape), digest]
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    raise TypeError(f"Argument non normalisable : {type(value).__name__}")
+
+
+def call_key(name, **arguments):
+    """
+    Clé normalisée (SHA-256) d'un appel : nom et arguments
+
+    Raises:
+        TypeError: Argument non normalisable (fonction de rappel, objet quelconque)
+    """
+    payload = json.dumps([name, _normalize(arguments)], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _future(handle):
+    return getattr(handle, 'future', handle)
+
+
+class _Call:
+    __slots__ = ('handle', 'waiters', 'started')
+
+    def __init__(self):
+        self.handle = None
+        self.waiters = 1
+        # Posé une fois start() terminé (handle renseigné, ou None en cas d'erreur)
+        self.started = threading.Event()
+
+
+class SingleFlight:
+    """
+    Déduplication des calculs identiques en cours (single-flight)
+
+    Tant qu'un calcul est en cours pour une clé, les demandes de la même clé
+    attendent son résultat (ou son exception) au lieu de relancer le calcul.
+    Une fois le calcul terminé, la clé est oubliée : la déduplication ne
+    porte que sur les calculs en cours, pas sur les résultats passés.
+
+    Les résultats sont partagés entre les demandeurs : ils doivent être
+    traités en lecture seule.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._listeners = {}
+        self.statistics = {'started': 0, 'shared': 0}
+
+    def in_flight(self):
+        """
+        Nombre de calculs en cours
+        """
+        with self._lock:
+            return len(self._calls)
+
+    def join(self, key, start):
+        """
+        Rattachement au calcul en cours pour key, lancé par start() s'il n'y en a pas
+
+        start() est appelé hors du verrou : les autres clés ne l'attendent
+        pas ; les demandeurs de la même clé attendent qu'il ait retourné (et
+        le relancent eux-mêmes s'il a échoué).
+
+        Args:
+            key: Clé hashable du calcul (voir call_key)
+            start: Fonction sans argument lançant le calcul et retournant un
+                   concurrent.futures.Future, ou un objet ayant un attribut
+                   future (par ex. background_jobs.BackgroundJob)
+
+        Returns:
+            Objet retourné par start() pour le premier demandeur, partagé
+            avec les demandeurs suivants tant que le calcul est en cours
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None or (call.handle is not None and _future(call.handle).done()):
+                    call = _Call()
+                    self._calls[key] = call
+                    self.statistics['started'] += 1
+                    break
+                call.waiters += 1
+            call.started.wait()
+            with self._lock:
+                if call.handle is not None:
+                    self.statistics['shared'] += 1
+                    return call.handle
+
+        try:
+            call.handle = start()
+        except BaseException:
+            with self._lock:
+                self.statistics['started'] -= 1
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            raise
+        finally:
+            call.started.set()
+        _future(call.handle).add_done_callback(lambda _: self._forget(key, call))
+        return call.handle
+
+    def release(self, key, handle):
+        """
+        Retrait d'un demandeur (abandon du résultat)
+
+        Returns:
+            bool: True si plus aucun demandeur n'attend le calcul : l'appelant
+                  peut alors l'annuler
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None or call.handle is not handle:
+                return True
+            call.waiters -= 1
+            if call.waiters > 0:
+                return False
+            del self._calls[key]
+            return True
+
+    def subscribe(self, key, listener):
+        """
+        Abonnement d'un demandeur à la progression du calcul de key (voir notify)
+        """
+        with self._lock:
+            self._listeners.setdefault(key, []).append(listener)
+
+    def unsubscribe(self, key, listener):
+        with self._lock:
+            listeners = self._listeners.get(key, [])
+            if listener in listeners:
+                listeners.remove(listener)
+            if not listeners:
+                self._listeners.pop(key, None)
+
+    def notify(self, key, *args):
+        """
+        Transmission d'une progression à tous les abonnés de key
+
+        Appelé par le calcul en cours, dans son thread : les abonnés doivent
+        être rapides et sûrs entre threads. Un abonné qui lève une exception
+        (par ex. JobCancelled d'une tâche annulée) est désabonné ; le calcul
+        partagé se poursuit pour les autres demandeurs.
+        """
+        with self._lock:
+            listeners = list(self._listeners.get(key, ()))
+        for listener in listeners:
+            try:
+                listener(*args)
+            except Exception:
+                self.unsubscribe(key, listener)
+
+    def _forget(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def submit(self, executor, key, fn, *args, **kwargs):
+        """
+        Soumission dédupliquée de fn(*args, **kwargs) à un exécuteur
+
+        Returns:
+            concurrent.futures.Future: Future partagé par les soumissions de la même clé
+        """
+        return self.join(key, lambda: executor.submit(fn, *args, **kwargs))
+
+    def do(self, key, fn, *args, timeout=None, **kwargs):
+        """
+        Exécution dédupliquée et synchrone de fn(*args, **kwargs)
+
+        Le premier demandeur exécute fn dans son propre thread ; les suivants
+        attendent son résultat. Une exception levée par fn est propagée à
+        tous les demandeurs.
+
+        Args:
+            timeout: Attente maximale (secondes) d'un calcul lancé par un autre
+                     demandeur ; TimeoutError au-delà, le calcul se poursuit
+
+        Returns:
+            Résultat de fn
+        """
+        started = []
+
+        def start():
+            future = Future()
+            future.set_running_or_notify_cancel()
+            started.append(future)
+            return future
+
+        future = self.join(key, start)
+        if not started:
+            try:
+                return future.result(timeout=timeout)
+            finally:
+                self.release(key, future)
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        future.set_result(result)
+        return result
+
+
+class DeduplicatedCalculator:
+    """
+    Enveloppe d'un BlackScholesCalculator partageant les calculs identiques concurrents
+
+    Les méthodes de SHARED_METHODS appelées en même temps avec les mêmes
+    arguments (normalisés, valeurs par défaut comprises) ne sont exécutées
+    qu'une fois. La fonction de rappel de progression (argument callback)
+    ne fait pas partie de la clé : chaque demandeur reçoit la progression
+    du calcul partagé à partir de son rattachement. Les appels dont un autre
+    argument n'est pas normalisable sont exécutés directement. Les autres
+    attributs sont ceux du calculateur enveloppé.
+    """
+
+    def __init__(self, calculator, flight=None, timeout=None):
+        """
+        Args:
+            calculator: Instance de BlackScholesCalculator
+            flight: SingleFlight partagé (par ex. entre sessions) ; un nouveau par défaut
+            timeout: Attente maximale (secondes) d'un calcul lancé par un autre appel
+        """
+        self.calculator = calculator
+        self.flight = flight if flight is not None else SingleFlight()
+        self.timeout = timeout
+
+    def __getattr__(self, name):
+        attribute = getattr(self.calculator, name)
+        if name not in SHARED_METHODS:
+            return attribute
+        signature = inspect.signature(attribute)
+        reports_progress = PROGRESS_ARGUMENT in signature.parameters
+
+        def shared(*args, **kwargs):
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            callback = arguments.arguments.pop(PROGRESS_ARGUMENT, None)
+            try:
+                # Le calculateur fait partie de la clé : un SingleFlight peut être partagé
+                key = call_key(name, calculator=id(self.calculator), **arguments.arguments)
+            except TypeError:
+                return attribute(*args, **kwargs)
+            if not reports_progress:
+                return self.flight.do(key, attribute, *args, timeout=self.timeout, **kwargs)
+
+            # Le calcul partagé diffuse sa progression à tous les demandeurs rattachés
+            arguments.arguments[PROGRESS_ARGUMENT] = functools.partial(self.flight.notify, key)
+            if callback is not None:
+                self.flight.subscribe(key, callback)
+            try:
+                return self.flight.do(key, attribute, *arguments.args, timeout=self.timeout,
+                                      **arguments.kwargs)
+            finally:
+                if callback is not None:
+                    self.flight.unsubscribe(key, callback)
+
+        shared.__name__ = name
+        shared.__doc__ = attribute.__doc__
+        return shared
@@ -0,0 +1,279 @@
+import asyncio
+import inspect
+from datetime import date
+
+import numpy as np
+from scipy import special
+
+
+DEFAULT_UNDERLYING = 'default'
+
+# Grandeurs mises à jour à chaque tick
+STREAM_FIELDS = ('current_price', 'strike_price', 'price_delta', 'call_price', 'put_price',
+                 'call_delta', 'put_delta')
+
+
+class SpotStreamHedger:
+    """
+    Mise à jour incrémentale des couvertures d'un portefeuille au fil des ticks de prix
+
+    Pour un contrat dont le strike est fixé par le centile de couverture,
+    strike, delta prix et primes sont proportionnels au prix spot (les deltas
+    n'en dépendent pas) : les constantes sont calculées une fois pour un spot
+    de 1 par calculate_price_hedge_batch, et chaque tick coûte une
+    multiplication vectorisée. Pour un contrat à strike fixe, d1 est calculé
+    à partir des constantes (r + σ²/2)h, σ√h et K·exp(-rh) mises en cache.
+
+    Les constantes dépendent de la date du jour (holding period) : elles
+    sont recalculées au premier tick d'une nouvelle journée.
+    """
+
+    def __init__(self, calculator, contracts):
+        """
+        Args:
+            calculator: Instance de BlackScholesCalculator
+            contracts: Liste de dicts avec 'contract_id', 'start_date', 'end_date',
+                       'coverage_percentile', 'volatility', et éventuellement
+                       'risk_free_rate' (défaut: 0), 'underlying' (défaut:
+                       DEFAULT_UNDERLYING) et 'strike_price' (strike fixe)
+        """
+        self.calculator = calculator
+        self.contracts = list(contracts)
+        self.contract_ids = [str(contract['contract_id']) for contract in self.contracts]
+        size = len(self.contracts)
+
+        underlyings = np.array([contract.get('underlying', DEFAULT_UNDERLYING)
+                                for contract in self.contracts], dtype=object)
+        fixed_strike = np.array([contract.get('strike_price') is not None
+                                 for contract in self.contracts], dtype=bool)
+        self._groups = {
+            underlying: (np.flatnonzero((underlyings == underlying) & ~fixed_strike),
+                         np.flatnonzero((underlyings == underlying) & fixed_strike))
+            for underlying in dict.fromkeys(underlyings)
+        }
+        self._fixed_strike = np.array([np.nan if contract.get('strike_price') is None
+                                       else contract['strike_price']
+                                       for contract in self.contracts], dtype=float)
+
+        self.state = {name: np.full(size, np.nan) for name in STREAM_FIELDS}
+        self.as_of_date = None
+        self.refresh()
+
+    def refresh(self):
+        """
+        Calcul des constantes par contrat pour la date du jour
+        """
+        contracts = self.contracts
+        batch = self.calculator.calculate_price_hedge_batch(
+            1.0,
+            np.array([np.datetime64(contract['start_date'], 'D') for contract in contracts]),
+            np.array([np.datetime64(contract['end_date'], 'D') for contract in contracts]),
+            np.array([contract['volatility'] for contract in contracts], dtype=float),
+            np.array([contract['coverage_percentile'] for contract in contracts], dtype=float),
+            np.array([contract.get('risk_free_rate', 0.0) for contract in contracts], dtype=float)
+        )
+        size = len(contracts)
+        valid = np.broadcast_to(batch['valid'], size)
+        holding_period = np.broadcast_to(batch['holding_period'], size)
+        volatility = np.broadcast_to(batch['volatility'], size)
+        risk_free_rate = np.broadcast_to(batch['risk_free_rate'], size)
+
+        # Contrats au centile : valeurs pour un spot de 1
+        self._unit = {name: np.where(valid, np.broadcast_to(batch[name], size), np.nan)
+                      for name in ('strike_price', 'call_price', 'put_price',
+                                   'call_delta', 'put_delta')}
+
+        # Contrats à strike fixe : termes de d1 et strike actualisé
+        with np.errstate(invalid='ignore'):
+            self._drift = (risk_free_rate + 0.5 * volatility**2) * holding_period
+            self._vol_sqrt_t = np.where(valid, volatility * np.sqrt(holding_period), np.nan)
+        self._discounted_strike = self._fixed_strike * np.exp(-risk_free_rate * holding_period)
+
+        self.as_of_date = date.today()
+
+    def update(self, underlying, price):
+        """
+        Application d'un prix spot aux contrats d'un sous-jacent
+
+        Returns:
+            numpy.ndarray: Indices des contrats mis à jour
+        """
+        if self.as_of_date != date.today():
+            self.refresh()
+        if underlying not in self._groups:
+            return np.empty(0, dtype=int)
+
+        relative, fixed = self._groups[underlying]
+        state, unit = self.state, self._unit
+
+        state['current_price'][relative] = price
+        state['strike_price'][relative] = price * unit['strike_price'][relative]
+        state['call_price'][relative] = price * unit['call_price'][relative]
+        state['put_price'][relative] = price * unit['put_price'][relative]
+        state['call_delta'][relative] = unit['call_delta'][relative]
+        state['put_delta'][relative] = unit['put_delta'][relative]
+
+        if fixed.size:
+            strike = self._fixed_strike[fixed]
+            discounted_strike = self._discounted_strike[fixed]
+            vol_sqrt_t = self._vol_sqrt_t[fixed]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                d1 = (np.log(price / strike) + self._drift[fixed]) / vol_sqrt_t
+            call_delta = special.ndtr(d1)
+            call_price = price * call_delta - discounted_strike * special.ndtr(d1 - vol_sqrt_t)
+
+            state['current_price'][fixed] = price
+            state['strike_price'][fixed] = strike
+            state['call_price'][fixed] = call_price
+            state['put_price'][fixed] = call_price - price + discounted_strike
+            state['call_delta'][fixed] = call_delta
+            state['put_delta'][fixed] = call_delta - 1.0
+
+        updated = np.concatenate([relative, fixed])
+        state['price_delta'][updated] = state['strike_price'][updated] - price
+        return updated
+
+    def snapshot(self):
+        """
+        Copie de l'état courant de tous les contrats
+
+        Returns:
+            dict: 'contract_id' et tableaux par grandeur (voir STREAM_FIELDS)
+        """
+        snapshot = {name: values.copy() for name, values in self.state.items()}
+        snapshot['contract_id'] = list(self.contract_ids)
+        return snapshot
+
+
+def parse_tick(line, default_underlying=DEFAULT_UNDERLYING):
+    """
+    Lecture d'un tick texte : 'sous-jacent,prix' ou 'prix'
+
+    Returns:
+        tuple: (sous-jacent, prix), ou None pour une ligne vide ou un commentaire
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    fields = [field.strip() for field in line.split(',')]
+    if len(fields) == 1:
+        return default_underlying, float(fields[0])
+    return fields[0], float(fields[1])
+
+
+async def queue_ticks(queue):
+    """
+    Ticks lus dans une asyncio.Queue (tuples (sous-jacent, prix)), None pour terminer
+    """
+    while True:
+        tick = await queue.get()
+        if tick is None:
+            return
+        yield tick
+
+
+async def file_ticks(path, interval=0.0, default_underlying=DEFAULT_UNDERLYING):
+    """
+    Rejeu d'un fichier de ticks (une ligne par tick, voir parse_tick)
+
+    Args:
+        interval: Pause entre deux ticks (secondes)
+    """
+    with open(path, encoding='utf-8') as ticks:
+        for line in ticks:
+            tick = parse_tick(line, default_underlying)
+            if tick is not None:
+                yield tick
+                await asyncio.sleep(interval)
+
+
+async def socket_ticks(host, port, default_underlying=DEFAULT_UNDERLYING):
+    """
+    Ticks reçus sur une connexion TCP (une ligne par tick, voir parse_tick)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            tick = parse_tick(line.decode('utf-8'), default_underlying)
+            if tick is not None:
+                yield tick
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def stream_hedges(hedger, ticks, on_update=None):
+    """
+    Consommation d'un flux de ticks avec regroupement des mises à jour
+
+    La lecture des ticks et le calcul tournent dans deux tâches : si les
+    ticks arrivent plus vite qu'ils ne sont traités, seul le dernier prix de
+    chaque sous-jacent est appliqué.
+
+    Args:
+        hedger: Instance de SpotStreamHedger
+        ticks: Itérable asynchrone de (sous-jacent, prix), voir queue_ticks,
+               file_ticks et socket_ticks
+        on_update: Fonction (ou coroutine) appelée après chaque mise à jour
+                   avec (snapshot, prix appliqués par sous-jacent)
+
+    Returns:
+        dict: 'ticks' (reçus), 'updates' (mises à jour appliquées) et
+              'coalesced' (ticks remplacés avant traitement)
+
+    Raises:
+        Exception: Erreur de la source de ticks (connexion perdue, tick
+                   invalide), levée après application des ticks déjà reçus
+    """
+    pending = {}
+    ready = asyncio.Event()
+    finished = False
+    statistics = {'ticks': 0, 'updates': 0, 'coalesced': 0}
+
+    async def read():
+        nonlocal finished
+        try:
+            async for underlying, price in ticks:
+                statistics['ticks'] += 1
+                if underlying in pending:
+                    statistics['coalesced'] += 1
+                pending[underlying] = price
+                ready.set()
+        finally:
+            finished = True
+            ready.set()
+
+    async def process():
+        while True:
+            if not pending:
+                if finished:
+                    return
+                await ready.wait()
+                ready.clear()
+                continue
+
+            prices = dict(pending)
+            pending.clear()
+            for underlying, price in prices.items():
+                hedger.update(underlying, price)
+            statistics['updates'] += 1
+
+            if on_update is not None:
+                result = on_update(hedger.snapshot(), prices)
+                if inspect.isawaitable(result):
+                    await result
+            # Laisse la main au lecteur avant le regroupement suivant
+            await asyncio.sleep(0)
+
+    reader = asyncio.create_task(read())
+    try:
+        await process()
+    except BaseException:
+        reader.cancel()
+        raise
+    # Lecteur terminé : une erreur de la source (connexion, tick invalide) est propagée
+    await reader
+    return statistics
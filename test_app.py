@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests de l'application Streamlit (streamlit.testing.v1.AppTest)
+"""
+
+import sys
+import os
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+
+def test_volatility_history_validation(monkeypatch):
+    """Historique inutilisable : avertissement et volatilité par défaut, sans exception"""
+    monkeypatch.setenv('DELTAP_STORE_PATH', ':memory:')
+    app = AppTest.from_file(APP_PATH, default_timeout=120).run()
+
+    histories = {
+        'aucune colonne numérique': b"date,commentaire\n2024-01-01,a\n2024-01-02,b\n",
+        'au moins 22': b"prix\n100\n101\n102\n",
+        'négatifs ou nuls': ("prix\n" + "\n".join(["100", "-5"] * 15)).encode()
+    }
+    for message, history in histories.items():
+        app.sidebar.file_uploader[0].upload('historique.csv', history, 'text/csv').run()
+        assert not app.exception
+        assert message in app.sidebar.warning[0].value
+        assert app.sidebar.slider[0].value == 25.0
+
+    prices = 100 * np.exp(0.01 * np.sin(np.arange(60)))
+    history = ("prix\n" + "\n".join(f"{price:.4f}" for price in prices)).encode()
+    app.sidebar.file_uploader[0].upload('historique.csv', history, 'text/csv').run()
+    assert not app.exception and not app.sidebar.warning
+    assert app.sidebar.slider[0].value == 11.0
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests du banc de mesure headless de l'application
+"""
+
+import sys
+import os
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app_latency_harness import measure_latency, run_session
+
+
+def test_session_drives_sidebar_and_button(monkeypatch):
+    """Une session pilotée par les libellés de la sidebar s'exécute sans exception"""
+    monkeypatch.setenv('DELTAP_STORE_PATH', ':memory:')
+
+    session = run_session({'volatility': 30.0, 'coverage_percentile': 90.0,
+                           'target_precision': 2.0})
+
+    assert session['exceptions'] == []
+    assert session['calculation'] > 0
+    assert session['element_types']['plotly_chart'] >= 3
+    assert session['elements'] == sum(session['element_types'].values())
+    assert session['element_types']['button'] == 1  # bouton de la sidebar compté
+
+
+def test_latency_matrix(monkeypatch):
+    """Une mesure par combinaison de la matrice"""
+    monkeypatch.setenv('DELTAP_STORE_PATH', ':memory:')
+
+    results = measure_latency({'volatility': [20.0, 40.0]}, repeats=2)
+
+    assert [result['parameters'] for result in results] == [{'volatility': 20.0},
+                                                            {'volatility': 40.0}]
+    assert all(result['warm_median'] > 0 for result in results)
+    assert all(0 < result['peak_memory_median_mb'] <= result['peak_memory_mb'] for result in results)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests des tâches de fond annulables
+"""
+
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from background_jobs import JobCancelled, submit_job
+
+
+def test_job_reports_progress_and_result():
+    """La tâche retourne son résultat et sa progression finale"""
+    def compute(context, value):
+        context.report_progress(0.5, "moitié")
+        context.report_progress(1.0, "terminé")
+        return value * 2
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        job = submit_job(executor, 'cle', compute, 21)
+        assert job.result(timeout=5) == 42
+    assert job.progress == 1.0
+    assert job.message == "terminé"
+
+
+def test_running_job_is_cancelled_at_next_checkpoint():
+    """Une tâche en cours s'interrompt au prochain point d'annulation"""
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute(context):
+        started.set()
+        release.wait(5)
+        context.check_cancelled()
+        return "non annulée"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        job = submit_job(executor, 'cle', compute)
+        started.wait(5)
+        job.cancel()
+        release.set()
+        with pytest.raises(JobCancelled):
+            job.result(timeout=5)
+    assert job.cancelled()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests du recalcul incrémental du portefeuille de contrats
+"""
+
+import sys
+import os
+from datetime import date, timedelta
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+from business_calendar import BusinessCalendar
+from book_repricing import reprice_book
+from hedge_store import HedgeStore
+
+
+def make_book():
+    today = date.today()
+    book = [
+        {'contract_id': f'C{index}',
+         'start_date': today + timedelta(days=30 + 10 * index),
+         'end_date': today + timedelta(days=120 + 10 * index),
+         'coverage_percentile': 50.0 + index}
+        for index in range(20)
+    ]
+    book.append({'contract_id': 'EXPIRED', 'start_date': today - timedelta(days=60),
+                 'end_date': today - timedelta(days=1), 'coverage_percentile': 75.0})
+    return book
+
+
+def test_only_changed_contracts_are_recomputed():
+    """Seuls les contrats dont les paramètres ou le marché ont changé sont recalculés"""
+    calculator = BlackScholesCalculator()
+    book = make_book()
+    market = {'current_price': 100.0, 'volatility': 0.25}
+
+    with HedgeStore() as store:
+        first = reprice_book(calculator, store, book, market)
+        assert len(first['recomputed']) == 20
+        assert first['expired'] == ['EXPIRED']
+
+        second = reprice_book(calculator, store, book, market)
+        assert second['recomputed'] == [] and second['expired'] == []
+        assert second['unchanged'] == 21
+
+        # Contrat modifié et surcharge de volatilité propre à un contrat
+        book[3]['coverage_percentile'] = 90.0
+        book[7]['volatility'] = 0.4
+        third = reprice_book(calculator, store, book, market)
+        assert third['recomputed'] == ['C3', 'C7']
+
+        history = store.hedge_history('C3')
+        assert [row['coverage_percentile'] for row in history] == [53.0, 90.0]
+        expected = calculator.calculate_price_hedge(100.0, book[3]['start_date'],
+                                                    book[3]['end_date'], 0.25, 90.0)
+        assert history[-1]['strike_price'] == pytest.approx(expected['strike_price'])
+
+        # Données de marché modifiées : tout le portefeuille est recalculé
+        market['current_price'] = 101.0
+        assert len(reprice_book(calculator, store, book, market)['recomputed']) == 20
+
+
+def test_new_day_triggers_recomputation():
+    """Un changement de date de calcul entraîne le recalcul de tous les contrats"""
+    calculator = BlackScholesCalculator()
+    book = make_book()[:5]
+    market = {'current_price': 100.0, 'volatility': 0.25, 'risk_free_rate': 0.02}
+
+    with HedgeStore() as store:
+        reprice_book(calculator, store, book, market, as_of_date=date.today() - timedelta(days=1))
+        assert len(reprice_book(calculator, store, book, market)['recomputed']) == 5
+        assert reprice_book(calculator, store, book, market)['recomputed'] == []
+        assert len(reprice_book(calculator, store, book, market, force=True)['recomputed']) == 5
+
+
+def test_calendar_change_triggers_recomputation():
+    """Un changement de calendrier du calculateur entraîne le recalcul des contrats"""
+    book = make_book()[:5]
+    market = {'current_price': 100.0, 'volatility': 0.25}
+
+    with HedgeStore() as store:
+        reprice_book(BlackScholesCalculator(), store, book, market)
+        calculator = BlackScholesCalculator(calendar=BusinessCalendar('BUS/252'))
+        assert len(reprice_book(calculator, store, book, market)['recomputed']) == 5
+        assert reprice_book(calculator, store, book, market)['recomputed'] == []
+
+        expected = calculator.calculate_price_hedge(100.0, book[0]['start_date'],
+                                                    book[0]['end_date'], 0.25, 50.0)
+        history = store.hedge_history('C0')
+        assert history[-1]['strike_price'] == pytest.approx(expected['strike_price'])
+
+
+def test_invalid_book():
+    """Identifiants en double ou données de marché manquantes"""
+    calculator = BlackScholesCalculator()
+    book = make_book()[:2]
+
+    with HedgeStore() as store:
+        with pytest.raises(ValueError):
+            reprice_book(calculator, store, book + book[:1], {'current_price': 100.0,
+                                                               'volatility': 0.25})
+        with pytest.raises(ValueError):
+            reprice_book(calculator, store, book, {'current_price': 100.0})
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests du calendrier de jours ouvrés et des conventions de décompte
+"""
+
+import sys
+import os
+from datetime import date, datetime, timedelta
+import numpy as np
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+from business_calendar import BusinessCalendar, easter_sunday, french_holidays
+
+
+def test_french_holidays():
+    """Fêtes fixes et mobiles (Pâques, Ascension, Pentecôte)"""
+    assert easter_sunday(2025) == np.datetime64('2025-04-20')
+    assert easter_sunday(2026) == np.datetime64('2026-04-05')
+
+    holidays = french_holidays(2026, 2026)
+    assert len(holidays) == 11
+    for holiday in ('2026-01-01', '2026-04-06', '2026-05-14', '2026-05-25', '2026-07-14'):
+        assert np.datetime64(holiday) in holidays
+
+
+def test_business_days_match_numpy():
+    """Index cumulé précalculé : mêmes décomptes que numpy.busday_count, y compris hors plage"""
+    holidays = french_holidays(2020, 2040)
+    full = BusinessCalendar(holidays=holidays)
+    narrow = BusinessCalendar(holidays=holidays, first_date='2028-01-01', last_date='2029-12-31')
+
+    rng = np.random.default_rng(0)
+    start = np.datetime64('2026-01-01') + rng.integers(0, 3000, 20000)
+    end = start + rng.integers(0, 2000, 20000)
+    expected = np.busday_count(start, end, holidays=holidays)
+
+    assert np.array_equal(full.business_days(start, end), expected)
+    assert np.array_equal(narrow.business_days(start, end), expected)
+    # Antisymétrie lorsque la date de fin précède la date de début
+    assert np.array_equal(full.business_days(end, start), -expected)
+    assert np.array_equal(narrow.business_days(end, start), -expected)
+
+    assert full.business_days(date(2026, 1, 1), date(2027, 1, 1)) == 252
+    assert not full.is_business_day(date(2026, 5, 1))
+    assert full.is_business_day(np.array(['2026-05-04', '2026-05-09'], dtype='datetime64[D]')).tolist() == [True, False]
+
+
+def test_year_fraction_conventions():
+    """ACT/365, ACT/360 et BUS/252, heure tronquée"""
+    calendar = BusinessCalendar(holidays=french_holidays(2026, 2027))
+    start, end = datetime(2026, 1, 1, 15, 30), date(2027, 1, 1)
+
+    assert calendar.year_fraction(start, end) == 1.0
+    assert calendar.year_fraction(start, end, 'ACT/360') == pytest.approx(365 / 360)
+    assert calendar.year_fraction(start, end, 'BUS/252') == 1.0
+    assert calendar.year_fraction(end, start, 'BUS/252') == -1.0
+
+    ends = np.array(['2026-07-01', '2027-01-01'], dtype='datetime64[D]')
+    assert np.allclose(calendar.year_fraction('2026-01-01', ends), [181 / 365, 1.0])
+
+    with pytest.raises(ValueError):
+        BusinessCalendar('30/360')
+
+
+def test_calculator_calendar():
+    """Sans calendrier le calcul est inchangé ; avec calendrier, scalaire et vectoriel concordent"""
+    start_date = date.today() + timedelta(days=40)
+    end_date = start_date + timedelta(days=365)
+
+    default = BlackScholesCalculator().calculate_price_hedge(100, start_date, end_date, 0.25, 75)
+    today = datetime.now()
+    assert default['time_to_delivery'] == (datetime.combine(end_date, datetime.min.time()) - today).days / 365.0
+
+    calendar = BusinessCalendar('BUS/252', holidays=french_holidays(2020, 2060))
+    calculator = BlackScholesCalculator(calendar=calendar)
+    result = calculator.calculate_price_hedge(100, start_date, end_date, 0.25, 75)
+    batch = calculator.calculate_price_hedge_batch(100, start_date, end_date, 0.25, [75, 90])
+
+    assert result['time_to_delivery'] == calendar.business_days(date.today(), end_date) / 252
+    assert result['holding_period'] == batch['holding_period']
+    assert result['strike_price'] == pytest.approx(batch['strike_price'][0])
@@ -147,6 +147,207 @@ def test_edge_cases():
     
     print("✅ Tests des cas limites terminés")
 
+def test_batch_and_sweep():
+    """Test du calcul vectorisé et du balayage de sensibilité"""
+    
+    calculator = BlackScholesCalculator()
+    start_date = datetime.now() + timedelta(days=60)
+    end_date = start_date + timedelta(days=90)
+    
+    # Le calcul vectorisé reproduit le calcul scalaire
+    results = calculator.calculate_price_hedge(100, start_date, end_date, 0.25, 80, 0.01)
+    batch = calculator.calculate_price_hedge_batch(100, start_date, end_date, 0.25, 80, 0.01)
+    for key in ['strike_price', 'price_delta', 'call_price', 'put_price', 'call_delta', 'put_delta']:
+        assert abs(results[key] - batch[key]) < 1e-10, key
+    
+    # Grille volatilité × centile de couverture
+    sweep = calculator.sweep_price_hedge(
+        current_price=100,
+        start_date=start_date,
+        end_date=end_date,
+        volatility=np.linspace(0.01, 1.0, 100),
+        coverage_percentile=np.arange(1, 100)
+    )
+    assert sweep['price_delta'].shape == (100, 99)
+    assert list(sweep['axes']) == ['volatility', 'coverage_percentile']
+    # Le delta prix augmente avec le centile de couverture
+    assert np.all(np.diff(sweep['price_delta'], axis=1) > 0)
+    
+    # Contrat échu : résultat invalide
+    expired = calculator.calculate_price_hedge_batch(
+        100, datetime.now() - timedelta(days=10), datetime.now() - timedelta(days=1), 0.2, 95
+    )
+    assert not expired['valid']
+    assert np.isnan(expired['strike_price'])
+
+def test_scenario_greeks():
+    """Test des grecques Monte Carlo calculées sur les tirages des scénarios"""
+    
+    calculator = BlackScholesCalculator()
+    start_date = datetime.now() + timedelta(days=100)
+    end_date = start_date + timedelta(days=300)
+    
+    def greeks(current_price=100.0, volatility=0.3):
+        return calculator.simulate_price_scenarios(
+            current_price, start_date, end_date, volatility, risk_free_rate=0.02,
+            num_scenarios=200000, strike_price=110.0, option_type='put'
+        )['greeks']
+    
+    reference = greeks()
+    for name in ['price', 'delta', 'gamma', 'vega']:
+        assert reference[f'{name}_std_error'] > 0
+    
+    # Les estimateurs concordent avec des différences finies à tirages communs
+    fd_delta = (greeks(101.0)['price'] - greeks(99.0)['price']) / 2.0
+    fd_vega = (greeks(volatility=0.301)['price'] - greeks(volatility=0.299)['price']) / 0.002
+    assert abs(reference['delta'] - fd_delta) < 1e-3
+    assert abs(reference['vega'] - fd_vega) < 1e-2 * abs(fd_vega)
+    
+    # Avec des chocs gaussiens, le gamma rapport de vraisemblance retrouve Black & Scholes
+    rng = np.random.default_rng(0)
+    shocks = rng.standard_normal(1000000)
+    S, K, T, r, sigma = 100.0, 110.0, 0.8, 0.02, 0.3
+    future_prices = S * np.exp((r - 0.5 * sigma**2) * T + sigma * np.sqrt(T) * shocks)
+    normal_greeks = calculator._scenario_greeks(S, K, future_prices, shocks, shocks,
+                                                T, r, sigma, 'call')
+    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+    exact_gamma = np.exp(-0.5 * d1**2) / np.sqrt(2 * np.pi) / (S * sigma * np.sqrt(T))
+    assert abs(normal_greeks['gamma'] - exact_gamma) < 4 * normal_greeks['gamma_std_error']
+    assert abs(normal_greeks['delta'] - calculator.calculate_delta_call(S, K, T, r, sigma)) < 4 * normal_greeks['delta_std_error']
+
+def test_adaptive_scenarios():
+    """Test de la simulation adaptative arrêtée à convergence des centiles"""
+    
+    calculator = BlackScholesCalculator()
+    start_date = datetime.now() + timedelta(days=60)
+    end_date = start_date + timedelta(days=365)
+    
+    coarse = calculator.simulate_price_scenarios_adaptive(
+        100, start_date, end_date, 0.25, percentiles=(95, 99), tolerance=0.02
+    )
+    fine = calculator.simulate_price_scenarios_adaptive(
+        100, start_date, end_date, 0.25, percentiles=(95, 99), tolerance=0.005
+    )
+    
+    for results, tolerance in [(coarse, 0.02), (fine, 0.005)]:
+        assert results['converged']
+        assert results['achieved_tolerance'] <= tolerance
+        assert len(results['future_price']) == results['num_draws']
+        for bounds in results['percentiles'].values():
+            assert bounds['lower'] <= bounds['estimate'] <= bounds['upper']
+    assert fine['num_draws'] > coarse['num_draws']
+    
+    # Le budget de calcul borne le nombre de tirages
+    capped = calculator.simulate_price_scenarios_adaptive(
+        100, start_date, end_date, 0.25, tolerance=1e-6, max_scenarios=100000
+    )
+    assert not capped['converged']
+    assert capped['num_draws'] <= 100000
+    
+    # Le premier lot reproduit la simulation à nombre fixe de scénarios
+    fixed = calculator.simulate_price_scenarios(100, start_date, end_date, 0.25, num_scenarios=10000)
+    first_batch = calculator.simulate_price_scenarios_adaptive(100, start_date, end_date, 0.25,
+                                                               tolerance=1.0)
+    assert np.allclose(fixed['future_price'], first_batch['future_price'])
+    
+    # Rejeu sans budget de temps jusqu'au même nombre de tirages : mêmes scénarios
+    # (export différé de l'application), que la simulation ait convergé ou non
+    timed_out = calculator.simulate_price_scenarios_adaptive(
+        100, start_date, end_date, 0.25, tolerance=1e-6, time_budget=0.0
+    )
+    assert not timed_out['converged']
+    for results, tolerance in [(fine, 0.005), (timed_out, 1e-6)]:
+        replay = calculator.simulate_price_scenarios_adaptive(
+            100, start_date, end_date, 0.25, tolerance=tolerance,
+            time_budget=float('inf'), max_scenarios=results['num_draws'] + 1
+        )
+        assert np.array_equal(replay['shock'], results['shock'])
+
+def test_price_fan():
+    """Test des bandes de centiles des trajectoires simulées"""
+    
+    calculator = BlackScholesCalculator()
+    start_date = datetime.now() + timedelta(days=60)
+    end_date = start_date + timedelta(days=365)
+    
+    fan = calculator.simulate_price_fan(100, start_date, end_date, 0.25,
+                                        num_paths=20000, num_steps=50, chunk_size=4000)
+    bands = np.array([fan['quantiles'][q] for q in (5, 25, 50, 75, 95)])
+    
+    assert bands.shape == (5, 51)
+    assert np.all(bands[:, 0] == 100)
+    # Bandes ordonnées et qui s'élargissent avec le temps
+    assert np.all(np.diff(bands[:, 1:], axis=0) > 0)
+    assert bands[-1, -1] - bands[0, -1] > bands[-1, 10] - bands[0, 10]
+    
+    # À l'horizon, centiles exacts des chocs terminaux tirés (mêmes tirages, par bloc)
+    T = fan['times'][-1]
+    rng = np.random.default_rng(42)
+    shocks = []
+    for _ in range(5):
+        extreme = rng.random(4000) < 1 / 11
+        shocks.append(np.where(extreme, rng.normal(0, 2, 4000), rng.standard_t(3, 4000)))
+        rng.standard_normal((4000, 50))
+    terminal = 100 * np.exp(-0.5 * 0.25**2 * T + 0.25 * np.sqrt(T) * np.concatenate(shocks))
+    expected = np.percentile(terminal, [5, 25, 50, 75, 95])
+    assert np.allclose(bands[:, -1], expected, rtol=1e-3)
+    
+    # Et la distribution est celle du modèle de scénarios (erreur Monte Carlo)
+    rng = np.random.default_rng(1)
+    shocks = np.where(rng.random(1000000) < 1 / 11, rng.normal(0, 2, 1000000),
+                      rng.standard_t(3, 1000000))
+    terminal = 100 * np.exp(-0.5 * 0.25**2 * T + 0.25 * np.sqrt(T) * shocks)
+    expected = np.percentile(terminal, [5, 25, 50, 75, 95])
+    assert np.allclose(bands[:, -1], expected, rtol=0.02)
+    
+    # Contrat échu
+    assert calculator.simulate_price_fan(100, datetime.now() - timedelta(days=10),
+                                         datetime.now() - timedelta(days=1), 0.25) is None
+
+def test_scalar_fast_path():
+    """Chemin scalaire (module math) identique à scipy.stats à 1e-14 près"""
+    import scipy.stats as stats
+    
+    calculator = BlackScholesCalculator()
+    rng = np.random.default_rng(0)
+    for _ in range(2000):
+        S = float(rng.uniform(1, 200))
+        K = float(S * np.exp(rng.normal(0, 0.5)))
+        T, r, sigma = float(rng.uniform(0.01, 5)), float(rng.uniform(-0.01, 0.1)), float(rng.uniform(0.01, 1.5))
+        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+        d2 = d1 - sigma * np.sqrt(T)
+        discounted_strike = K * np.exp(-r * T)
+        expected = {
+            calculator.black_scholes_call: S * stats.norm.cdf(d1) - discounted_strike * stats.norm.cdf(d2),
+            calculator.black_scholes_put: discounted_strike * stats.norm.cdf(-d2) - S * stats.norm.cdf(-d1),
+            calculator.calculate_delta_call: stats.norm.cdf(d1),
+            calculator.calculate_delta_put: stats.norm.cdf(d1) - 1
+        }
+        for function, value in expected.items():
+            result = function(S, K, T, r, sigma)
+            assert isinstance(result, float)
+            assert abs(result - value) <= 1e-14 * max(1.0, S), function.__name__
+    
+    # Tableaux 0-d et prix nul : chemin numpy inchangé
+    assert calculator.black_scholes_call(np.array(100.0), 100.0, 1.0, 0.0, 0.2) == \
+        calculator.black_scholes_call(100.0, 100.0, 1.0, 0.0, 0.2)
+    with np.errstate(divide='ignore'):
+        assert calculator.black_scholes_call(0.0, 100.0, 1.0, 0.0, 0.2) == 0.0
+    
+    # Contrat scalaire : mêmes résultats que le calcul vectorisé
+    start_date = datetime.now() + timedelta(days=60)
+    end_date = start_date + timedelta(days=90)
+    results = calculator.calculate_price_hedge(100.0, start_date, end_date, 0.25, 80.0, 0.01)
+    batch = calculator.calculate_price_hedge_batch(100.0, start_date, end_date, 0.25, 80.0, 0.01)
+    for key in ['strike_price', 'call_price', 'put_price', 'call_delta', 'put_delta']:
+        assert abs(results[key] - batch[key]) <= 1e-14 * 100, key
+    
+    # Période de livraison entamée (holding period négative) : pas d'exception
+    with np.errstate(invalid='ignore'):
+        results = calculator.calculate_price_hedge(100.0, datetime.now() - timedelta(days=30),
+                                                   datetime.now() + timedelta(days=5), 0.25, 80.0)
+    assert results['holding_period'] < 0
+
 if __name__ == "__main__":
     try:
         success = test_black_scholes_calculator()
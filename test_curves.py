@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests des courbes forward et de la structure par terme de volatilité
+"""
+
+import sys
+import os
+from datetime import date, timedelta
+import numpy as np
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+from curves import ForwardCurve, VolTermStructure, _ImmutableCurve
+
+
+def test_forward_curve_lookup():
+    """Forward par fixing et forward moyen pondéré par les jours livrés"""
+    curve = ForwardCurve(['2027-01', '2027-02', '2027-03'], [100.0, 90.0, 80.0])
+
+    assert curve.forward_at(date(2027, 2, 14)) == 90.0
+    assert curve.forward_at(date(2026, 6, 1)) == 100.0
+    assert curve.forward_at(np.array(['2027-01-31', '2027-03-01', '2028-01-01'],
+                                     dtype='datetime64[D]')).tolist() == [100.0, 80.0, 80.0]
+
+    assert curve.forward(date(2027, 2, 1), date(2027, 2, 28)) == pytest.approx(90.0)
+    assert curve.forward(date(2027, 1, 1), date(2027, 2, 28)) == pytest.approx((31 * 100 + 28 * 90) / 59)
+    assert curve.forward(date(2027, 1, 16), date(2027, 3, 10)) == pytest.approx(
+        (16 * 100 + 28 * 90 + 10 * 80) / 54)
+
+    # Vectorisé : une lecture par contrat
+    starts = np.array(['2027-01-01', '2027-02-01', '2026-12-01'], dtype='datetime64[D]')
+    ends = np.array(['2027-01-31', '2027-03-31', '2026-12-31'], dtype='datetime64[D]')
+    assert np.allclose(curve.forward(starts, ends), [100.0, (28 * 90 + 31 * 80) / 59, 100.0])
+
+    with pytest.raises(ValueError):
+        ForwardCurve(['2027-02', '2027-01'], [1.0, 2.0])
+
+
+def test_vol_term_structure_interpolation():
+    """Interpolation linéaire de la variance totale, volatilité plate aux extrémités"""
+    surface = VolTermStructure([0.25, 1.0, 2.0], [0.40, 0.30, 0.28])
+
+    assert surface.volatility(0.1) == 0.40
+    assert surface.volatility(5.0) == 0.28
+    assert surface.volatility(1.0) == pytest.approx(0.30)
+    expected = np.sqrt((0.40**2 * 0.25 + (0.30**2 - 0.40**2 * 0.25) / 0.75 * 0.25) / 0.5)
+    assert surface.volatility(0.5) == pytest.approx(expected)
+    assert surface.volatility(np.array([0.25, 1.5])).shape == (2,)
+
+    with pytest.raises(ValueError):
+        VolTermStructure([0.5, 1.0], [0.5, 0.2])
+
+
+def test_curves_are_immutable_and_hashable():
+    """Égalité et empreinte sur les données : utilisables comme clés de cache"""
+    curve = ForwardCurve(['2027-01', '2027-02'], [100.0, 90.0])
+    same = ForwardCurve(np.array(['2027-01', '2027-02'], dtype='datetime64[M]'), [100, 90])
+    surface = VolTermStructure([1.0], [0.3])
+
+    assert curve == same and hash(curve) == hash(same)
+    assert curve != ForwardCurve(['2027-01', '2027-02'], [100.0, 91.0])
+    assert len({curve: 1, same: 2, surface: 3}) == 2
+
+    with pytest.raises(AttributeError):
+        curve.prices = np.zeros(2)
+    with pytest.raises(ValueError):
+        curve.prices[0] = 0.0
+
+    # Base abstraite : une courbe doit définir ses données (_key)
+    class IncompleteCurve(_ImmutableCurve):
+        __slots__ = ()
+
+    with pytest.raises(TypeError):
+        IncompleteCurve()
+
+
+def test_calculator_accepts_curves():
+    """Courbes acceptées par le calcul scalaire et vectorisé, identiques aux valeurs lues"""
+    calculator = BlackScholesCalculator()
+    today = date.today()
+    months = np.datetime64(today, 'M') + np.arange(24)
+    curve = ForwardCurve(months, 80.0 + np.arange(24))
+    surface = VolTermStructure([0.1, 0.5, 1.0, 2.0], [0.45, 0.35, 0.30, 0.27])
+
+    start_date = today + timedelta(days=60)
+    end_date = start_date + timedelta(days=90)
+    result = calculator.calculate_price_hedge(curve, start_date, end_date, surface, 75)
+    expected = calculator.calculate_price_hedge(
+        curve.forward(start_date, end_date), start_date, end_date,
+        surface.volatility(result['holding_period']), 75)
+    for key in ('current_price', 'volatility', 'strike_price', 'call_price', 'put_delta'):
+        assert result[key] == expected[key]
+
+    starts = np.datetime64(start_date, 'D') + np.arange(0, 300, 30)
+    ends = starts + 90
+    batch = calculator.calculate_price_hedge_batch(curve, starts, ends, surface, 75)
+    assert np.allclose(batch['current_price'], curve.forward(starts, ends))
+    assert np.allclose(batch['volatility'], surface.volatility(batch['holding_period']))
+    assert batch['strike_price'][0] == pytest.approx(result['strike_price'])
+
+    sweep = calculator.sweep_price_hedge(curve, start_date, end_date, surface,
+                                         coverage_percentile=np.arange(1, 100))
+    assert sweep['strike_price'].shape == (99,)
+    assert sweep['strike_price'][74] == pytest.approx(result['strike_price'])
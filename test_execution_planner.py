@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests du planificateur d'exécution sous budget mémoire
+"""
+
+import sys
+import os
+import tracemalloc
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+from execution_planner import (estimate_footprint, main, measure_peak_memory, plan_execution,
+                               run_book_scenarios, run_hedge_batch)
+
+
+def test_plan_fits_budget():
+    """Le plan tient dans le budget et couvre tous les éléments"""
+    budget = 64 * 2**20
+    plan = plan_execution('book_scenarios', 2000, 55000, memory_budget=budget, max_workers=4)
+
+    assert plan['estimated_bytes'] == estimate_footprint('book_scenarios', 2000, 55000)
+    assert plan['estimated_bytes'] > budget
+    assert plan['planned_peak_bytes'] <= budget
+    assert plan['chunk_scenarios'] == 55000  # lignes de scénarios complètes
+    assert plan['num_chunks'] * plan['chunk_contracts'] >= 2000
+    assert 1 <= plan['num_workers'] <= 4
+
+    # Petit calcul : un seul bloc et un seul thread
+    small = plan_execution('hedge_batch', 10, memory_budget=budget, max_workers=4)
+    assert (small['num_chunks'], small['num_workers']) == (1, 1)
+
+
+def test_plan_errors():
+    """Budget insuffisant ou type de calcul inconnu"""
+    with pytest.raises(ValueError):
+        plan_execution('hedge_batch', 10**6, memory_budget=2**20)
+    with pytest.raises(ValueError):
+        plan_execution('inconnu', 10)
+
+
+def test_cli_budget_too_small(capsys):
+    """Budget insuffisant en ligne de commande : message d'erreur et code de retour non nul"""
+    assert main(['--contracts', '1000000', '--scenarios', '0', '--budget-mb', '1']) == 1
+    assert 'Budget mémoire insuffisant' in capsys.readouterr().err
+
+
+def test_nested_peak_measurement():
+    """Une mesure imbriquée ne remet pas à zéro le pic d'une mesure englobante"""
+    with measure_peak_memory() as outer:
+        block = np.ones(2**20)
+        del block
+        with measure_peak_memory() as inner:
+            pass
+        assert tracemalloc.is_tracing()
+    assert inner['peak_bytes'] is not None
+    assert outer['peak_bytes'] >= 8 * 2**20
+
+
+def test_default_budget_read_at_call_time(monkeypatch):
+    """Le budget par défaut suit DELTAP_MEMORY_BUDGET_MB au moment de l'appel"""
+    monkeypatch.setenv('DELTAP_MEMORY_BUDGET_MB', '64')
+    assert plan_execution('hedge_batch', 10)['memory_budget'] == 64 * 2**20
+    monkeypatch.setenv('DELTAP_MEMORY_BUDGET_MB', '1')
+    with pytest.raises(ValueError):
+        plan_execution('hedge_batch', 10**6)
+
+
+def test_run_hedge_batch_matches_batch():
+    """Le calcul par blocs donne les résultats du calcul en un appel"""
+    calculator = BlackScholesCalculator()
+    rng = np.random.default_rng(0)
+    start_date = np.datetime64(date.today() + timedelta(days=30)) + rng.integers(0, 300, 5000)
+    end_date = start_date + 90
+    end_date[:10] = np.datetime64(date.today() - timedelta(days=1))  # contrats échus
+    volatility = rng.uniform(0.1, 0.5, 5000)
+
+    results = run_hedge_batch(calculator, 100.0, start_date, end_date, volatility, 80.0,
+                              memory_budget=2**20)
+    expected = calculator.calculate_price_hedge_batch(100.0, start_date, end_date, volatility, 80.0)
+
+    execution = results['execution']
+    assert execution['plan']['num_chunks'] > 1
+    assert execution['peak_bytes'] > 0
+    for key in ('strike_price', 'price_delta', 'call_price', 'put_delta', 'valid'):
+        assert results[key].shape == (5000,)
+        np.testing.assert_allclose(results[key], expected[key], equal_nan=True)
+
+
+def test_book_scenarios_single_contract():
+    """Un seul contrat : mêmes scénarios que simulate_price_scenarios"""
+    calculator = BlackScholesCalculator()
+    start_date = date.today() + timedelta(days=30)
+    end_date = start_date + timedelta(days=90)
+
+    book = run_book_scenarios(calculator, 100.0, start_date, end_date, 0.3, num_scenarios=10000)
+    scenarios = calculator.simulate_price_scenarios(100.0, start_date, end_date, 0.3,
+                                                    num_scenarios=10000)
+
+    assert book['num_draws'] == len(scenarios['price_delta'])
+    np.testing.assert_allclose(book['portfolio_delta'], scenarios['price_delta'], atol=1e-9)
+    assert book['mean_delta'] == pytest.approx(np.mean(scenarios['price_delta']))
+    assert book['std_delta'] == pytest.approx(np.std(scenarios['price_delta']))
+
+
+def test_book_scenarios_chunked_reduction():
+    """Blocs découpés en scénarios : réduction identique au calcul complet"""
+    calculator = BlackScholesCalculator()
+    rng = np.random.default_rng(1)
+    current_price = rng.uniform(50, 150, 30)
+    volatility = rng.uniform(0.1, 0.5, 30)
+    volumes = rng.uniform(-10, 10, 30)
+    start_date = np.datetime64(date.today() + timedelta(days=30)) + np.arange(30)
+    end_date = start_date + 90
+    end_date[0] = np.datetime64(date.today() - timedelta(days=1))  # contrat échu
+
+    book = run_book_scenarios(calculator, current_price, start_date, end_date, volatility,
+                              volumes=volumes, num_scenarios=1000, memory_budget=60000)
+    plan = book['execution']['plan']
+    assert plan['chunk_scenarios'] < book['num_draws']
+    assert book['execution']['within_budget']
+
+    deltas = np.array([
+        calculator.simulate_price_scenarios(current_price[i], start_date[i].item(),
+                                            end_date[i].item(), volatility[i],
+                                            num_scenarios=1000)['price_delta']
+        for i in range(1, 30)
+    ])
+    np.testing.assert_allclose(book['mean_delta'][1:], deltas.mean(axis=1))
+    np.testing.assert_allclose(book['std_delta'][1:], deltas.std(axis=1))
+    np.testing.assert_allclose(book['portfolio_delta'], volumes[1:] @ deltas)
+    assert not book['valid'][0] and np.isnan(book['mean_delta'][0])
+    assert book['portfolio_percentiles'][99] == pytest.approx(
+        np.percentile(volumes[1:] @ deltas, 99))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests de la recherche du centile de couverture
+"""
+
+import sys
+import os
+from datetime import date, timedelta
+import numpy as np
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+from hedge_optimizer import (TARGET_METRICS, solve_book_coverage_percentile,
+                             solve_coverage_percentile)
+
+
+def make_book(size, seed=0):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64(date.today(), 'D') + rng.integers(10, 700, size)
+    end = start + rng.integers(30, 365, size)
+    volatility = rng.uniform(0.05, 0.8, size)
+    return start, end, volatility, rng.uniform(5, 95, size)
+
+
+@pytest.mark.parametrize('metric', TARGET_METRICS)
+def test_recovers_percentile(metric):
+    """Le centile qui a produit une grandeur est retrouvé contrat par contrat"""
+    calculator = BlackScholesCalculator()
+    start, end, volatility, percentiles = make_book(500)
+    expected = calculator.calculate_price_hedge_batch(100.0, start, end, volatility, percentiles)
+
+    solution = solve_coverage_percentile(calculator, 100.0, start, end, volatility,
+                                         expected[metric], metric=metric)
+
+    assert solution['converged'].all()
+    assert np.allclose(solution['coverage_percentile'], percentiles, atol=1e-5)
+    assert np.allclose(solution[metric], expected[metric], atol=1e-7)
+
+
+def test_unreachable_and_expired_targets():
+    """Objectif hors d'atteinte ou contrat échu : centile NaN, non atteignable"""
+    calculator = BlackScholesCalculator()
+    start = np.array([date.today() + timedelta(days=60)] * 2 + [date.today() - timedelta(days=60)],
+                     dtype='datetime64[D]')
+    end = start + 90
+
+    solution = solve_coverage_percentile(calculator, 100.0, start, end, 0.25,
+                                         [5.0, 200.0, 5.0], metric='call_price')
+
+    assert solution['feasible'].tolist() == [True, False, False]
+    assert np.isfinite(solution['coverage_percentile'][0])
+    assert np.isnan(solution['coverage_percentile'][1:]).all()
+    assert solution['call_price'][0] == pytest.approx(5.0, abs=1e-7)
+
+
+def test_book_budget():
+    """Centile commun : la prime totale du portefeuille égale le budget"""
+    calculator = BlackScholesCalculator()
+    start, end, volatility, _ = make_book(1000)
+    quantities = np.linspace(1, 3, 1000)
+
+    solution = solve_book_coverage_percentile(calculator, 100.0, start, end, volatility,
+                                              budget=20000.0, quantities=quantities)
+    premiums = calculator.calculate_price_hedge_batch(
+        100.0, start, end, volatility, solution['coverage_percentile'])['call_price']
+
+    assert solution['converged']
+    assert np.sum(quantities * premiums) == pytest.approx(20000.0, abs=1e-5)
+    assert solution['contracts']['call_price'].shape == (1000,)
+
+    assert not solve_book_coverage_percentile(calculator, 100.0, start, end, volatility,
+                                              budget=1e9)['feasible']
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests du stockage SQLite des couvertures
+"""
+
+import sys
+import os
+import sqlite3
+from datetime import date, datetime, timedelta
+
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+from business_calendar import BusinessCalendar
+from curves import ForwardCurve, VolTermStructure
+from hedge_store import SCHEMA, HedgeStore, parameters_hash
+
+
+START_DATE = date.today() + timedelta(days=60)
+END_DATE = START_DATE + timedelta(days=90)
+
+
+def test_parameters_hash_is_normalized():
+    """L'empreinte ne dépend ni du type des dates ni des erreurs d'arrondi flottant"""
+    first = parameters_hash('hedge', current_price=0.1 + 0.2, start_date=START_DATE)
+    second = parameters_hash('hedge', current_price=0.3,
+                             start_date=datetime.combine(START_DATE, datetime.min.time()))
+    assert first == second
+    assert first != parameters_hash('scenarios', current_price=0.3, start_date=START_DATE)
+
+
+def test_warm_start_lookup(tmp_path):
+    """Une couverture déjà calculée le jour même est servie depuis le disque"""
+    calculator = BlackScholesCalculator()
+    with HedgeStore(str(tmp_path / 'hedges.db')) as store:
+        computed = store.get_or_compute_hedge(calculator, 100.0, START_DATE, END_DATE, 0.25, 75.0)
+        stored = store.get_hedge(100, START_DATE, END_DATE, 0.25, 75, calculator=calculator)
+
+    assert stored is not None
+    assert stored['strike_price'] == computed['strike_price']
+    assert stored['as_of_date'] == date.today()
+
+
+
+def test_cache_key_covers_calculator_and_curves():
+    """Calendrier, backend et courbes font partie de l'empreinte ; le reste est refusé"""
+    calendar_days = BlackScholesCalculator(backend='numpy')
+    business_days = BlackScholesCalculator(backend='numpy',
+                                           calendar=BusinessCalendar('BUS/252'))
+    forward = ForwardCurve(['2020-01', '2040-01'], [100.0, 110.0])
+    volatility = VolTermStructure([0.5, 1.0], [0.3, 0.25])
+
+    with HedgeStore() as store:
+        first = store.get_or_compute_hedge(calendar_days, 100.0, START_DATE, END_DATE, 0.25, 75.0)
+        other = store.get_or_compute_hedge(business_days, 100.0, START_DATE, END_DATE, 0.25, 75.0)
+        assert other['holding_period'] != first['holding_period']
+        assert store.get_hedge(100.0, START_DATE, END_DATE, 0.25, 75.0,
+                               calculator=business_days)['holding_period'] == other['holding_period']
+
+        from_curves = store.get_or_compute_hedge(calendar_days, forward, START_DATE, END_DATE,
+                                                 volatility, 75.0, contract_id='curves')
+        cached = store.get_or_compute_hedge(
+            calendar_days, ForwardCurve(['2020-01', '2040-01'], [100.0, 110.0]),
+            START_DATE, END_DATE, volatility, 75.0)
+        assert cached['contract_id'] == 'curves'
+        assert cached['strike_price'] == from_curves['strike_price']
+
+        with pytest.raises(TypeError, match='volatility'):
+            store.get_or_compute_hedge(calendar_days, 100.0, START_DATE, END_DATE,
+                                       {'tenor': 0.25}, 75.0)
+
+
+def test_bulk_insert_and_history():
+    """Enregistrement groupé sur plusieurs jours et historique d'un contrat"""
+    calculator = BlackScholesCalculator()
+    results = [calculator.calculate_price_hedge(100.0 + i, START_DATE, END_DATE, 0.25, 75.0)
+               for i in range(5)]
+
+    with HedgeStore() as store:
+        for days_ago in range(120):
+            as_of_date = date.today() - timedelta(days=days_ago)
+            assert store.record_hedges(results, as_of_date=as_of_date,
+                                       contract_ids=['C1'] * 5) == 5
+
+        history = store.hedge_history('C1', days=90)
+        assert len(history) == 91 * 5
+        assert history[0]['as_of_date'] == date.today() - timedelta(days=90)
+        assert store.hedge_history('C2') == []
+
+
+def test_scenario_summary_round_trip():
+    """Résumé statistique d'un jeu de scénarios"""
+    with HedgeStore() as store:
+        store.record_scenario_summary(100, START_DATE, END_DATE, 0.25, 0.0, 4,
+                                      [90.0, 100.0, 110.0, 120.0])
+        summary = store.get_scenario_summary(100, START_DATE, END_DATE, 0.25, 0.0, 4)
+        assert summary['mean'] == 105.0
+        assert summary['percentiles'][50] == 105.0
+        assert store.get_scenario_summary(100, START_DATE, END_DATE, 0.25, 0.0, 5) is None
+
+
+def test_migrates_version_1_schema(tmp_path):
+    """Une base v1 (unicité par paramètres) est reconstruite avec l'unicité par contrat"""
+    path = str(tmp_path / 'hedges_v1.db')
+    calculator = BlackScholesCalculator()
+    result = calculator.calculate_price_hedge(100.0, START_DATE, END_DATE, 0.25, 75.0)
+    with HedgeStore() as store:
+        row = store._hedge_row(result, None, 'A', 'legacy')
+    with sqlite3.connect(path) as connection:
+        connection.executescript(SCHEMA.replace(
+            'UNIQUE (contract_id, param_hash, as_of_date)', 'UNIQUE (param_hash, as_of_date)'))
+        connection.execute(f"INSERT INTO hedges ({', '.join(row)}) "
+                           f"VALUES ({', '.join(':' + column for column in row)})", row)
+
+    with HedgeStore(path) as store:
+        assert store._connection.execute('PRAGMA user_version').fetchone()[0] == 2
+        assert [row['contract_id'] for row in store.hedge_history('A')] == ['A']
+        store.record_hedges([result], contract_ids=['B'])
+        assert len(store.hedge_history('A')) == 1 and len(store.hedge_history('B')) == 1
+
+    with sqlite3.connect(path) as connection:
+        connection.execute('PRAGMA user_version = 99')
+    with pytest.raises(ValueError):
+        HedgeStore(path)
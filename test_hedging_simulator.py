@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests du simulateur de couverture en delta
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+import numpy as np
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+from hedging_simulator import simulate_delta_hedging
+
+
+def test_hedging_error_shrinks_with_rebalancing():
+    """L'erreur de couverture est centrée et diminue avec la fréquence de rééquilibrage"""
+    monthly = simulate_delta_hedging(100, 100, 1.0, 0.2, 0.02, num_paths=20000, num_steps=12)
+    daily = simulate_delta_hedging(100, 100, 1.0, 0.2, 0.02, num_paths=20000, num_steps=365)
+
+    assert abs(daily['mean_error']) < 0.05
+    assert daily['tracking_error'] < monthly['tracking_error'] / 3
+    assert daily['hedging_error'].shape == (20000,)
+
+
+def test_chunking_does_not_change_results():
+    """Les résultats sont indépendants de la taille des blocs"""
+    reference = simulate_delta_hedging(100, 95, 0.5, 0.3, option_type='put',
+                                       num_paths=5000, num_steps=50)
+    chunked = simulate_delta_hedging(100, 95, 0.5, 0.3, option_type='put',
+                                     num_paths=5000, num_steps=50, chunk_size=777)
+    assert np.allclose(reference['hedging_error'], chunked['hedging_error'])
+
+
+def test_transaction_costs_reduce_pnl():
+    """Les frais de transaction dégradent l'erreur de couverture moyenne"""
+    without_costs = simulate_delta_hedging(100, 100, 1.0, 0.2, num_paths=5000, num_steps=52)
+    with_costs = simulate_delta_hedging(100, 100, 1.0, 0.2, num_paths=5000, num_steps=52,
+                                        transaction_cost=0.001)
+    assert with_costs['mean_transaction_cost'] > 0
+    assert with_costs['mean_error'] < without_costs['mean_error']
+
+
+def test_calculator_hedging_error():
+    """Simulation sur le strike et la holding period d'un contrat"""
+    calculator = BlackScholesCalculator()
+    start_date = datetime.now() + timedelta(days=60)
+    results = calculator.simulate_hedging_error(
+        current_price=100, start_date=start_date, end_date=start_date + timedelta(days=60),
+        volatility=0.25, coverage_percentile=75, num_paths=2000
+    )
+    assert 'error' not in results
+    assert results['num_steps'] == 89
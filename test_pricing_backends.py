@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests des backends de calcul (numpy / numba)
+"""
+
+import sys
+import os
+
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pricing_backends
+from pricing_backends import available_backends, compare_backends, get_backend
+
+
+def test_backend_selection(monkeypatch):
+    """Sélection explicite, par variable d'environnement et rejet des noms inconnus"""
+    assert get_backend('numpy').name == 'numpy'
+
+    monkeypatch.setenv('DELTAP_BACKEND', 'numpy')
+    assert get_backend().name == 'numpy'
+
+    backend = get_backend('numpy')
+    assert get_backend(backend) is backend
+
+    with pytest.raises(ValueError):
+        get_backend('fortran')
+
+
+def test_auto_falls_back_to_numpy(monkeypatch):
+    """Sans numba, 'auto' retombe sur le backend numpy"""
+    monkeypatch.setattr(pricing_backends, 'numba', None)
+    assert get_backend('auto').name == 'numpy'
+    with pytest.raises(ImportError):
+        get_backend('numba')
+
+
+@pytest.mark.skipif('numba' not in available_backends(), reason="numba non installé")
+def test_numba_backend_agrees_with_numpy():
+    """Contrôle différentiel : les backends concordent à 1e-12"""
+    differences = compare_backends('numpy', 'numba', num_samples=20000)
+    for kernel, difference in differences.items():
+        assert difference < 1e-12, kernel
+
+
+@pytest.mark.skipif('numba' not in available_backends(), reason="numba non installé")
+def test_numba_concurrent_calls():
+    """Appels concurrents depuis plusieurs threads, sérialisés seulement sous workqueue"""
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+
+    backend = get_backend('numba')
+    assert pricing_backends.configure_numba() == backend.threading_layer
+    assert (backend._serialized is pricing_backends.NumbaBackend._lock) == \
+        (backend.threading_layer == 'workqueue')
+    assert not pricing_backends._threadsafe('workqueue')
+
+    S = np.linspace(50.0, 150.0, 10000)
+    expected = get_backend('numpy').call_price(S, 100.0, 0.5, 0.01, 0.3)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: backend.call_price(S, 100.0, 0.5, 0.01, 0.3), range(8)))
+    for result in results:
+        np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+
+@pytest.mark.skipif('numba' not in available_backends(), reason="numba non installé")
+def test_numba_loops_compiled_once():
+    """Une seule spécialisation par boucle, entrées en lecture seule comprises"""
+    import numpy as np
+
+    backend = get_backend('numba')
+    S = np.linspace(50.0, 150.0, 100)
+    read_only = np.broadcast_to(np.float64(0.3), (100,))
+    frozen = S.copy()
+    frozen.flags.writeable = False
+
+    np.testing.assert_allclose(backend.put_delta(frozen, 100.0, 0.5, 0.01, read_only),
+                               get_backend('numpy').put_delta(S, 100.0, 0.5, 0.01, 0.3),
+                               rtol=1e-12)
+    for loop in (pricing_backends._call_price_loop, pricing_backends._put_price_loop,
+                 pricing_backends._call_delta_loop, pricing_backends._put_delta_loop,
+                 pricing_backends._scenario_prices_loop):
+        assert len(loop.signatures) == 1
+    # Les boucles sont compilées après le choix de la couche de threads
+    assert pricing_backends.numba.threading_layer() == backend.threading_layer
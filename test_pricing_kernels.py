@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests des noyaux de pricing vectorisés
+"""
+
+import sys
+import os
+import numpy as np
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+import pricing_kernels
+
+
+def test_kernels_match_scalar_methods():
+    """Les noyaux vectorisés reproduisent les méthodes scalaires, cas limites inclus"""
+    calculator = BlackScholesCalculator()
+    cases = [
+        (100, 100, 1, 0.05, 0.2),
+        (100, 120, 0.5, 0.0, 0.3),
+        (100, 90, 0, 0.01, 0.2),
+        (100, 110, 1, 0.01, 0.0),
+    ]
+
+    S, K, T, r, sigma = (np.array(column, dtype=float) for column in zip(*cases))
+    call_prices = pricing_kernels.call_price(S, K, T, r, sigma)
+    put_prices = pricing_kernels.put_price(S, K, T, r, sigma)
+    call_deltas = pricing_kernels.call_delta(S, K, T, r, sigma)
+    put_deltas = pricing_kernels.put_delta(S, K, T, r, sigma)
+
+    for i, case in enumerate(cases):
+        assert abs(call_prices[i] - calculator.black_scholes_call(*case)) < 1e-12
+        assert abs(put_prices[i] - calculator.black_scholes_put(*case)) < 1e-12
+        assert abs(call_deltas[i] - calculator.calculate_delta_call(*case)) < 1e-12
+        assert abs(put_deltas[i] - calculator.calculate_delta_put(*case)) < 1e-12
+
+
+def test_kernels_broadcast():
+    """Les paramètres scalaires sont diffusés sur la matrice des prix"""
+    S = np.full((3, 4), 100.0)
+    deltas = pricing_kernels.call_delta(S, 100.0, np.linspace(1.0, 0.25, 4), 0.0, 0.2)
+    assert deltas.shape == (3, 4)
+    assert np.isscalar(pricing_kernels.call_price(100, 100, 1, 0.0, 0.2))
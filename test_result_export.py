@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests de l'export Arrow/Parquet des couvertures et des scénarios
+"""
+
+import sys
+import os
+import io
+from datetime import date, timedelta
+import numpy as np
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import result_export
+from black_scholes_calculator import BlackScholesCalculator
+from result_export import export_hedge, export_scenarios, hedge_table, read_metadata
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq
+
+
+def contract_dates():
+    start_date = date.today() + timedelta(days=30)
+    return start_date, start_date + timedelta(days=365)
+
+
+def test_hedge_export_round_trip():
+    """Couverture scalaire et vectorisée : une ligne par contrat, valeurs identiques"""
+    calculator = BlackScholesCalculator()
+    start_date, end_date = contract_dates()
+
+    results = calculator.calculate_price_hedge(100, start_date, end_date, 0.25, 75)
+    table = pq.read_table(io.BytesIO(export_hedge(results)))
+    assert table.num_rows == 1
+    assert table['strike_price'][0].as_py() == results['strike_price']
+    assert table['start_date'][0].as_py().date() == start_date
+    assert read_metadata(table.schema)['kind'] == 'hedge'
+
+    batch = calculator.calculate_price_hedge_batch(100, start_date, end_date,
+                                                   np.array([0.2, 0.3]), np.array([[50], [75], [90]]))
+    reader = pa.ipc.open_file(pa.BufferReader(export_hedge(batch, format='arrow', float32=True)))
+    table = reader.read_all()
+    assert table.num_rows == 6
+    assert table.schema.field('call_price').type == pa.float32()
+    assert np.allclose(table['call_price'].to_numpy(), batch['call_price'].ravel(), rtol=1e-6)
+    assert table['valid'].to_pylist() == [True] * 6
+
+    # Colonnes float64 contiguës reprises sans copie
+    column = hedge_table(batch)['strike_price'].chunk(0)
+    assert np.shares_memory(column.to_numpy(), batch['strike_price'])
+
+    with pytest.raises(ValueError):
+        export_hedge({'error': 'contrat échu'})
+    with pytest.raises(ValueError):
+        export_hedge(results, format='csv')
+
+
+def test_scenarios_written_in_row_groups(tmp_path):
+    """Scénarios écrits par groupes de lignes, métadonnées et compression"""
+    calculator = BlackScholesCalculator()
+    start_date, end_date = contract_dates()
+    scenarios = calculator.simulate_price_scenarios(100, start_date, end_date, 0.25,
+                                                    num_scenarios=100000)
+    size = len(scenarios['future_price'])
+
+    path = tmp_path / 'scenarios.parquet'
+    export_scenarios(scenarios, path, row_group_size=25000, compression='zstd',
+                     metadata={'current_price': 100.0, 'start_date': start_date})
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_rows == size
+    assert parquet.num_row_groups == -(-size // 25000)
+    assert read_metadata(parquet.schema_arrow) == {'current_price': 100.0,
+                                                   'start_date': str(start_date),
+                                                   'kind': 'scenarios'}
+    table = parquet.read()
+    for name in ('future_price', 'price_delta', 'shock'):
+        assert np.array_equal(table[name].to_numpy(), scenarios[name])
+
+    data = export_scenarios(scenarios, format='arrow', float32=True, compression='lz4',
+                            row_group_size=30000)
+    reader = pa.ipc.open_file(pa.BufferReader(data))
+    assert reader.num_record_batches == -(-size // 30000)
+    assert reader.schema.field('shock').type == pa.float32()
+
+    with pytest.raises(TypeError):
+        export_scenarios(calculator.calculate_price_scenarios(100, start_date, end_date, 0.25,
+                                                              num_scenarios=10))
+
+
+def test_missing_pyarrow(monkeypatch):
+    """Sans pyarrow, l'export lève une ImportError explicite"""
+    monkeypatch.setattr(result_export, 'pa', None)
+    with pytest.raises(ImportError, match="pyarrow"):
+        export_scenarios({'future_price': np.zeros(3)})
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Tests de la déduplication des calculs identiques en cours (single-flight)
+"""
+
+import sys
+import os
+import functools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from background_jobs import JobCancelled, JobContext, submit_job
+from black_scholes_calculator import BlackScholesCalculator
+from single_flight import DeduplicatedCalculator, SingleFlight, call_key
+
+
+def run_concurrently(function, count):
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(function) for _ in range(count)]
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_calls_share_one_computation():
+    """Appels concurrents de même clé : un seul calcul, même résultat pour tous"""
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {'value': 42}
+
+    def request():
+        return flight.do('cle', compute)
+
+    threading.Timer(0.2, release.set).start()
+    results = run_concurrently(request, 8)
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.statistics == {'started': 1, 'shared': 7}
+    assert flight.in_flight() == 0
+
+    # Calcul terminé : la clé est oubliée, un nouvel appel relance le calcul
+    release.set()
+    flight.do('cle', compute)
+    assert len(calls) == 2
+
+
+def test_errors_and_timeouts_propagate():
+    """Exception du calcul propagée à tous les demandeurs ; attente bornée par timeout"""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("marché fermé")
+
+    threading.Timer(0.2, release.set).start()
+    errors = run_concurrently(lambda: flight.do('erreur', failing), 4)
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert flight.statistics['started'] == 1
+
+    slow_release = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        leader = executor.submit(flight.do, 'lent', lambda: slow_release.wait(5) and 'fini')
+        while flight.in_flight() == 0:
+            time.sleep(0.01)
+        with pytest.raises(TimeoutError):
+            flight.do('lent', lambda: 'doublon', timeout=0.05)
+        slow_release.set()
+        assert leader.result(timeout=5) == 'fini'
+
+
+def test_deduplicated_calculator():
+    """Même calcul de scénarios demandé simultanément : exécuté une seule fois"""
+    class CountingCalculator(BlackScholesCalculator):
+        def __init__(self):
+            super().__init__()
+            self.calls = 0
+
+        @functools.wraps(BlackScholesCalculator.simulate_price_scenarios)
+        def simulate_price_scenarios(self, *args, **kwargs):
+            self.calls += 1
+            time.sleep(0.2)
+            return super().simulate_price_scenarios(*args, **kwargs)
+
+    calculator = CountingCalculator()
+    shared = DeduplicatedCalculator(calculator)
+    start_date = date.today() + timedelta(days=30)
+    end_date = start_date + timedelta(days=180)
+
+    # Arguments positionnels, nommés ou valeurs par défaut : même clé normalisée
+    requests = [lambda: shared.simulate_price_scenarios(100.0, start_date, end_date, 0.25),
+                lambda: shared.simulate_price_scenarios(100, start_date, end_date, 0.25, 0.0),
+                lambda: shared.simulate_price_scenarios(current_price=100.0, start_date=start_date,
+                                                        end_date=end_date, volatility=0.25)]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = [future.result() for future in [executor.submit(request) for request in requests]]
+    assert calculator.calls == 1
+    assert all(result is results[0] for result in results)
+
+    # Autres attributs transmis tels quels
+    assert shared.backend is calculator.backend
+    assert call_key('a', x=np.arange(3)) == call_key('a', x=np.arange(3))
+    assert call_key('a', x=0.1 + 0.2) == call_key('a', x=0.3)
+
+
+def test_shared_background_job():
+    """Tâche de fond partagée : annulée seulement quand tous les demandeurs l'ont annulée"""
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def compute(context):
+        started.set()
+        while True:
+            context.check_cancelled()
+            time.sleep(0.01)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = submit_job(executor, 'scenarios', compute, flight=flight)
+        second = submit_job(executor, 'scenarios', compute, flight=flight)
+        assert first.future is second.future
+        started.wait(5)
+
+        first.cancel()
+        assert first.cancelled() and not second.cancelled()
+        time.sleep(0.05)
+        assert not second.done()
+
+        second.cancel()
+        assert second.cancelled()
+        with pytest.raises(Exception):
+            second.result(timeout=5)
+
+
+def test_progress_callbacks_are_shared():
+    """Appels identiques avec des fonctions de rappel différentes : un calcul, progression diffusée"""
+    class CountingCalculator(BlackScholesCalculator):
+        def __init__(self):
+            super().__init__()
+            self.calls = 0
+
+        @functools.wraps(BlackScholesCalculator.simulate_price_scenarios_adaptive)
+        def simulate_price_scenarios_adaptive(self, *args, **kwargs):
+            self.calls += 1
+            time.sleep(0.2)
+            return super().simulate_price_scenarios_adaptive(*args, **kwargs)
+
+    calculator = CountingCalculator()
+    shared = DeduplicatedCalculator(calculator)
+    start_date = date.today() + timedelta(days=30)
+    end_date = start_date + timedelta(days=180)
+    progress = {'first': [], 'second': []}
+
+    def request(name):
+        return shared.simulate_price_scenarios_adaptive(
+            100.0, start_date, end_date, 0.25, tolerance=0.02,
+            callback=lambda num_draws, tolerance: progress[name].append(num_draws))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(request, name) for name in progress]
+        results = [future.result(timeout=30) for future in futures]
+    assert calculator.calls == 1
+    assert results[0] is results[1]
+    assert progress['first'] and progress['first'] == progress['second']
+    assert shared.flight._listeners == {}
+
+
+def test_start_runs_outside_the_lock():
+    """Un démarrage lent ne bloque pas les autres clés ; la même clé attend et partage"""
+    flight = SingleFlight()
+    starting = threading.Event()
+    release = threading.Event()
+
+    def slow_start():
+        starting.set()
+        release.wait(5)
+        future = Future()
+        future.set_running_or_notify_cancel()
+        return future
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.join, 'lente', slow_start)
+        starting.wait(5)
+        other = flight.join('autre', Future)
+        assert flight.in_flight() == 2
+
+        follower = executor.submit(flight.join, 'lente', Future)
+        time.sleep(0.05)
+        assert not follower.done()
+        release.set()
+        assert follower.result(timeout=5) is leader.result(timeout=5)
+    assert flight.statistics == {'started': 2, 'shared': 1}
+    other.set_result(None)
+    leader.result().set_result(None)
+    assert flight.in_flight() == 0
+
+    # Échec du démarrage : la clé est libérée, l'erreur propagée
+    def failing_start():
+        raise RuntimeError("refus")
+
+    with pytest.raises(RuntimeError):
+        flight.join('erreur', failing_start)
+    assert flight.in_flight() == 0
+
+
+def test_failing_progress_callback_does_not_stop_shared_call():
+    """Fonction de rappel d'une tâche annulée : désabonnée, le calcul partagé se poursuit"""
+    class SlowCalculator(BlackScholesCalculator):
+        @functools.wraps(BlackScholesCalculator.simulate_price_scenarios_adaptive)
+        def simulate_price_scenarios_adaptive(self, *args, **kwargs):
+            time.sleep(0.2)
+            return super().simulate_price_scenarios_adaptive(*args, **kwargs)
+
+    flight = SingleFlight()
+    shared = DeduplicatedCalculator(SlowCalculator(), flight)
+    start_date = date.today() + timedelta(days=30)
+    end_date = start_date + timedelta(days=180)
+    cancelled, running = JobContext(), JobContext()
+    cancelled.cancel()
+
+    def request(context):
+        return shared.simulate_price_scenarios_adaptive(
+            100.0, start_date, end_date, 0.25, tolerance=0.01,
+            callback=lambda num_draws, tolerance: context.report_progress(0.5, f"{num_draws}"))
+
+    with pytest.raises(JobCancelled):
+        cancelled.report_progress(0.0)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(request, context) for context in (cancelled, running)]
+        results = [future.result(timeout=30) for future in futures]
+
+    assert results[0] is results[1] and results[0]['num_draws'] > 0
+    assert flight.statistics['started'] == 1
+    assert running.message  # progression reçue par le demandeur non annulé
+    assert flight._listeners == {}
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests du mode flux de prix spot
+"""
+
+import sys
+import os
+import asyncio
+from datetime import date, timedelta
+import numpy as np
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+from spot_stream import (SpotStreamHedger, file_ticks, parse_tick, queue_ticks,
+                         socket_ticks, stream_hedges)
+
+
+def make_contracts():
+    today = date.today()
+    return [
+        {'contract_id': index,
+         'start_date': today + timedelta(days=30 + 20 * index),
+         'end_date': today + timedelta(days=200 + 20 * index),
+         'coverage_percentile': 60.0 + 5 * index,
+         'volatility': 0.2 + 0.05 * index,
+         'risk_free_rate': 0.02,
+         'underlying': 'GAS' if index % 2 else 'POWER',
+         'strike_price': 105.0 if index == 4 else None}
+        for index in range(6)
+    ]
+
+
+def test_updates_match_full_calculation():
+    """Valeurs mises à jour au tick identiques à calculate_price_hedge"""
+    calculator = BlackScholesCalculator()
+    contracts = make_contracts()
+    hedger = SpotStreamHedger(calculator, contracts)
+
+    updated = hedger.update('POWER', 102.5)
+    assert sorted(updated.tolist()) == [0, 2, 4]
+    assert np.isnan(hedger.state['call_price'][1])
+
+    for index in (0, 2):
+        contract = contracts[index]
+        expected = calculator.calculate_price_hedge(
+            102.5, contract['start_date'], contract['end_date'], contract['volatility'],
+            contract['coverage_percentile'], 0.02)
+        for name in ('strike_price', 'price_delta', 'call_price', 'put_price',
+                     'call_delta', 'put_delta'):
+            assert hedger.state[name][index] == pytest.approx(expected[name], rel=1e-12)
+
+    # Contrat à strike fixe
+    contract = contracts[4]
+    holding_period = calculator.calculate_price_hedge(
+        102.5, contract['start_date'], contract['end_date'], contract['volatility'],
+        contract['coverage_percentile'], 0.02)['holding_period']
+    arguments = (102.5, 105.0, holding_period, 0.02, contract['volatility'])
+    assert hedger.state['strike_price'][4] == 105.0
+    assert hedger.state['call_price'][4] == pytest.approx(calculator.black_scholes_call(*arguments))
+    assert hedger.state['put_price'][4] == pytest.approx(calculator.black_scholes_put(*arguments))
+    assert hedger.state['call_delta'][4] == pytest.approx(calculator.calculate_delta_call(*arguments))
+    assert hedger.state['put_delta'][4] == pytest.approx(calculator.calculate_delta_put(*arguments))
+
+
+def test_fast_ticks_are_coalesced():
+    """Ticks plus rapides que le traitement : seul le dernier prix est appliqué"""
+    hedger = SpotStreamHedger(BlackScholesCalculator(), make_contracts())
+    applied = []
+
+    async def run():
+        queue = asyncio.Queue()
+        for index in range(500):
+            queue.put_nowait(('POWER', 100.0 + index))
+        queue.put_nowait(('GAS', 40.0))
+        queue.put_nowait(None)
+        return await stream_hedges(hedger, queue_ticks(queue),
+                                   lambda snapshot, prices: applied.append(prices))
+
+    statistics = asyncio.run(run())
+
+    assert statistics['ticks'] == 501
+    assert statistics['updates'] == len(applied) < 501
+    assert statistics['coalesced'] == 501 - sum(len(prices) for prices in applied)
+    assert hedger.state['current_price'][0] == 599.0
+    assert hedger.state['current_price'][1] == 40.0
+
+
+def test_file_and_socket_sources(tmp_path):
+    """Rejeu d'un fichier et lecture d'une socket : un tick par ligne"""
+    path = tmp_path / 'ticks.csv'
+    path.write_text("# sous-jacent,prix\nPOWER,101\n\n99.5\nGAS, 42.0\n", encoding='utf-8')
+    assert parse_tick("  \n") is None
+    assert parse_tick("99.5", 'POWER') == ('POWER', 99.5)
+
+    async def read_all(ticks):
+        return [tick async for tick in ticks]
+
+    assert asyncio.run(read_all(file_ticks(path, default_underlying='POWER'))) == [
+        ('POWER', 101.0), ('POWER', 99.5), ('GAS', 42.0)]
+
+    async def serve_and_stream():
+        async def send_ticks(reader, writer):
+            writer.write(path.read_bytes())
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(send_ticks, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            hedger = SpotStreamHedger(BlackScholesCalculator(), make_contracts())
+            await stream_hedges(hedger, socket_ticks('127.0.0.1', port, 'POWER'))
+        return hedger
+
+    hedger = asyncio.run(serve_and_stream())
+    assert hedger.state['current_price'][0] == 99.5
+    assert hedger.state['current_price'][1] == 42.0
+
+
+def test_source_errors_propagate(tmp_path):
+    """Une source en erreur ou un tick invalide n'est pas confondu avec la fin du flux"""
+    hedger = SpotStreamHedger(BlackScholesCalculator(), make_contracts())
+    path = tmp_path / 'ticks.csv'
+    path.write_text("POWER,101\nPOWER,abc\nPOWER,102\n", encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        asyncio.run(stream_hedges(hedger, file_ticks(path, interval=0)))
+    assert hedger.state['current_price'][0] == 101.0
+
+    async def failing_ticks():
+        yield 'POWER', 103.0
+        raise ConnectionResetError("flux interrompu")
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(stream_hedges(hedger, failing_ticks()))
+    assert hedger.state['current_price'][0] == 103.0
+
+
+def test_zero_fixed_strike():
+    """Un strike fixe nul reste un strike fixe (et non NaN)"""
+    contracts = make_contracts()
+    contracts[4]['strike_price'] = 0.0
+    hedger = SpotStreamHedger(BlackScholesCalculator(), contracts)
+    with np.errstate(divide='ignore'):
+        hedger.update('POWER', 102.5)
+    assert hedger.state['strike_price'][4] == 0.0
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests de la simulation conjointe prix-volume du coût d'écart
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+import numpy as np
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+from volume_risk import simulate_imbalance_cost
+
+
+def test_perfect_correlation_matches_closed_form():
+    """Corrélation 1 : l'écart de volume est déterministe, quel que soit le découpage"""
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(0.2 * rng.standard_normal(5000))
+    scores = np.log(prices / 100) / 0.2
+    volumes = rng.uniform(-50, 500, 300)
+    contract_prices = rng.uniform(90, 110, 300)
+
+    expected = (0.1 * scores[:, None] * volumes * (prices[:, None] - contract_prices)).sum(axis=1)
+    for max_chunk_elements in (2**22, 1000, 7):
+        results = simulate_imbalance_cost(prices, scores, volumes, contract_prices,
+                                          volume_volatility=0.1, correlation=1.0,
+                                          max_chunk_elements=max_chunk_elements)
+        assert np.allclose(results['cost'], expected)
+
+    assert results['num_scenarios'] == 5000
+    assert results['num_sites'] == 300
+
+
+def test_volumes_are_clipped_at_zero():
+    """Un site ne consomme jamais moins que zéro : l'écart est borné par le volume prévu"""
+    prices = np.full(2000, 80.0)
+    scores = np.random.default_rng(1).standard_normal(2000)
+
+    results = simulate_imbalance_cost(prices, scores, [100.0], 100.0,
+                                      volume_volatility=2.0, correlation=0.0)
+
+    assert results['volume_imbalance'].min() >= -100.0
+    # Prix sous le prix du contrat : la sous-consommation coûte au plus 100 × 20
+    assert results['cost'].max() <= 100.0 * 20.0 + 1e-9
+
+
+def test_calculator_volume_risk():
+    """Prix du modèle de scénarios, coût d'autant plus élevé que la corrélation est forte"""
+    calculator = BlackScholesCalculator()
+    start_date = datetime.now() + timedelta(days=60)
+    end_date = start_date + timedelta(days=365)
+    volumes = np.random.default_rng(2).uniform(10, 1000, 200)
+
+    independent = calculator.simulate_volume_risk(100, start_date, end_date, 0.25, volumes,
+                                                  correlation=0.0, num_scenarios=20000)
+    correlated = calculator.simulate_volume_risk(100, start_date, end_date, 0.25, volumes,
+                                                 correlation=0.6, num_scenarios=20000)
+    scenarios = calculator.simulate_price_scenarios(100, start_date, end_date, 0.25,
+                                                    num_scenarios=20000)
+
+    assert np.allclose(correlated['future_price'], scenarios['future_price'])
+    assert correlated['percentiles'][50] > 0
+    assert correlated['percentiles'][95] > independent['percentiles'][95]
+    assert abs(independent['percentiles'][50]) < correlated['percentiles'][50]
+
+    assert calculator.simulate_volume_risk(100, datetime.now() - timedelta(days=30),
+                                           datetime.now() - timedelta(days=1), 0.25,
+                                           volumes) is None
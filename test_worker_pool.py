@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests du pool de processus de travail persistant
+"""
+
+import sys
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+# Ajouter le répertoire courant au path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from black_scholes_calculator import BlackScholesCalculator
+from worker_pool import TaskTimeout, WorkerPool, WorkerPoolFull, get_worker_pool, parallel_hedge_batch
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = WorkerPool(max_workers=2, max_pending=2, backend='numpy')
+    pool.start()
+    assert pool.ready()
+    yield pool
+    pool.shutdown()
+
+
+def test_lazy_start():
+    """Les processus ne démarrent qu'à la première utilisation"""
+    pool = WorkerPool(max_workers=1, backend='numpy')
+    assert not pool.started and not pool.ready()
+    pool.shutdown()
+    with pytest.raises(RuntimeError):
+        pool.submit(time.sleep, 0)
+
+
+def test_warm_calculation(pool):
+    """Un calcul soumis au calculateur préchauffé donne le même résultat qu'en local"""
+    start_date = date.today() + timedelta(days=30)
+    end_date = start_date + timedelta(days=90)
+    volatility = np.linspace(0.1, 0.5, 7)
+
+    started_at = time.perf_counter()
+    result = pool.result(pool.submit_calculation('calculate_price_hedge_batch', 100.0, start_date,
+                                                 end_date, volatility, 75.0), timeout=30)
+    assert time.perf_counter() - started_at < 1.0  # processus déjà démarrés et préchauffés
+
+    expected = BlackScholesCalculator().calculate_price_hedge_batch(100.0, start_date, end_date,
+                                                                    volatility, 75.0)
+    np.testing.assert_allclose(result['strike_price'], expected['strike_price'])
+    assert pool.statistics['completed'] >= 1
+
+
+def test_parallel_hedge_batch(pool):
+    """Le calcul réparti par blocs correspond au calcul vectorisé en un appel"""
+    start_date = np.datetime64(date.today() + timedelta(days=30)) + np.arange(10)
+    end_date = start_date + 90
+    volatility = np.linspace(0.1, 0.5, 10)
+
+    result = parallel_hedge_batch(pool, 100.0, start_date, end_date, volatility, 80.0,
+                                  chunk_size=3, timeout=30)
+    expected = BlackScholesCalculator().calculate_price_hedge_batch(100.0, start_date, end_date,
+                                                                    volatility, 80.0)
+    assert result['strike_price'].shape == (10,)
+    np.testing.assert_allclose(result['price_delta'], expected['price_delta'])
+
+
+def test_backpressure(pool):
+    """File pleine : rejet immédiat sans attente, les places se libèrent en fin de tâche"""
+    futures = [pool.submit(time.sleep, 0.5) for _ in range(pool.max_pending)]
+    assert pool.pending() == pool.max_pending
+    with pytest.raises(WorkerPoolFull):
+        pool.submit(time.sleep, 0, block=False)
+    with pytest.raises(WorkerPoolFull):
+        pool.submit(time.sleep, 0, timeout=0.05)
+    for future in futures:
+        future.result(timeout=30)
+    assert pool.result(pool.submit(time.sleep, 0, block=False), timeout=30) is None
+
+
+def test_task_timeout(pool):
+    """Une tâche trop longue lève TaskTimeout ; le pool reste utilisable"""
+    with pytest.raises(TaskTimeout):
+        pool.run(time.sleep, 1.0, timeout=0.05)
+    assert pool.statistics['timeouts'] == 1
+    assert pool.run(time.sleep, 0, timeout=30) is None
+
+
+def test_shared_pool():
+    """Un seul pool par processus, démarré paresseusement"""
+    assert get_worker_pool() is get_worker_pool()
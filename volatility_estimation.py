@@ -0,0 +1,356 @@
+import os
+
+import numpy as np
+from scipy import signal
+
+from curves import VolTermStructure
+
+
+# Nombre de périodes (cotations) par an pour l'annualisation
+PERIODS_PER_YEAR = 252
+
+# Facteur de décroissance RiskMetrics (données quotidiennes)
+RISKMETRICS_DECAY = 0.94
+
+# Grilles de recherche des paramètres GARCH(1,1) (persistance α + β < 1)
+GARCH_ALPHA_GRID = np.linspace(0.02, 0.30, 15)
+GARCH_BETA_GRID = np.linspace(0.50, 0.98, 25)
+
+ESTIMATION_METHODS = ('realized', 'ewma', 'garch')
+
+
+def load_price_history(path, columns=None, chunk_rows=100000):
+    """
+    Chargement d'un historique de prix (lignes : dates, colonnes : instruments)
+
+    Un fichier .npy est projeté en mémoire (memmap, rien n'est lu avant le
+    calcul) ; un CSV est lu par blocs de chunk_rows lignes.
+
+    Args:
+        path: Fichier .npy (tableau 1-D ou 2-D) ou .csv (une colonne par instrument)
+        columns: Colonnes du CSV à lire (défaut: toutes les colonnes numériques)
+        chunk_rows: Nombre de lignes lues par bloc (CSV)
+
+    Returns:
+        numpy.ndarray: Prix, de forme (dates,) ou (dates, instruments)
+    """
+    if os.path.splitext(str(path))[1].lower() == '.npy':
+        return np.load(path, mmap_mode='r')
+
+    import pandas as pd
+
+    blocks = []
+    for block in pd.read_csv(path, usecols=columns, chunksize=chunk_rows,
+                             float_precision='round_trip'):
+        blocks.append(block.select_dtypes('number').to_numpy(dtype=float))
+    if not blocks:
+        raise ValueError(f"Historique de prix vide : {path}")
+    prices = np.concatenate(blocks)
+    return prices[:, 0] if prices.shape[1] == 1 else prices
+
+
+def _as_columns(prices):
+    """
+    Vue 2-D (dates, instruments) d'un historique, sans copie
+    """
+    if np.ndim(prices) not in (1, 2):
+        raise ValueError("L'historique de prix doit être de forme (dates,) ou (dates, instruments)")
+    if len(prices) < 2:
+        raise ValueError("Au moins deux prix sont nécessaires")
+    return prices if np.ndim(prices) == 2 else prices.reshape(-1, 1)
+
+
+def _squeeze(values, prices):
+    """
+    Retour à la forme de l'historique d'origine (scalaire pour un seul instrument)
+    """
+    if np.ndim(prices) == 2:
+        return values
+    values = values[..., 0]
+    return values if np.ndim(values) else float(values)
+
+
+def iter_return_chunks(prices, chunk_rows=4096):
+    """
+    Rendements logarithmiques par blocs de lignes consécutifs
+
+    Seules chunk_rows + 1 lignes de prix sont lues à la fois : un historique
+    projeté en mémoire n'est jamais chargé en entier.
+
+    Yields:
+        numpy.ndarray: Rendements de forme (lignes, instruments)
+    """
+    prices = _as_columns(prices)
+    for start in range(1, len(prices), chunk_rows):
+        block = np.log(np.asarray(prices[start - 1:start + chunk_rows], dtype=float))
+        yield np.diff(block, axis=0)
+
+
+def _annualize(variance, periods_per_year):
+    return np.sqrt(variance * periods_per_year)
+
+
+def realized_volatility(prices, window=21, periods_per_year=PERIODS_PER_YEAR, chunk_rows=4096):
+    """
+    Volatilité réalisée glissante (écart quadratique moyen des window derniers rendements)
+
+    Sommes cumulées par bloc, en reportant les window - 1 derniers carrés
+    de rendement d'un bloc au suivant.
+
+    Returns:
+        numpy.ndarray: Volatilité annualisée à chaque date de rendement
+                       (NaN tant que la fenêtre n'est pas remplie)
+    """
+    columns = _as_columns(prices)
+    volatility = np.full((len(columns) - 1, columns.shape[1]), np.nan)
+    tail = np.empty((0, columns.shape[1]))
+    position = 0
+    for returns in iter_return_chunks(columns, chunk_rows):
+        squares = np.concatenate([tail, returns**2])
+        cumulative = np.zeros((len(squares) + 1, squares.shape[1]))
+        np.cumsum(squares, axis=0, out=cumulative[1:])
+        # Fins de fenêtre (exclues) des rendements du bloc
+        ends = np.arange(len(tail) + 1, len(squares) + 1)
+        ends = ends[ends >= window]
+        rows = position + ends - len(tail) - 1
+        volatility[rows] = _annualize((cumulative[ends] - cumulative[ends - window]) / window,
+                                      periods_per_year)
+        position += len(returns)
+        tail = squares[max(len(squares) - window + 1, 0):] if window > 1 else squares[:0]
+    return _squeeze(volatility, prices)
+
+
+def ewma_volatility(prices, decay=RISKMETRICS_DECAY, periods_per_year=PERIODS_PER_YEAR,
+                    seed_window=21, chunk_rows=4096):
+    """
+    Volatilité EWMA (RiskMetrics) : σ²_t = λ σ²_{t-1} + (1 - λ) r_t²
+
+    La récurrence est un filtre linéaire du premier ordre, appliqué bloc par
+    bloc (scipy.signal.lfilter) en reportant l'état d'un bloc au suivant.
+    La variance initiale est la moyenne des seed_window premiers carrés.
+
+    Returns:
+        numpy.ndarray: Volatilité annualisée à chaque date de rendement
+    """
+    if not 0 < decay < 1:
+        raise ValueError("Le facteur de décroissance doit être dans ]0, 1[")
+    columns = _as_columns(prices)
+    variance = np.empty((len(columns) - 1, columns.shape[1]))
+    seed = np.diff(np.log(np.asarray(columns[:seed_window + 1], dtype=float)), axis=0)
+    state = np.mean(seed**2, axis=0)
+    position = 0
+    for returns in iter_return_chunks(columns, chunk_rows):
+        squares = returns**2
+        filtered, _ = signal.lfilter([1 - decay], [1, -decay], squares, axis=0,
+                                     zi=(decay * state)[np.newaxis])
+        variance[position:position + len(returns)] = filtered
+        state = filtered[-1]
+        position += len(returns)
+    return _squeeze(_annualize(variance, periods_per_year), prices)
+
+
+def _garch_deviations(deviations, beta, state):
+    """
+    Écart cumulé B_t = β B_{t-1} + (r²_{t-1} - V) d'un modèle GARCH(1,1)
+
+    Avec ciblage de variance (ω = V (1 - α - β)) et σ²_0 = V, la variance
+    conditionnelle est σ²_t = V + α B_t : un seul filtre lfilter par valeur
+    de β sert pour toutes les valeurs de α.
+
+    Args:
+        deviations: r²_{t-1} - V sur un bloc, de forme (lignes, instruments)
+        beta: Valeur de β
+        state: B de la dernière ligne du bloc précédent (instruments,)
+    """
+    return signal.lfilter([1.0], [1.0, -beta], deviations, axis=0,
+                          zi=(beta * state)[np.newaxis])[0]
+
+
+def _lagged_deviations(squares, previous_square, long_run_variance):
+    """
+    r²_{t-1} - V sur un bloc, le premier carré étant reporté du bloc précédent
+    """
+    return np.concatenate([previous_square[np.newaxis], squares[:-1]]) - long_run_variance
+
+
+def _long_run_variance(columns, chunk_rows):
+    sum_squares = np.zeros(columns.shape[1])
+    for returns in iter_return_chunks(columns, chunk_rows):
+        sum_squares += np.sum(returns**2, axis=0)
+    return sum_squares / (len(columns) - 1)
+
+
+def fit_garch(prices, alpha_grid=GARCH_ALPHA_GRID, beta_grid=GARCH_BETA_GRID,
+              periods_per_year=PERIODS_PER_YEAR, chunk_rows=4096):
+    """
+    Estimation GARCH(1,1) par maximum de vraisemblance gaussienne sur une grille
+
+    Deux passes sur l'historique : variance de long terme V (ciblage de
+    variance), puis log-vraisemblance de tous les couples (α, β) de la grille
+    tels que α + β < 1, pour tous les instruments à la fois.
+
+    Args:
+        prices: Historique de prix (dates,) ou (dates, instruments), éventuellement memmap
+        alpha_grid, beta_grid: Valeurs candidates de α et β
+
+    Returns:
+        dict: 'alpha', 'beta', 'omega', 'long_run_variance', 'variance'
+              (variance conditionnelle de la prochaine période),
+              'log_likelihood', 'volatility' (annualisée, prochaine période)
+              et 'long_run_volatility', par instrument
+    """
+    columns = _as_columns(prices)
+    num_instruments = columns.shape[1]
+    alphas = np.asarray(alpha_grid, dtype=float)
+    betas = np.asarray(beta_grid, dtype=float)
+    stationary = alphas[np.newaxis, :] + betas[:, np.newaxis] < 1
+    if not np.any(stationary):
+        raise ValueError("Aucun couple (α, β) de la grille ne vérifie α + β < 1")
+
+    long_run_variance = _long_run_variance(columns, chunk_rows)
+
+    # Log-vraisemblance par (β, α, instrument)
+    log_likelihood = np.where(stationary[..., np.newaxis], 0.0, -np.inf) * np.ones(num_instruments)
+    states = np.zeros((betas.size, num_instruments))
+    previous_square = long_run_variance.copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for returns in iter_return_chunks(columns, chunk_rows):
+            squares = returns**2
+            deviations = _lagged_deviations(squares, previous_square, long_run_variance)
+            for i, beta in enumerate(betas):
+                cumulated = _garch_deviations(deviations, beta, states[i])
+                states[i] = cumulated[-1]
+                for j in np.flatnonzero(stationary[i]):
+                    variance = long_run_variance + alphas[j] * cumulated
+                    log_likelihood[i, j] -= 0.5 * np.sum(np.log(variance) + squares / variance,
+                                                         axis=0)
+            previous_square = squares[-1]
+
+    log_likelihood = np.where(np.isnan(log_likelihood), -np.inf, log_likelihood)
+    flat = log_likelihood.reshape(-1, num_instruments)
+    best = np.argmax(flat, axis=0)
+    instruments = np.arange(num_instruments)
+    beta_index, alpha_index = np.unravel_index(best, stationary.shape)
+    alpha, beta = alphas[alpha_index], betas[beta_index]
+
+    # Variance de la prochaine période : B_{T+1} = β B_T + (r²_T - V)
+    next_deviation = beta * states[beta_index, instruments] + previous_square - long_run_variance
+    variance = long_run_variance + alpha * next_deviation
+
+    result = {
+        'alpha': alpha,
+        'beta': beta,
+        'omega': long_run_variance * (1 - alpha - beta),
+        'long_run_variance': long_run_variance,
+        'variance': variance,
+        'log_likelihood': flat[best, instruments],
+        'volatility': _annualize(variance, periods_per_year),
+        'long_run_volatility': _annualize(long_run_variance, periods_per_year)
+    }
+    if np.ndim(prices) == 1:
+        result = {key: float(value[0]) for key, value in result.items()}
+    result['periods_per_year'] = periods_per_year
+    return result
+
+
+def garch_volatility(prices, fit, chunk_rows=4096):
+    """
+    Volatilité conditionnelle GARCH(1,1) à chaque date de rendement
+
+    Args:
+        fit: Paramètres estimés par fit_garch sur le même historique
+
+    Returns:
+        numpy.ndarray: Volatilité annualisée (σ_t, connue à la date t - 1)
+    """
+    columns = _as_columns(prices)
+    alpha = np.broadcast_to(fit['alpha'], columns.shape[1])
+    beta = np.broadcast_to(fit['beta'], columns.shape[1])
+    long_run_variance = np.broadcast_to(fit['long_run_variance'], columns.shape[1])
+
+    variance = np.empty((len(columns) - 1, columns.shape[1]))
+    states = np.zeros(columns.shape[1])
+    previous_square = long_run_variance.copy()
+    position = 0
+    for returns in iter_return_chunks(columns, chunk_rows):
+        squares = returns**2
+        deviations = _lagged_deviations(squares, previous_square, long_run_variance)
+        rows = slice(position, position + len(returns))
+        # Un filtre par valeur de β (valeurs de la grille d'estimation)
+        for value in np.unique(beta):
+            selected = np.flatnonzero(beta == value)
+            cumulated = _garch_deviations(deviations[:, selected], value, states[selected])
+            states[selected] = cumulated[-1]
+            variance[rows, selected] = long_run_variance[selected] + alpha[selected] * cumulated
+        previous_square = squares[-1]
+        position += len(returns)
+    return _squeeze(_annualize(variance, fit['periods_per_year']), prices)
+
+
+def garch_term_structure(fit, tenors):
+    """
+    Structure par terme de volatilité prévue par un modèle GARCH(1,1)
+
+    Variance moyenne des h prochaines périodes :
+    V + (σ²_{t+1} - V) (1 - φ^h) / (h (1 - φ)), avec φ = α + β.
+
+    Args:
+        fit: Paramètres estimés par fit_garch
+        tenors: Échéances (en années)
+
+    Returns:
+        list: Une curves.VolTermStructure par instrument (un seul objet pour
+              un historique 1-D), utilisable comme volatility de
+              calculate_price_hedge et calculate_price_hedge_batch
+    """
+    tenors = np.asarray(tenors, dtype=float)
+    periods = np.maximum(tenors * fit['periods_per_year'], 1.0)[:, np.newaxis]
+    persistence = np.atleast_1d(fit['alpha'] + fit['beta'])
+    long_run_variance = np.atleast_1d(fit['long_run_variance'])
+    variance = np.atleast_1d(fit['variance'])
+
+    average = long_run_variance + (variance - long_run_variance) * (
+        (1 - persistence**periods) / (periods * (1 - persistence)))
+    volatilities = _annualize(average, fit['periods_per_year'])
+
+    structures = [VolTermStructure(tenors, volatilities[:, index])
+                  for index in range(volatilities.shape[1])]
+    return structures if np.ndim(fit['alpha']) else structures[0]
+
+
+def estimate_volatility(prices, method='ewma', window=21, decay=RISKMETRICS_DECAY,
+                        periods_per_year=PERIODS_PER_YEAR, chunk_rows=4096):
+    """
+    Volatilité annualisée courante par instrument, prête pour le paramètre volatility
+
+    Args:
+        prices: Historique de prix (dates,) ou (dates, instruments), ou
+                chemin d'un fichier (voir load_price_history)
+        method: 'realized' (fenêtre glissante), 'ewma' (RiskMetrics) ou
+                'garch' (GARCH(1,1), prévision de la prochaine période)
+        window: Fenêtre de la volatilité réalisée (et d'initialisation EWMA)
+        decay: Facteur de décroissance EWMA
+
+    Returns:
+        dict: 'volatility' (scalaire ou tableau par instrument), 'method',
+              'num_observations' (nombre de rendements) et, pour 'garch',
+              'fit' (voir fit_garch)
+    """
+    if method not in ESTIMATION_METHODS:
+        raise ValueError(f"Méthode inconnue : {method} "
+                         f"(disponibles : {', '.join(ESTIMATION_METHODS)})")
+    if isinstance(prices, (str, os.PathLike)):
+        prices = load_price_history(prices)
+
+    result = {'method': method, 'num_observations': len(prices) - 1}
+    if method == 'realized':
+        series = realized_volatility(_as_columns(prices), window, periods_per_year, chunk_rows)
+        result['volatility'] = _squeeze(series[-1], prices)
+    elif method == 'ewma':
+        series = ewma_volatility(_as_columns(prices), decay, periods_per_year, window, chunk_rows)
+        result['volatility'] = _squeeze(series[-1], prices)
+    else:
+        fit = fit_garch(prices, periods_per_year=periods_per_year, chunk_rows=chunk_rows)
+        result['volatility'] = fit['volatility']
+        result['fit'] = fit
+    return result
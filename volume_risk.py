@@ -0,0 +1,85 @@
+import numpy as np
+
+
+def simulate_imbalance_cost(future_prices, price_scores, forecast_volumes, contract_price,
+                            volume_volatility=0.1, correlation=0.3,
+                            percentiles=(50, 95, 99), max_chunk_elements=2**22, seed=42):
+    """
+    Coût d'écart volume du fournisseur, simulé conjointement avec le prix
+
+    Pour chaque scénario de prix P et chaque site, le volume réalisé vaut
+    V × max(1 + σv × ε, 0), où ε = ρ × z + sqrt(1 - ρ²) × η combine le score
+    normal z du choc de prix (copule gaussienne) et un bruit propre au site.
+    L'écart ΔV au volume prévu est acheté (surconsommation) ou revendu
+    (sous-consommation, rachat de production si V < 0) au prix de marché,
+    alors qu'il est facturé au prix du contrat Pc : le coût du scénario est
+    la somme sur les sites de ΔV × (P - Pc).
+
+    Le calcul est fait par blocs scénarios × sites d'au plus
+    `max_chunk_elements` éléments : seuls les coûts par scénario sont conservés.
+    Les tirages dépendent de la graine et du découpage en blocs.
+
+    Args:
+        future_prices: Prix futurs des scénarios (tableau 1D)
+        price_scores: Scores normaux des chocs de prix (même taille)
+        forecast_volumes: Volume prévu par site (négatif pour une production)
+        contract_price: Prix du contrat par site (scalaire ou tableau)
+        volume_volatility: Écart-type relatif du volume par site (scalaire ou tableau)
+        correlation: Corrélation entre choc de prix et écart de volume
+        percentiles: Centiles du coût à reporter
+        max_chunk_elements: Taille maximale d'un bloc scénarios × sites
+        seed: Graine du générateur des écarts de volume
+
+    Returns:
+        dict: 'cost' et 'volume_imbalance' par scénario, 'mean', 'std',
+              'percentiles', 'num_scenarios' et 'num_sites'
+    """
+    if not -1 <= correlation <= 1:
+        raise ValueError("La corrélation doit être comprise entre -1 et 1")
+
+    future_prices = np.asarray(future_prices, dtype=float)
+    price_scores = np.asarray(price_scores, dtype=float)
+    forecast_volumes = np.atleast_1d(np.asarray(forecast_volumes, dtype=float))
+    num_scenarios, num_sites = future_prices.size, forecast_volumes.size
+    contract_price = np.broadcast_to(np.asarray(contract_price, dtype=float), (num_sites,))
+    volume_volatility = np.broadcast_to(np.asarray(volume_volatility, dtype=float), (num_sites,))
+    idiosyncratic = np.sqrt(1.0 - correlation**2)
+
+    rng = np.random.default_rng(seed)
+    site_chunk = max(1, min(num_sites, max_chunk_elements))
+    scenario_chunk = max(1, max_chunk_elements // site_chunk)
+
+    cost = np.zeros(num_scenarios)
+    volume_imbalance = np.zeros(num_scenarios)
+    for scenario_start in range(0, num_scenarios, scenario_chunk):
+        rows = slice(scenario_start, scenario_start + scenario_chunk)
+        scores = price_scores[rows, None]
+        n = scores.shape[0]
+
+        for site_start in range(0, num_sites, site_chunk):
+            sites = slice(site_start, site_start + site_chunk)
+
+            # Écarts de volume du bloc, calculés en place
+            deviation = rng.standard_normal((n, forecast_volumes[sites].size))
+            deviation *= idiosyncratic
+            deviation += correlation * scores
+            deviation *= volume_volatility[sites]
+            deviation += 1.0
+            np.maximum(deviation, 0.0, out=deviation)
+            deviation -= 1.0
+            deviation *= forecast_volumes[sites]
+
+            # Σ ΔV × (P - Pc) = P × Σ ΔV - ΔV · Pc
+            block_imbalance = deviation.sum(axis=1)
+            volume_imbalance[rows] += block_imbalance
+            cost[rows] += future_prices[rows] * block_imbalance - deviation @ contract_price[sites]
+
+    return {
+        'cost': cost,
+        'volume_imbalance': volume_imbalance,
+        'mean': float(np.mean(cost)),
+        'std': float(np.std(cost)),
+        'percentiles': {p: float(np.percentile(cost, p)) for p in percentiles},
+        'num_scenarios': num_scenarios,
+        'num_sites': num_sites
+    }
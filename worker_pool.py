@@ -0,0 +1,322 @@
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import date, timedelta
+
+import numpy as np
+
+
+# Modules importés une fois par le serveur de processus (forkserver) : chaque
+# processus de travail en hérite déjà chargés au lieu de les réimporter
+PRELOAD_MODULES = ['numpy', 'scipy.special', 'scipy.stats', 'black_scholes_calculator']
+
+
+class WorkerPoolFull(RuntimeError):
+    """
+    Levée lorsque la file du pool est pleine (contre-pression)
+    """
+
+
+class TaskTimeout(TimeoutError):
+    """
+    Levée lorsqu'une tâche dépasse son délai
+    """
+
+
+# Calculateur du processus de travail, créé et préchauffé à son démarrage
+_worker_calculator = None
+
+
+def _initialize_worker(backend, num_threads):
+    """
+    Démarrage d'un processus de travail : imports, calculateur et noyaux préchauffés
+
+    Un premier appel de chaque chemin de calcul charge scipy, initialise les
+    noyaux (compilation numba le cas échéant) et remplit les caches ; les
+    tâches suivantes démarrent sans ce coût.
+
+    Args:
+        backend: Backend des noyaux vectorisés
+        num_threads: Threads numba du processus (les processus se partagent les CPU)
+    """
+    global _worker_calculator
+    from black_scholes_calculator import BlackScholesCalculator
+    from pricing_backends import numba
+
+    _worker_calculator = BlackScholesCalculator(backend=backend)
+    if _worker_calculator.backend.name == 'numba':
+        numba.set_num_threads(min(num_threads, numba.config.NUMBA_NUM_THREADS))
+    start_date = date.today() + timedelta(days=30)
+    end_date = start_date + timedelta(days=90)
+    _worker_calculator.calculate_price_hedge(100.0, start_date, end_date, 0.25, 75.0)
+    _worker_calculator.calculate_price_hedge_batch(100.0, start_date, end_date,
+                                                   np.array([0.2, 0.3]), 75.0)
+    _worker_calculator.simulate_price_scenarios(100.0, start_date, end_date, 0.25,
+                                                num_scenarios=100)
+    _worker_calculator.simulate_price_fan(100.0, start_date, end_date, 0.25,
+                                          num_paths=100, num_steps=5)
+
+
+def _call_calculator(method, args, kwargs):
+    """
+    Exécution d'une méthode du calculateur préchauffé du processus de travail
+    """
+    return getattr(_worker_calculator, method)(*args, **kwargs)
+
+
+def _worker_ready():
+    return os.getpid()
+
+
+def _context(start_method):
+    if start_method is None:
+        available = multiprocessing.get_all_start_methods()
+        start_method = 'forkserver' if 'forkserver' in available else 'spawn'
+    context = multiprocessing.get_context(start_method)
+    if start_method == 'forkserver':
+        context.set_forkserver_preload(PRELOAD_MODULES)
+    return context
+
+
+class WorkerPool:
+    """
+    Pool de processus de travail persistant, démarré à la première utilisation
+
+    Les processus importent le calculateur et préchauffent ses noyaux à leur
+    démarrage, une seule fois pour toute la durée de vie du pool : une tâche
+    soumise ensuite démarre en quelques millisecondes. Le nombre de tâches
+    en attente ou en cours est borné (contre-pression) ; chaque tâche peut
+    avoir un délai.
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, backend=None, start_method=None):
+        """
+        Args:
+            max_workers: Nombre de processus (défaut: min(4, nombre de CPU))
+            max_pending: Nombre maximal de tâches en attente ou en cours
+                         (défaut: 4 par processus)
+            backend: Backend des noyaux vectorisés des processus (voir pricing_backends)
+            start_method: Méthode de démarrage multiprocessing ; par défaut
+                          'forkserver' (modules de PRELOAD_MODULES préchargés,
+                          sûr dans un serveur multi-thread comme Streamlit),
+                          'spawn' là où il n'est pas disponible
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending or 4 * self.max_workers
+        self.backend = backend
+        self.start_method = start_method
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._closed = False
+        self._pending = 0
+        self._warmup = None
+        self.statistics = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0,
+                           'timeouts': 0, 'startup_time': None}
+
+    @property
+    def started(self):
+        return self._executor is not None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Le pool de processus est arrêté")
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=_context(self.start_method),
+                    initializer=_initialize_worker,
+                    initargs=(self.backend, max(1, (os.cpu_count() or 1) // self.max_workers))
+                )
+            return self._executor
+
+    def ready(self):
+        """
+        Vrai lorsqu'au moins un processus lancé par start() est démarré et préchauffé
+
+        Une tâche soumise est alors servie sans attendre de préchauffage
+        (les autres processus peuvent encore chauffer) : permet de calculer
+        sur place tant que le pool démarre plutôt que d'attendre.
+        """
+        return self._warmup is not None and any(
+            future.done() and not future.cancelled() and future.exception() is None
+            for future in self._warmup)
+
+    def start(self, wait=True):
+        """
+        Démarrage et préchauffage des processus (sinon à la première tâche)
+
+        Chaque processus se préchauffe à son démarrage ; wait attend que les
+        tâches de démarrage soient servies, donc qu'au moins un processus
+        soit prêt.
+
+        Returns:
+            float: Durée du démarrage (secondes) si wait, None sinon
+        """
+        started_at = time.perf_counter()
+        executor = self._get_executor()
+        self._warmup = [executor.submit(_worker_ready) for _ in range(self.max_workers)]
+        if not wait:
+            return None
+        for future in self._warmup:
+            future.result()
+        self.statistics['startup_time'] = time.perf_counter() - started_at
+        return self.statistics['startup_time']
+
+    def submit(self, fn, *args, block=True, timeout=None, **kwargs):
+        """
+        Soumission d'une tâche fn(*args, **kwargs) à un processus de travail
+
+        fn et ses arguments doivent être sérialisables (fonction de module).
+
+        Args:
+            block: Attendre une place si la file est pleine (sinon WorkerPoolFull)
+            timeout: Attente maximale d'une place (secondes) lorsque block est vrai
+
+        Returns:
+            concurrent.futures.Future
+
+        Raises:
+            WorkerPoolFull: File pleine (contre-pression)
+        """
+        if not self._slots.acquire(blocking=block, timeout=timeout if block else None):
+            with self._lock:
+                self.statistics['rejected'] += 1
+            raise WorkerPoolFull(f"File du pool pleine ({self.max_pending} tâches en attente ou en cours)")
+        try:
+            future = self._get_executor().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending += 1
+            self.statistics['submitted'] += 1
+        future.add_done_callback(self._task_done)
+        return future
+
+    def _task_done(self, future):
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self.statistics['failed' if future.exception() is not None else 'completed'] += 1
+        self._slots.release()
+
+    def submit_calculation(self, method, *args, block=True, timeout=None, **kwargs):
+        """
+        Soumission d'un appel de méthode du calculateur préchauffé des processus
+
+        Exemple:
+            pool.submit_calculation('simulate_price_fan', 100, debut, fin, 0.25)
+
+        Returns:
+            concurrent.futures.Future
+        """
+        return self.submit(_call_calculator, method, args, kwargs, block=block, timeout=timeout)
+
+    def run(self, fn, *args, timeout=None, **kwargs):
+        """
+        Exécution d'une tâche avec délai
+
+        Au-delà du délai, la tâche est retirée de la file si elle n'a pas
+        démarré ; sinon son résultat est abandonné et le processus la termine
+        (sa place reste occupée jusque-là).
+
+        Raises:
+            TaskTimeout: Délai dépassé
+        """
+        future = self.submit(fn, *args, **kwargs)
+        return self.result(future, timeout)
+
+    def result(self, future, timeout=None):
+        """
+        Résultat d'une tâche soumise, avec délai (voir run)
+
+        Raises:
+            TaskTimeout: Délai dépassé
+        """
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.statistics['timeouts'] += 1
+            raise TaskTimeout(f"Tâche non terminée après {timeout} s") from None
+
+    def pending(self):
+        """
+        Nombre de tâches en attente ou en cours
+        """
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, wait=True, cancel_futures=True):
+        """
+        Arrêt du pool : tâches en attente annulées, processus terminés
+
+        Le pool ne peut plus être utilisé ensuite.
+        """
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def parallel_hedge_batch(pool, current_price, start_date, end_date, volatility,
+                         coverage_percentile, risk_free_rate=0.0, chunk_size=100000,
+                         timeout=None):
+    """
+    calculate_price_hedge_batch réparti par blocs de contrats sur les processus du pool
+
+    Les paramètres sont diffusés à leur forme commune, découpés en blocs de
+    chunk_size contrats, calculés en parallèle puis réassemblés.
+
+    Returns:
+        dict: Mêmes clés que calculate_price_hedge_batch, tableaux 1-D par contrat
+    """
+    parameters = {
+        'current_price': np.asarray(current_price, dtype=float),
+        'start_date': np.asarray(start_date, dtype='datetime64[us]'),
+        'end_date': np.asarray(end_date, dtype='datetime64[us]'),
+        'volatility': np.asarray(volatility, dtype=float),
+        'coverage_percentile': np.asarray(coverage_percentile, dtype=float),
+        'risk_free_rate': np.asarray(risk_free_rate, dtype=float)
+    }
+    shape = np.broadcast_shapes(*(values.shape for values in parameters.values()))
+    size = int(np.prod(shape))
+    flat = {name: np.broadcast_to(values, shape).reshape(-1) for name, values in parameters.items()}
+
+    futures = [
+        pool.submit_calculation('calculate_price_hedge_batch',
+                                **{name: values[start:start + chunk_size]
+                                   for name, values in flat.items()})
+        for start in range(0, size, chunk_size)
+    ]
+    chunks = [pool.result(future, timeout) for future in futures]
+    return {key: np.concatenate([np.broadcast_to(chunk[key], len(chunk['valid']))
+                                 for chunk in chunks])
+            for key in chunks[0]}
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_worker_pool(max_workers=None, max_pending=None):
+    """
+    Pool de processus partagé par tout le processus courant (CLI, API, application)
+
+    Créé au premier appel (les processus démarrent à la première tâche) et
+    arrêté proprement à la fin de l'interpréteur.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = WorkerPool(max_workers=max_workers, max_pending=max_pending)
+            atexit.register(_shared_pool.shutdown)
+        return _shared_pool